@@ -0,0 +1,112 @@
+"""Synthetic kavisrc generator for benchmarks.
+
+Writes author JSON files with the same author -> books -> context schema as
+the packaged kavisrc, at any size. Text is random Tamil syllables with word
+counts shaped like the shipped poems (lines of 5-190 words, about 18 on
+average; meanings of 7-54 words), and titles repeat across books the way
+real titles do, so title lookups return several poems.
+
+    python benchmarks/generate_corpus.py OUTPUT_DIR --poems 100000
+"""
+import json
+import math
+import random
+from argparse import ArgumentParser
+from pathlib import Path
+
+CONSONANTS = ['க', 'ங', 'ச', 'ஞ', 'ட', 'ண', 'த', 'ந', 'ப', 'ம', 'ய', 'ர', 'ல', 'வ', 'ழ', 'ள', 'ற', 'ன']
+VOWEL_SIGNS = ['', 'ா', 'ி', 'ீ', 'ு', 'ூ', 'ெ', 'ே', 'ை', 'ொ', 'ோ', '்']
+VOWELS = ['அ', 'ஆ', 'இ', 'ஈ', 'உ', 'ஊ', 'எ', 'ஏ', 'ஐ', 'ஒ', 'ஓ']
+LATIN_SYLLABLES = ['ka', 'vi', 'ma', 'zhai', 'ni', 'la', 'van', 'nam', 'an', 'bu', 'thu', 'ru', 'pa', 'dal', 'ee', 'sai']
+CATEGORIES = ['Feelings', 'Greetings', 'Love', 'Nature', 'Devotion', 'Family', 'Friendship', 'Society']
+
+# Corpus shape: books per author and poems per book.
+BOOKS_PER_AUTHOR = 10
+POEMS_PER_BOOK = 50
+
+
+def tamil_word(rng):
+    syllables = [rng.choice(VOWELS)] if rng.random() < 0.2 else []
+    for _ in range(rng.randint(2, 4)):
+        syllables.append(rng.choice(CONSONANTS) + rng.choice(VOWEL_SIGNS))
+    return ''.join(syllables)
+
+
+def tamil_text(rng, low, high, median):
+    # Log-normal word counts: mostly short, with a long tail up to high.
+    count = min(high, max(low, int(rng.lognormvariate(math.log(median), 0.6))))
+    words = [tamil_word(rng) for _ in range(count)]
+    text = ' '.join(words)
+    return text + rng.choice(['.', '!', '.', ','])
+
+
+def tanglish_title(rng, words=(1, 3)):
+    parts = [''.join(rng.choice(LATIN_SYLLABLES) for _ in range(rng.randint(2, 3))).capitalize()
+             for _ in range(rng.randint(*words))]
+    return '-'.join(parts)
+
+
+def build_author(rng, author_index, poems, title_pool):
+    """Returns one author dict holding the given number of poems."""
+    books = []
+    remaining = poems
+    book_index = 0
+    while remaining > 0:
+        count = min(POEMS_PER_BOOK, remaining)
+        remaining -= count
+        books.append({
+            'booktitle': '-'.join(tamil_word(rng) for _ in range(rng.randint(1, 3))),
+            'booktitle_tanglish': f"{tanglish_title(rng)}-{author_index}-{book_index}",
+            'description': tamil_text(rng, 5, 30, 10),
+            'category': rng.choice(CATEGORIES),
+            'context': [
+                {
+                    'title': rng.choice(title_pool),
+                    'line': tamil_text(rng, 5, 190, 15),
+                    'meaning': tamil_text(rng, 7, 54, 17),
+                }
+                for _ in range(count)
+            ],
+        })
+        book_index += 1
+    return {
+        'author': f"Kavi {tanglish_title(rng, (1, 2)).replace('-', ' ')} {author_index}",
+        'contact': f"kavi{author_index}@example.com",
+        'books': books,
+    }
+
+
+def generate(directory, poems, seed=0):
+    """Writes a synthetic corpus of ``poems`` poems into directory and returns it."""
+    rng = random.Random(seed)
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    # About one distinct title per ten poems.
+    title_pool = sorted({tanglish_title(rng) for _ in range(max(1, poems // 10))})
+    per_author = BOOKS_PER_AUTHOR * POEMS_PER_BOOK
+    author_index = 0
+    remaining = poems
+    while remaining > 0:
+        count = min(per_author, remaining)
+        remaining -= count
+        author = build_author(rng, author_index, count, title_pool)
+        path = directory / f"author{author_index:05d}.json"
+        path.write_text(json.dumps(author, ensure_ascii=False, indent=4), encoding='utf-8')
+        author_index += 1
+    return directory
+
+
+def main(argv=None):
+    parser = ArgumentParser(description="Write a synthetic kavisrc corpus for benchmarks.")
+    parser.add_argument('output', help="Directory to write the author JSON files into")
+    parser.add_argument('--poems', type=int, default=1000, help="Total number of poems (default: 1000)")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed (default: 0)")
+    args = parser.parse_args(argv)
+
+    generate(args.output, args.poems, args.seed)
+    print(f"✅ Wrote {args.poems} poems to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
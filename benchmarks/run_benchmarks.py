@@ -0,0 +1,223 @@
+"""Benchmark harness for tamilkavi.
+
+Generates synthetic corpora (see generate_corpus.py), times loading, every
+filter method, the listings and table rendering at each size, and writes
+the timings as JSON so runs can be compared across releases::
+
+    python benchmarks/run_benchmarks.py --poems 1000 10000 100000 --output results.json
+    python benchmarks/run_benchmarks.py --poems 1000 --compare results.json
+
+Each benchmark reports the min, median and mean of ``--repeat`` runs in
+seconds. The ``memory_load_*`` entries instead report, from tracemalloc,
+the bytes a loaded library keeps and the peak while loading, as plain
+dicts and as the slotted records of ``compact=True``. ``--compare`` prints
+each benchmark's median (or retained bytes) against an earlier results
+file and marks those more than ``--threshold`` times slower (or larger).
+"""
+import gc
+import io
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
+from argparse import ArgumentParser
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from generate_corpus import generate  # noqa: E402
+from tamilkavi.tamilkavipy import KaviExtraction, display_books_in_table, display_kavithais_in_table  # noqa: E402
+from tamilkavi.text import fill  # noqa: E402
+
+# Rows rendered by the table benchmarks, whatever the corpus size.
+RENDER_ROWS = 1000
+
+# Poems in the large-table throughput benchmarks (fewer if the corpus is smaller).
+LARGE_RENDER_ROWS = 10000
+
+
+def tamilkavi_version():
+    try:
+        from importlib.metadata import version
+        return version('tamilkavi')
+    except Exception:
+        return 'unknown'
+
+
+def timed(function, repeat, setup=None):
+    """Times function and returns the per-call timing summary.
+
+    Without setup, fast functions are called in a loop (timeit autorange)
+    so each of the repeat samples lasts at least 0.2s; with setup, every
+    call is preceded by setup() and timed on its own.
+    """
+    if setup is None:
+        timer = timeit.Timer(function)
+        number, _ = timer.autorange()
+        times = [total / number for total in timer.repeat(repeat, number)]
+    else:
+        number = 1
+        times = []
+        for _ in range(repeat):
+            setup()
+            started = time.perf_counter()
+            function()
+            times.append(time.perf_counter() - started)
+    return {'repeat': repeat, 'number': number, 'min': min(times), 'median': statistics.median(times),
+            'mean': statistics.mean(times)}
+
+
+def retained_memory(build):
+    """Returns the bytes still allocated once build() returns and the peak while it ran."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        kept = build()  # noqa: F841 (held so its memory counts as retained)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'retained_bytes': current, 'peak_bytes': peak}
+
+
+def bench_memory(data_dir):
+    """Returns the memory of a loaded library as plain dicts and as compact records."""
+    # Imported untraced, so the compact load is not charged for loading the modules.
+    from tamilkavi import records, stream  # noqa: F401
+
+    results = {
+        'memory_load_dicts': retained_memory(lambda: KaviExtraction(data_dir=data_dir, use_cache=False)),
+        'memory_load_compact': retained_memory(lambda: KaviExtraction(data_dir=data_dir, compact=True)),
+    }
+    results['memory_load_compact']['retained_ratio'] = (
+        results['memory_load_compact']['retained_bytes'] / results['memory_load_dicts']['retained_bytes'])
+    return results
+
+
+def quiet(function):
+    """Wraps function so its printed output is discarded."""
+    def run():
+        with redirect_stdout(io.StringIO()):
+            function()
+    return run
+
+
+def bench_size(poems, repeat, workdir):
+    """Returns the benchmark results for one corpus size."""
+    data_dir = generate(Path(workdir) / f"kavisrc-{poems}", poems)
+    cache_dir = Path(workdir) / f"cache-{poems}"
+    results = {}
+
+    cold = KaviExtraction(data_dir=data_dir, use_cache=False, preload=False)
+    results['get_books_from_json'] = timed(cold.get_books_from_json, repeat)
+
+    cached = KaviExtraction(data_dir=data_dir, cache_dir=cache_dir, preload=False)
+    cached.get_books_from_json()  # writes the cache
+    results['get_books_from_json_cached'] = timed(cached.get_books_from_json, repeat)
+    results.update(bench_memory(data_dir))
+    # List-all views served from what the cache compiled.
+    results['list_titles'] = timed(cached.list_titles, repeat)
+    results['list_books'] = timed(cached.list_books, repeat)
+
+    library = cold
+    books = library.saved_books
+    author = books[len(books) // 2]
+    book = author['books'][0]
+    title = book['context'][0]['title']
+
+    results['get_authors'] = timed(lambda: library.get_authors(author['author'], books), repeat)
+    results['get_book'] = timed(lambda: library.get_book(book['booktitle_tanglish'], books), repeat)
+    results['get_titles'] = timed(lambda: library.get_titles(title, books), repeat)
+    # A caller-built list the indexes do not cover, so get_titles scans it.
+    foreign = [dict(each) for each in library.get_all_books(books)]
+    results['get_titles_scan'] = timed(lambda: library.get_titles(title, foreign), repeat)
+    results['get_all_books'] = timed(lambda: library.get_all_books(books), repeat)
+
+    def forget_titles():
+        library._unique_titles = None
+    results['get_all_unique_titles'] = timed(lambda: library.get_all_unique_titles(books), repeat, setup=forget_titles)
+
+    def forget_search_index():
+        library.search_index = None
+    results['search_index_build'] = timed(library.get_search_index, repeat, setup=forget_search_index)
+    results['search'] = timed(lambda: library.search(book['context'][0]['line'].split()[0]), repeat)
+
+    all_books = library.get_all_books(books)[:RENDER_ROWS]
+    poems_to_render = [context for each in all_books for context in each['context']][:RENDER_ROWS]
+    results['display_books_in_table'] = dict(timed(quiet(lambda: display_books_in_table(all_books)), repeat), rows=len(all_books))
+    results['display_kavithais_in_table'] = dict(timed(quiet(lambda: display_kavithais_in_table(poems_to_render)), repeat),
+                                                 rows=len(poems_to_render))
+
+    # Throughput on a large poem table: cold wraps every cell, warm reuses the memoized wraps.
+    large_table = [context for author in books for each in author['books'] for context in each['context']][:LARGE_RENDER_ROWS]
+    render_large = quiet(lambda: display_kavithais_in_table(large_table))
+    results['render_poems_cold'] = throughput(timed(render_large, repeat, setup=fill.cache_clear), len(large_table))
+    results['render_poems_warm'] = throughput(timed(render_large, repeat), len(large_table))
+    return results
+
+
+def throughput(timing, rows):
+    """Adds the row count and rows rendered per second to a timing."""
+    return dict(timing, rows=rows, rows_per_second=rows / timing['median'] if timing['median'] else 0.0)
+
+
+def compare(current, previous_path, threshold):
+    """Prints median ratios against an earlier results file; returns the regressions."""
+    with open(previous_path, 'r', encoding='utf-8') as fh:
+        previous = json.load(fh)
+    regressions = []
+    for size, benchmarks in current['results'].items():
+        for name, timing in benchmarks.items():
+            before = previous.get('results', {}).get(size, {}).get(name)
+            metric, unit = ('median', '{:.6f}s') if 'median' in timing else ('retained_bytes', '{:,} B')
+            if not before or not before.get(metric):
+                continue
+            ratio = timing[metric] / before[metric]
+            mark = '⚠️ ' if ratio > threshold else '  '
+            change = f"{unit.format(before[metric])} -> {unit.format(timing[metric])}"
+            print(f"{mark}{size:>8} poems  {name:<28} {change}  ({ratio:.2f}x)")
+            if ratio > threshold:
+                regressions.append((size, name, ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = ArgumentParser(description="Benchmark tamilkavi on synthetic corpora.")
+    parser.add_argument('--poems', type=int, nargs='+', default=[1000, 10000], help="Corpus sizes in poems (default: 1000 10000)")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per benchmark (default: 3)")
+    parser.add_argument('--output', help="Write the results JSON here (default: stdout)")
+    parser.add_argument('--compare', help="Earlier results JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=1.2, help="Slowdown ratio reported as a regression (default: 1.2)")
+    args = parser.parse_args(argv)
+
+    report = {
+        'tamilkavi': tamilkavi_version(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'repeat': args.repeat,
+        'results': {},
+    }
+    with tempfile.TemporaryDirectory(prefix='tamilkavi-bench-') as workdir:
+        for poems in args.poems:
+            print(f"⏱️  Benchmarking {poems} poems...", file=sys.stderr)
+            report['results'][str(poems)] = bench_size(poems, args.repeat, workdir)
+
+    encoded = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(encoded + '\n', encoding='utf-8')
+        print(f"✅ Results written to {args.output}", file=sys.stderr)
+    else:
+        print(encoded)
+
+    if args.compare and compare(report, args.compare, args.threshold):
+        sys.exit("Exiting: Performance regressions found.")
+
+
+if __name__ == "__main__":
+    main()
@@ -42,12 +42,14 @@ setup(
     ],
 
     package_data={
-        'tamilkavi': ['kavisrc/*.json'],
+        # kavisrc.bundle is written by tamilkavi-build and shipped when present.
+        'tamilkavi': ['kavisrc/*.json', 'kavisrc.bundle'],
     },
 
     entry_points={
         'console_scripts': [
             'tamilkavi = tamilkavi.tamilkavipy:main',
+            'tamilkavi-build = tamilkavi.bundle:main',
         ],
     },
 
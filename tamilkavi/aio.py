@@ -0,0 +1,91 @@
+"""Asyncio facade over KaviExtraction for embedding in async services.
+
+Loading the corpus and running lookups are blocking, CPU- and file-bound
+work, so ``AsyncKavi`` runs them in an executor (the loop's default thread
+pool unless one is given) and awaits the result; the event loop keeps
+serving other requests meanwhile. Load failures raise ``CorpusLoadError``
+instead of exiting the process::
+
+    kavi = await AsyncKavi.load()
+    poems = await kavi.get_titles("Mazhai", author="kavi")
+
+The whole corpus and every lazily built structure (indexes, search and
+trigram indexes, listings) are prepared inside ``load``, so afterwards the
+library is only ever read and the query methods may run concurrently.
+"""
+import asyncio
+import functools
+
+from tamilkavi.tamilkavipy import CorpusLoadError, KaviExtraction
+
+__all__ = ['AsyncKavi', 'CorpusLoadError']
+
+
+def _load_library(options):
+    library = KaviExtraction(**options)
+    library.get_search_index()
+    library.get_trigram_index()
+    library.list_titles()
+    return library
+
+
+class AsyncKavi:
+    def __init__(self, library, executor=None):
+        # Use AsyncKavi.load(); library must be fully loaded and warmed.
+        self.library = library
+        self.executor = executor
+
+    @classmethod
+    async def load(cls, executor=None, **options):
+        """Loads the corpus without blocking the event loop.
+
+        Takes the KaviExtraction keyword arguments (data_dir, cache_dir,
+        compact, packed_path, load_workers, ...); the whole corpus is always
+        loaded. Raises CorpusLoadError when nothing can be loaded.
+        """
+        options['exit_on_error'] = False
+        options['lazy'] = False
+        loop = asyncio.get_running_loop()
+        library = await loop.run_in_executor(executor, _load_library, options)
+        return cls(library, executor)
+
+    async def _run(self, function, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(function, *args, **kwargs))
+
+    def _narrow(self, author=None, book=None):
+        data = self.library.saved_books
+        if author is not None:
+            data = self.library.get_authors(author, data)
+        if book is not None:
+            data = self.library.get_book(book, data)
+        return data
+
+    async def get_authors(self, name):
+        """Returns the author dicts named name."""
+        return await self._run(self.library.get_authors, name, self.library.saved_books)
+
+    async def get_book(self, book_title, author=None):
+        """Returns the books titled book_title, optionally by one author."""
+        return await self._run(lambda: self.library.get_book(book_title, self._narrow(author)))
+
+    async def get_titles(self, title, author=None, book=None, limit=None, offset=0, cursor=None):
+        """Returns the poems titled title, optionally within one author and/or book (pageable)."""
+        return await self._run(lambda: self.library.get_titles(title, self._narrow(author, book), limit, offset, cursor))
+
+    async def search(self, query, author=None, book=None):
+        """Ranked full-text search (see KaviExtraction.search)."""
+        return await self._run(self.library.search, query, author=author, book=book)
+
+    async def suggest(self, text, kind=None, limit=5):
+        """Returns "did you mean" titles for text (see KaviExtraction.suggest)."""
+        return await self._run(self.library.suggest, text, kind=kind, limit=limit)
+
+    async def list_authors(self, limit=None, offset=0, cursor=None):
+        return await self._run(self.library.list_authors, limit, offset, cursor)
+
+    async def list_books(self, limit=None, offset=0, cursor=None):
+        return await self._run(self.library.list_books, limit, offset, cursor)
+
+    async def list_titles(self, limit=None, offset=0, cursor=None):
+        return await self._run(self.library.list_titles, limit, offset, cursor)
@@ -0,0 +1,144 @@
+"""Batch mode: answer many queries with one loaded corpus.
+
+Each input line is a JSON object with any of ``author``, ``book``,
+``title`` and ``search`` (plus an optional ``id`` echoed back)::
+
+    {"id": 1, "author": "kavi", "book": "mazhai-naal"}
+    {"id": 2, "title": "Mazhai"}
+    {"id": 3, "search": "மழை"}
+
+For every line one JSON object is written, in input order, with a
+``status`` of ``ok``, ``not_found`` or ``error``. Author/book/title queries
+return the matching part of the corpus as ``authors`` (see
+``KaviExtraction.subset``); searches return ranked poems as ``results``.
+Queries go to a ``tamilkavi.storage.Backend``: the JSON files, or the
+``--db`` corpus database.
+
+Lookups are pure Python and hold the GIL, so ``--batch-workers N`` answers
+queries in N worker processes, each opening the corpus once (see
+``Backend.opener``), rather than in threads.
+"""
+import json
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from itertools import islice
+
+QUERY_FIELDS = ('author', 'book', 'title', 'search')
+
+# Query lines sent to a worker process at a time, so pickling and IPC are paid per chunk.
+CHUNK_SIZE = 64
+
+# The backend of a worker process, opened once by _open_worker.
+_worker_backend = None
+
+
+def run_query(backend, line):
+    """Answers one input line and returns the result object."""
+    try:
+        query = json.loads(line)
+    except ValueError as e:
+        return {'status': 'error', 'error': f"Invalid JSON: {e}"}
+    if not isinstance(query, dict):
+        return {'status': 'error', 'error': "Query must be a JSON object."}
+
+    result = {'id': query['id']} if 'id' in query else {}
+    fields = {field: query.get(field) for field in QUERY_FIELDS}
+    if all(value is None for value in fields.values()):
+        result.update(status='error', error="Query needs author, book, title or search.")
+        return result
+    if any(value is not None and not isinstance(value, str) for value in fields.values()):
+        result.update(status='error', error="author, book, title and search must be strings.")
+        return result
+
+    try:
+        if fields['search'] is not None:
+            found = backend.search(fields['search'], author=fields['author'], book=fields['book'])
+            result['results'] = found
+        else:
+            found = backend.subset(fields['author'], fields['book'], fields['title'])
+            result['authors'] = found
+    except Exception as e:
+        result.update(status='error', error=str(e))
+        return result
+    result['status'] = 'ok' if found else 'not_found'
+    return result
+
+
+def _open_worker(opener):
+    global _worker_backend
+    # Results travel back to the parent; anything a worker prints goes to stderr.
+    with redirect_stdout(sys.stderr):
+        _worker_backend = opener()
+
+
+def _run_chunk(lines):
+    with redirect_stdout(sys.stderr):
+        return [run_query(_worker_backend, line) for line in lines]
+
+
+def run_batch(backend, lines, out, workers=1):
+    """Answers every query line, writing one JSONL result per query to out.
+
+    With workers > 1 chunks of queries go to a pool of worker processes,
+    each opening the corpus once through ``backend.opener()``; results are
+    still written in input order, and at most a few chunks per worker are
+    in flight, so input of any length is read lazily. Raises ValueError if
+    the backend cannot be reopened. Returns a dict of counts by status plus
+    ``total`` and ``seconds``.
+    """
+    counts = {'total': 0, 'ok': 0, 'not_found': 0, 'error': 0}
+
+    def write(result):
+        counts['total'] += 1
+        counts[result['status']] += 1
+        out.write(json.dumps(result, ensure_ascii=False) + '\n')
+
+    queries = (line for line in lines if line.strip())
+    started = time.perf_counter()
+    if workers <= 1:
+        for line in queries:
+            write(run_query(backend, line))
+    else:
+        opener = backend.opener()
+        if opener is None:
+            raise ValueError("This backend cannot be opened in worker processes; use one worker.")
+        pending = deque()
+        with ProcessPoolExecutor(max_workers=workers, initializer=_open_worker, initargs=(opener,)) as executor:
+            for chunk in iter(lambda: list(islice(queries, CHUNK_SIZE)), []):
+                pending.append(executor.submit(_run_chunk, chunk))
+                if len(pending) >= workers * 2:
+                    for result in pending.popleft().result():
+                        write(result)
+            while pending:
+                for result in pending.popleft().result():
+                    write(result)
+    counts['seconds'] = time.perf_counter() - started
+    return counts
+
+
+def main(backend, source, workers=1):
+    """Runs ``tamilkavi --batch SOURCE`` (a file path, or '-' for stdin)."""
+    try:
+        fh = sys.stdin if source == '-' else open(source, 'r', encoding='utf-8')
+    except OSError as e:
+        print(f"⚠️  Could not read batch file {source}: {e}", file=sys.stderr)
+        sys.exit("Exiting: Cannot read batch queries.")
+
+    out = sys.stdout
+    try:
+        # stdout carries only JSONL results, so warnings from loading the corpus on first use go to stderr.
+        with redirect_stdout(sys.stderr):
+            counts = run_batch(backend, fh, out, workers)
+    except ValueError as e:
+        print(f"⚠️  {e}", file=sys.stderr)
+        sys.exit("Exiting: Cannot answer batch queries.")
+    finally:
+        if fh is not sys.stdin:
+            fh.close()
+
+    rate = counts['total'] / counts['seconds'] if counts['seconds'] else 0.0
+    print(f"✅ {counts['total']} queries in {counts['seconds']:.2f}s ({rate:.0f} queries/s): "
+          f"{counts['ok']} ok, {counts['not_found']} not found, {counts['error']} errors", file=sys.stderr)
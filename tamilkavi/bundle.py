@@ -0,0 +1,197 @@
+"""Compressed corpus bundles built ahead of time.
+
+``tamilkavi-build`` checks every author file against the corpus schema and
+writes the whole corpus, its title listing and its search and trigram
+indexes as one compressed pickle (lzma, or gzip for a ``.gz`` output)::
+
+    tamilkavi-build                          # kavisrc -> tamilkavi/kavisrc.bundle
+    tamilkavi-build --data-dir DIR --output corpus.bundle.gz
+
+``KaviExtraction(bundle_path=...)`` loads a bundle with one read and no JSON
+parsing or index building beyond the lookup dicts. With no ``data_dir`` or
+``bundle_path``, a ``kavisrc.bundle`` shipped inside the package is used in
+place of the JSON files when present and built from their current
+contents; once a JSON file changes the bundle is ignored until it is built
+again. Installing does not keep file mtimes, so the first run hashes the
+JSON files once and remembers the verdict in the user's cache directory
+(see ``matches_sources``). Like the compiled cache, a bundle is a pickle:
+only load bundles you built or installed yourself.
+"""
+import gzip
+import lzma
+import os
+import pickle
+import sys
+from pathlib import Path
+
+# Bump this whenever the layout of the bundle payload changes.
+BUNDLE_VERSION = 3
+
+BUNDLE_NAME = 'kavisrc.bundle'
+
+# Required string fields at each level of an author file.
+AUTHOR_FIELDS = ('author', 'contact')
+BOOK_FIELDS = ('booktitle', 'booktitle_tanglish', 'category')
+POEM_FIELDS = ('title', 'line', 'meaning')
+
+_GZIP_MAGIC = b'\x1f\x8b'
+
+
+def validate_author(data):
+    """Returns the schema problems of one parsed author file (empty when valid)."""
+    if not isinstance(data, dict):
+        return ["top level is not an object"]
+    problems = [f"'{field}' is missing or not a string" for field in AUTHOR_FIELDS if not isinstance(data.get(field), str)]
+    books = data.get('books')
+    if not isinstance(books, list):
+        return problems + ["'books' is missing or not a list"]
+    for book_pos, book in enumerate(books):
+        where = f"books[{book_pos}]"
+        if not isinstance(book, dict):
+            problems.append(f"{where} is not an object")
+            continue
+        problems.extend(f"{where}.{field} is missing or not a string" for field in BOOK_FIELDS
+                        if not isinstance(book.get(field), str))
+        context = book.get('context')
+        if not isinstance(context, list):
+            problems.append(f"{where}.context is missing or not a list")
+            continue
+        for poem_pos, poem in enumerate(context):
+            poem_where = f"{where}.context[{poem_pos}]"
+            if not isinstance(poem, dict):
+                problems.append(f"{poem_where} is not an object")
+                continue
+            problems.extend(f"{poem_where}.{field} is missing or not a string" for field in POEM_FIELDS
+                            if not isinstance(poem.get(field), str))
+    return problems
+
+
+def write_bundle(library, path):
+    """Writes a fully loaded library's corpus and indexes as a bundle file.
+
+    The file is compressed with gzip when path ends in ``.gz`` and with lzma
+    otherwise, and is moved into place only once complete.
+    """
+    path = Path(path)
+    payload = {
+        'version': BUNDLE_VERSION,
+        'files': list(library.source_files),
+        # Signatures of the author files, so a packaged bundle older than them is ignored.
+        'sources': library.sources,
+        'books': library.saved_books,
+        'titles': library.list_titles(),
+        'search_index': library.get_search_index(),
+        'trigram_index': library.get_trigram_index(),
+    }
+    raw = pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+    data = gzip.compress(raw, compresslevel=9) if path.suffix == '.gz' else lzma.compress(raw)
+
+    temp_path = path.with_name(path.name + '.tmp')
+    temp_path.write_bytes(data)
+    os.replace(str(temp_path), str(path))
+    return len(data)
+
+
+def read_bundle(path):
+    """Returns the payload of a bundle file; raises ValueError if it is not one."""
+    # A packaged bundle may be an importlib.resources Traversable rather than a path.
+    raw = path.read_bytes() if hasattr(path, 'read_bytes') else Path(path).read_bytes()
+    try:
+        raw = gzip.decompress(raw) if raw[:2] == _GZIP_MAGIC else lzma.decompress(raw)
+        payload = pickle.loads(raw)
+    except (OSError, EOFError, lzma.LZMAError, pickle.UnpicklingError, AttributeError, ImportError) as e:
+        raise ValueError(f"{path} is not a tamilkavi bundle: {e}") from None
+    if not isinstance(payload, dict) or payload.get('version') != BUNDLE_VERSION:
+        raise ValueError(f"{path} was built by another tamilkavi version; run tamilkavi-build again.")
+    return payload
+
+
+def matches_sources(path, json_files, check_file=None):
+    """Tells whether a bundle was built from the current contents of json_files.
+
+    Returns ``(fresh, payload)``, payload being the bundle payload when it
+    had to be read for the answer and None otherwise. The answer is kept
+    in check_file together with the files' signatures, so while neither the
+    bundle nor the files change later calls only stat them. Raises
+    ValueError (or OSError) when the bundle has to be read and cannot be.
+    """
+    from tamilkavi import cache as corpus_cache
+
+    try:
+        bundle_signature = corpus_cache.file_signature(path)
+    except (OSError, TypeError):
+        bundle_signature = check_file = None
+    if check_file is not None:
+        check, refreshed = corpus_cache.load_cache(check_file, json_files)
+        if check is not None and check.get('bundle') == bundle_signature:
+            if refreshed:
+                corpus_cache.write_cache(check_file, check)
+            return check['fresh'], None
+
+    payload = read_bundle(path)
+    fresh = corpus_cache.sources_match(payload.get('sources'), json_files)[0]
+    if check_file is not None:
+        try:
+            # sources_match has brought the recorded mtimes of unchanged files up to date.
+            sources = payload['sources'] if fresh else {
+                file_path.name: corpus_cache.file_signature(file_path, file_path.read_bytes()) for file_path in json_files}
+        except (OSError, TypeError):
+            return fresh, payload
+        corpus_cache.write_cache(check_file, {'bundle': bundle_signature, 'sources': sources, 'fresh': fresh})
+    return fresh, payload
+
+
+def packaged_bundle():
+    """Returns the bundle shipped inside the package, or None when there is none."""
+    import importlib.resources
+
+    try:
+        bundle = importlib.resources.files('tamilkavi') / BUNDLE_NAME
+        return bundle if bundle.is_file() else None
+    except Exception:
+        return None
+
+
+def main(argv=None):
+    """Validates the corpus and writes its bundle: ``tamilkavi-build [--data-dir DIR] [--output PATH]``."""
+    import json
+    from argparse import ArgumentParser
+    from tamilkavi.tamilkavipy import KaviExtraction
+
+    parser = ArgumentParser(prog='tamilkavi-build', description="Validate the kavisrc JSON and build a compressed corpus bundle.")
+    parser.add_argument('--data-dir', dest="data_dir", help="Directory of author JSON files (defaults to the packaged kavisrc)")
+    parser.add_argument('--output', help=f"Bundle to write; .gz uses gzip, anything else lzma (default: {BUNDLE_NAME} next to the package)")
+    parser.add_argument('--check', action='store_true', help="Only validate the author files")
+    args = parser.parse_args(argv)
+
+    library = KaviExtraction(data_dir=args.data_dir, preload=False, use_cache=False)
+    data_dir = library._resolve_data_dir()
+    invalid = 0
+    for file_path in library._find_json_files(data_dir):
+        try:
+            problems = validate_author(json.loads(file_path.read_bytes().decode('utf-8')))
+        except (OSError, ValueError) as e:
+            problems = [f"could not be read: {e}"]
+        if problems:
+            invalid += 1
+            print(f"⚠️  {file_path.name}:")
+            for problem in problems:
+                print(f"   - {problem}")
+    if invalid:
+        sys.exit(f"Exiting: {invalid} author file(s) do not match the corpus schema.")
+    if args.check:
+        print("✅ All author files are valid.")
+        return
+
+    library.get_books_from_json()
+    output = args.output or Path(__file__).resolve().parent / BUNDLE_NAME
+    try:
+        size = write_bundle(library, output)
+    except OSError as e:
+        print(f"⚠️  Could not write {output}: {e}")
+        sys.exit("Exiting: Bundle could not be written.")
+    print(f"✅ Bundled {len(library.saved_books)} authors into {output} ({size / 1024:.1f} KiB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""Compiled cache of the kavisrc corpus.
+
+Parsing every ``kavisrc/*.json`` file on each ``tamilkavi`` invocation makes
+cold start grow with the size of the anthology. The cache stores the parsed
+author list as a single pickle snapshot, together with the mtime, size and
+content hash of every source file it was built from, so that later runs can
+load the whole corpus with one read.
+"""
+import hashlib
+import os
+import pickle
+import tempfile
+from pathlib import Path
+
+# Bump this whenever the layout of the cached payload changes.
+CACHE_VERSION = 4
+
+
+def default_cache_dir():
+    """Returns the directory used for compiled caches.
+
+    ``TAMILKAVI_CACHE_DIR`` wins, then ``$XDG_CACHE_HOME/tamilkavi``,
+    then ``~/.cache/tamilkavi``.
+    """
+    env_dir = os.environ.get('TAMILKAVI_CACHE_DIR')
+    if env_dir:
+        return Path(env_dir)
+    xdg_dir = os.environ.get('XDG_CACHE_HOME')
+    base = Path(xdg_dir) if xdg_dir else Path.home() / '.cache'
+    return base / 'tamilkavi'
+
+
+def cache_file_for(data_dir, cache_dir=None):
+    """Returns the cache file path for a given data directory."""
+    key = hashlib.sha1(str(data_dir).encode('utf-8')).hexdigest()[:16]
+    return Path(cache_dir or default_cache_dir()) / f'corpus-{key}.pickle'
+
+
+def bundle_check_file_for(bundle_path, cache_dir=None):
+    """Returns the file remembering whether a bundle matched its JSON sources."""
+    key = hashlib.sha1(str(bundle_path).encode('utf-8')).hexdigest()[:16]
+    return Path(cache_dir or default_cache_dir()) / f'bundle-{key}.pickle'
+
+
+def content_hash(raw_bytes):
+    """Returns the hex digest used to detect content changes."""
+    return hashlib.sha256(raw_bytes).hexdigest()
+
+
+def file_signature(file_path, raw_bytes=None):
+    """Returns the mtime/size (and, if bytes are given, hash) of a source file.
+
+    Raises OSError or TypeError when the file does not live on a real
+    filesystem (e.g. inside a zipped package), in which case callers should
+    simply skip caching.
+    """
+    stat = os.stat(file_path)
+    signature = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+    if raw_bytes is not None:
+        signature['sha256'] = content_hash(raw_bytes)
+    return signature
+
+
+def load_cache(cache_file, json_files):
+    """Loads a cached payload if it still matches the given source files.
+
+    Returns a ``(payload, refreshed)`` tuple. ``payload`` is ``None`` when the
+    cache is missing, corrupt or stale. ``refreshed`` is True when some files
+    were touched without their content changing; the caller should write the
+    payload back so the new mtimes are remembered.
+    """
+    try:
+        with open(cache_file, 'rb') as fh:
+            payload = pickle.load(fh)
+    except FileNotFoundError:
+        return None, False
+    except Exception:
+        # Truncated or otherwise unreadable snapshot; fall back to JSON.
+        return None, False
+
+    if not isinstance(payload, dict) or payload.get('version') != CACHE_VERSION:
+        return None, False
+
+    ok, refreshed = sources_match(payload.get('sources'), json_files)
+    if not ok:
+        return None, False
+    return payload, refreshed
+
+
+def sources_match(sources, json_files):
+    """Checks recorded source signatures against the current files.
+
+    Returns ``(ok, refreshed)``. Files whose mtime changed but whose bytes
+    still hash the same count as unchanged; their recorded mtime is updated
+    in place and ``refreshed`` is set so the caller can persist it.
+    """
+    if not isinstance(sources, dict) or set(sources) != {f.name for f in json_files}:
+        return False, False
+
+    refreshed = False
+    try:
+        for file_path in json_files:
+            cached = sources[file_path.name]
+            current = file_signature(file_path)
+            if current['mtime_ns'] == cached['mtime_ns'] and current['size'] == cached['size']:
+                continue
+            if current['size'] != cached['size']:
+                return False, False
+            # Same size but a new mtime: only trust the cache if the bytes match.
+            if content_hash(file_path.read_bytes()) != cached['sha256']:
+                return False, False
+            cached['mtime_ns'] = current['mtime_ns']
+            refreshed = True
+    except (OSError, TypeError, KeyError):
+        return False, False
+
+    return True, refreshed
+
+
+def diff_sources(sources, json_files):
+    """Works out which source files changed since their signatures were recorded.
+
+    Returns ``(added, modified, removed)`` lists of file names. Like
+    ``sources_match``, a file with a new mtime but unchanged bytes is not
+    modified; its recorded mtime is updated in ``sources`` instead.
+    """
+    current_names = {file_path.name for file_path in json_files}
+    added = [file_path.name for file_path in json_files if file_path.name not in sources]
+    removed = [name for name in sources if name not in current_names]
+    modified = []
+    for file_path in json_files:
+        cached = sources.get(file_path.name)
+        if cached is None:
+            continue
+        try:
+            current = file_signature(file_path)
+            if current['mtime_ns'] == cached['mtime_ns'] and current['size'] == cached['size']:
+                continue
+            if current['size'] == cached['size'] and content_hash(file_path.read_bytes()) == cached['sha256']:
+                cached['mtime_ns'] = current['mtime_ns']
+                continue
+        except (OSError, TypeError, KeyError):
+            pass
+        modified.append(file_path.name)
+    return added, modified, removed
+
+
+def write_cache(cache_file, payload):
+    """Atomically writes a payload to the cache file.
+
+    Failures (read-only home directory, full disk, ...) are ignored: the
+    cache is an optimisation and the JSON path keeps working without it.
+    """
+    payload = dict(payload, version=CACHE_VERSION)
+    return atomic_write(cache_file, lambda fh: pickle.dump(payload, fh, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def atomic_write(path, dump):
+    """Calls ``dump(fh)`` on a temporary file, then moves it over ``path``.
+
+    Returns False instead of raising when the file cannot be written.
+    """
+    path = Path(path)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=str(path.parent), prefix='.' + path.stem + '-', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as fh:
+                dump(fh)
+            os.replace(tmp_name, str(path))
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
+    except Exception:
+        return False
+    return True
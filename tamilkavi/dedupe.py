@@ -0,0 +1,173 @@
+"""Near-duplicate poem detection with MinHash and LSH.
+
+``tamilkavi --dedupe-report`` lists groups of poems whose lines are near
+copies of each other, across all authors, so curators can merge or fix
+them before a release.
+
+Each poem's ``line`` is cut into word shingles (runs of ``SHINGLE_SIZE``
+search tokens, so Tamil grapheme clusters stay whole). A MinHash signature
+of ``NUM_PERM`` values estimates how much two poems' shingle sets overlap,
+and LSH banding splits each signature into bands: only poems that agree on
+a whole band land in the same bucket and get compared. The work therefore
+grows with the number of poems and of real near-duplicates, not with every
+pair of poems. Candidates are confirmed with the exact Jaccard similarity
+of their shingle sets against ``--dedupe-threshold``.
+
+The band size follows the threshold (see ``lsh_params``): high thresholds
+use long bands, which few dissimilar poems share, and low thresholds short
+ones, so that pairs right at the threshold are still found.
+"""
+import random
+import sys
+import zlib
+
+from tamilkavi.text import tokenize
+
+SHINGLE_SIZE = 3
+NUM_PERM = 64
+
+# Chance that a pair exactly at the threshold shares at least one band.
+MIN_RECALL = 0.99
+
+# Poems at least this similar (Jaccard over shingles) are reported together.
+DEFAULT_THRESHOLD = 0.8
+
+# Modulus of the MinHash permutations (a Mersenne prime above the 32-bit shingle hashes).
+_PRIME = (1 << 61) - 1
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    """Returns the set of word shingles of a text; a short text is one shingle."""
+    tokens = tokenize(text)
+    if len(tokens) <= size:
+        return {' '.join(tokens)} if tokens else set()
+    return {' '.join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+
+
+def jaccard(first, second):
+    return len(first & second) / len(first | second) if first or second else 0.0
+
+
+class MinHasher:
+    def __init__(self, num_perm=NUM_PERM, seed=1):
+        rng = random.Random(seed)
+        self.permutations = [(rng.randrange(1, _PRIME), rng.randrange(_PRIME)) for _ in range(num_perm)]
+
+    def signature(self, shingle_set):
+        """Returns the MinHash signature (a tuple of num_perm ints) of a non-empty shingle set."""
+        hashes = [zlib.crc32(shingle.encode('utf-8')) for shingle in shingle_set]
+        return tuple(min([(a * value + b) % _PRIME for value in hashes]) for a, b in self.permutations)
+
+
+def lsh_params(threshold, num_perm=NUM_PERM, recall=MIN_RECALL):
+    """Returns the ``(bands, rows)`` banding of num_perm MinHash values for a threshold.
+
+    Picks the longest bands for which a pair with Jaccard similarity equal to
+    threshold still lands in a shared bucket with probability ``recall``
+    (``1 - (1 - threshold ** rows) ** bands``). Raises ValueError when even
+    one-value bands cannot reach it.
+    """
+    for rows in range(num_perm, 0, -1):
+        bands = num_perm // rows
+        if 1 - (1 - threshold ** rows) ** bands >= recall:
+            return bands, rows
+    raise ValueError(f"a similarity threshold of {threshold} is too low to find near-duplicates reliably")
+
+
+def find_clusters(texts, threshold=DEFAULT_THRESHOLD, num_perm=NUM_PERM):
+    """Groups near-duplicate texts.
+
+    Returns clusters as sorted lists of indexes into texts, each with at
+    least two members, ordered by their first member. Texts without any
+    tokens are never reported.
+    """
+    bands, rows = lsh_params(threshold, num_perm)
+    hasher = MinHasher(num_perm)
+    shingle_sets = {}
+    buckets = {}
+    for index, text in enumerate(texts):
+        shingle_set = shingles(text)
+        if not shingle_set:
+            continue
+        shingle_sets[index] = shingle_set
+        signature = hasher.signature(shingle_set)
+        for band in range(bands):
+            buckets.setdefault((band, signature[band * rows:(band + 1) * rows]), []).append(index)
+
+    parent = {}
+
+    def root(index):
+        while parent.get(index, index) != index:
+            parent[index] = parent.get(parent[index], parent[index])
+            index = parent[index]
+        return index
+
+    for members in buckets.values():
+        if len(members) < 2:
+            continue
+        # Each member is checked against one representative per group found in this bucket so far.
+        representatives = []
+        for index in members:
+            for representative in representatives:
+                if root(index) == root(representative):
+                    break
+                if jaccard(shingle_sets[index], shingle_sets[representative]) >= threshold:
+                    parent[root(index)] = root(representative)
+                    break
+            else:
+                representatives.append(index)
+
+    clusters = {}
+    for index in shingle_sets:
+        clusters.setdefault(root(index), []).append(index)
+    return sorted((sorted(members) for members in clusters.values() if len(members) > 1), key=lambda members: members[0])
+
+
+def report_rows(library, threshold=DEFAULT_THRESHOLD):
+    """Yields one output row per poem in a near-duplicate cluster of a loaded library.
+
+    Rows carry the cluster number, the poem's similarity to the cluster's
+    first poem, and the file, author, book, title and position of the poem.
+    """
+    locations, texts = [], []
+    for author_pos, author in enumerate(library.saved_books):
+        file_name = library.source_files[author_pos] if author_pos < len(library.source_files) else 'N/A'
+        for book in author.get('books', []):
+            for poem_pos, poem in enumerate(book.get('context', []), start=1):
+                locations.append((file_name, author, book, poem, poem_pos))
+                line = poem.get('line')
+                texts.append(line if isinstance(line, str) else '')
+
+    for number, members in enumerate(find_clusters(texts, threshold), start=1):
+        first = shingles(texts[members[0]])
+        for index in members:
+            file_name, author, book, poem, poem_pos = locations[index]
+            yield {
+                'cluster': number,
+                'similarity': round(jaccard(first, shingles(texts[index])), 2),
+                'file': file_name,
+                'author': author.get('author', 'Unknown'),
+                'booktitle_tanglish': book.get('booktitle_tanglish', 'N/A'),
+                'title': poem.get('title', 'N/A'),
+                'poem': poem_pos,
+            }
+
+
+def main(library, threshold=DEFAULT_THRESHOLD, output_format='table'):
+    """Prints the near-duplicate report of a loaded library in the given output format."""
+    from tamilkavi import output
+
+    if not 0 < threshold <= 1:
+        sys.exit("Exiting: --dedupe-threshold must be above 0 and at most 1.")
+    try:
+        lsh_params(threshold)
+    except ValueError as e:
+        print(f"⚠️  {str(e).capitalize()}.", file=sys.stderr)
+        sys.exit("Exiting: Use a higher --dedupe-threshold.")
+    rows = list(report_rows(library, threshold))
+    info = print if output_format == 'table' else (lambda *values: print(*values, file=sys.stderr))
+    if not rows:
+        info("✅ No near-duplicate poems found.")
+        return
+    info(f"\n🔁 {rows[-1]['cluster']} group(s) of near-duplicate poems (similarity >= {threshold}):")
+    output.render(rows, output.DEDUPE_COLUMNS, output_format)
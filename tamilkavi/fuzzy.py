@@ -0,0 +1,164 @@
+"""Typo-tolerant title matching with a character trigram index.
+
+Book titles (Tamil and Tanglish) and poem titles are split into grapheme
+trigrams. A lookup only scores the titles that share at least one trigram
+with the query, so suggestions stay cheap on a large corpus instead of
+computing an edit distance against every title.
+"""
+from array import array
+from difflib import SequenceMatcher
+
+from tamilkavi.text import graphemes, normalize_key
+
+# Titles scoring below this are not worth suggesting.
+MIN_SIMILARITY = 0.3
+
+
+def trigrams(text):
+    """Returns the set of grapheme trigrams of a normalized string."""
+    clusters = ['^', '^'] + graphemes(normalize_key(text)) + ['$']
+    return {''.join(clusters[i:i + 3]) for i in range(len(clusters) - 2)}
+
+
+class TrigramIndex:
+    def __init__(self):
+        # Parallel lists, one entry per distinct normalized title.
+        self.keys = []
+        self.labels = []
+        self.kinds = []
+        self.gram_counts = array('I')
+        # How many book and poem titles use each entry; one no title uses is
+        # dropped from grams (its slot in the lists stays unused).
+        self.uses = array('I')
+        # trigram -> array of title ids
+        self.grams = {}
+        self._ids = {}
+
+    @classmethod
+    def build(cls, saved_books):
+        """Indexes every book title and poem title in a list of author dicts."""
+        index = cls()
+        for author in saved_books:
+            for label, kind in _titles(author):
+                index.add(label, kind)
+        return index
+
+    def patched(self, saved_books, removed, added):
+        """Returns the index of saved_books, where the authors in removed were replaced by those in added.
+
+        Only the trigram lists of titles no author uses any more, and of
+        new titles, are copied and changed; this index is left as it was
+        for lookups still running on it. Once unused entries outnumber the
+        others the index is built again instead.
+        """
+        index = TrigramIndex()
+        index.keys = list(self.keys)
+        index.labels = list(self.labels)
+        index.kinds = list(self.kinds)
+        index.gram_counts = array('I', self.gram_counts)
+        index.uses = array('I', self.uses)
+        index.grams = dict(self.grams)
+        index._ids = dict(self._ids)
+        copied = set()
+        for author in removed:
+            for label, kind in _titles(author):
+                index.remove(label, kind, copied)
+        if len(index.keys) - len(index._ids) > len(index._ids):
+            return TrigramIndex.build(saved_books)
+        for author in added:
+            for label, kind in _titles(author):
+                index.add(label, kind, copied)
+        return index
+
+    def add(self, label, kind, copied=None):
+        """Adds a title of the given kind ('book' or 'title').
+
+        copied, when given, is the set of trigrams whose id lists this index
+        already owns; others are shared with the index it was patched from
+        and are copied before they change.
+        """
+        if not isinstance(label, str) or not label.strip():
+            return
+        key = normalize_key(label)
+        title_id = self._ids.get((key, kind))
+        if title_id is not None:
+            self.uses[title_id] += 1
+            return
+
+        title_id = self._ids[(key, kind)] = len(self.keys)
+        grams = trigrams(label)
+        self.keys.append(key)
+        self.labels.append(label)
+        self.kinds.append(kind)
+        self.gram_counts.append(len(grams))
+        self.uses.append(1)
+        for gram in grams:
+            ids = self.grams.get(gram)
+            if ids is None:
+                ids = self.grams[gram] = array('I')
+            elif copied is not None and gram not in copied:
+                ids = self.grams[gram] = array('I', ids)
+            if copied is not None:
+                copied.add(gram)
+            ids.append(title_id)
+
+    def remove(self, label, kind, copied=None):
+        """Drops one use of a title added with ``add``."""
+        if not isinstance(label, str) or not label.strip():
+            return
+        key = normalize_key(label)
+        title_id = self._ids.get((key, kind))
+        if title_id is None:
+            return
+        self.uses[title_id] -= 1
+        if self.uses[title_id]:
+            return
+
+        del self._ids[(key, kind)]
+        for gram in trigrams(label):
+            ids = array('I', [each for each in self.grams.get(gram, ()) if each != title_id])
+            if ids:
+                self.grams[gram] = ids
+                if copied is not None:
+                    copied.add(gram)
+            else:
+                self.grams.pop(gram, None)
+
+    def suggest(self, query, kind=None, limit=5):
+        """Returns up to ``limit`` ``(title, score)`` pairs closest to query.
+
+        ``kind`` restricts suggestions to book titles ('book') or poem titles
+        ('title'). Candidates come from shared trigrams and are ranked by
+        trigram overlap, then refined with a character-level ratio.
+        """
+        query_grams = trigrams(query)
+        shared = {}
+        for gram in query_grams:
+            for title_id in self.grams.get(gram, ()):
+                shared[title_id] = shared.get(title_id, 0) + 1
+
+        query_key = normalize_key(query)
+        scored = []
+        for title_id, overlap in shared.items():
+            if kind is not None and self.kinds[title_id] != kind:
+                continue
+            jaccard = overlap / (len(query_grams) + self.gram_counts[title_id] - overlap)
+            if jaccard < MIN_SIMILARITY / 2:
+                continue
+            ratio = SequenceMatcher(None, query_key, self.keys[title_id]).ratio()
+            score = (jaccard + ratio) / 2
+            if score >= MIN_SIMILARITY:
+                scored.append((score, title_id))
+
+        # Ties go by title, so they rank the same however the index was built or patched.
+        scored.sort(key=lambda item: (-item[0], self.keys[item[1]], self.kinds[item[1]]))
+        return [(self.labels[title_id], round(score, 3)) for score, title_id in scored[:limit]]
+
+
+def _titles(author):
+    """Yields the ``(title, kind)`` pairs of one author, in index order."""
+    for book in author.get('books', []):
+        for field in ('booktitle_tanglish', 'booktitle'):
+            yield book.get(field), 'book'
+        for context in book.get('context', []):
+            yield context.get('title'), 'title'
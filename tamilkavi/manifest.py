@@ -0,0 +1,115 @@
+"""Corpus manifest: which kavisrc file holds which author, book and poem.
+
+The manifest is a small JSON document that lets ``KaviExtraction`` open
+only the author files a query needs, and answer the list-all commands
+(``-a``, ``-b`` and ``-t`` with no value) without opening any of them.
+It is written next to the compiled corpus cache on first run and rebuilt
+whenever a source file is added, removed or changed.
+"""
+import hashlib
+import json
+from pathlib import Path
+
+from tamilkavi import cache as corpus_cache
+from tamilkavi.text import normalize_key
+
+MANIFEST_VERSION = 1
+
+
+def manifest_file_for(data_dir, cache_dir=None):
+    """Returns the manifest path for a given data directory."""
+    key = hashlib.sha1(str(data_dir).encode('utf-8')).hexdigest()[:16]
+    return Path(cache_dir or corpus_cache.default_cache_dir()) / f'manifest-{key}.json'
+
+
+def build_manifest(sources, source_files, books):
+    """Builds a manifest from loaded author dicts.
+
+    ``source_files`` is parallel to ``books`` and names the file each author
+    dict was read from; ``sources`` holds the file signatures.
+    """
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'sources': sources,
+        'authors': [],
+        'books': [],
+        'titles': [],
+        'author_files': {},
+        'book_files': {},
+        'title_files': {},
+    }
+    unique_titles = set()
+
+    def add(index, key, file_name):
+        files = manifest[index].setdefault(normalize_key(key), [])
+        if file_name not in files:
+            files.append(file_name)
+
+    for file_name, author in zip(source_files, books):
+        name = author.get('author')
+        manifest['authors'].append({'author': name, 'file': file_name})
+        if isinstance(name, str):
+            add('author_files', name, file_name)
+        for book in author.get('books', []):
+            manifest['books'].append({
+                'booktitle': book.get('booktitle', 'N/A'),
+                'booktitle_tanglish': book.get('booktitle_tanglish', 'N/A'),
+                'category': book.get('category', 'N/A'),
+                'file': file_name,
+            })
+            for field in ('booktitle_tanglish', 'booktitle'):
+                if isinstance(book.get(field, ''), str):
+                    add('book_files', book.get(field, ''), file_name)
+            for context in book.get('context', []):
+                title = context.get('title', '')
+                if isinstance(title, str):
+                    add('title_files', title, file_name)
+                    if title:
+                        unique_titles.add(title)
+
+    manifest['titles'] = sorted(unique_titles)
+    return manifest
+
+
+def load_manifest(manifest_file, json_files):
+    """Loads the manifest if it still matches the given source files.
+
+    Returns ``(manifest, refreshed)`` like ``tamilkavi.cache.load_cache``.
+    """
+    try:
+        with open(manifest_file, 'r', encoding='utf-8') as fh:
+            manifest = json.load(fh)
+    except (OSError, ValueError):
+        return None, False
+
+    if not isinstance(manifest, dict) or manifest.get('version') != MANIFEST_VERSION:
+        return None, False
+
+    ok, refreshed = corpus_cache.sources_match(manifest.get('sources'), json_files)
+    if not ok:
+        return None, False
+    return manifest, refreshed
+
+
+def write_manifest(manifest_file, manifest):
+    """Atomically writes the manifest; failures are ignored."""
+    encoded = json.dumps(manifest, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return corpus_cache.atomic_write(manifest_file, lambda fh: fh.write(encoded))
+
+
+def files_for_query(manifest, author=None, book=None, title=None):
+    """Returns the source files that can hold results for a query.
+
+    Each given predicate narrows the set; with no predicate every file is
+    returned. Files come back in manifest (load) order.
+    """
+    ordered = []
+    for entry in manifest['authors']:
+        if entry['file'] not in ordered:
+            ordered.append(entry['file'])
+
+    candidates = set(ordered)
+    for index, value in (('author_files', author), ('book_files', book), ('title_files', title)):
+        if value is not None:
+            candidates &= set(manifest[index].get(normalize_key(value), []))
+    return [file_name for file_name in ordered if file_name in candidates]
@@ -0,0 +1,167 @@
+"""Output renderers for books, poems and listings.
+
+Every renderer consumes rows one at a time from an iterable, so results can
+be produced by a generator and written as they arrive:
+
+* ``table`` prints PrettyTable pages of ``PAGE_SIZE`` rows, so the first
+  rows appear before the rest have been wrapped and measured.
+* ``jsonl`` writes one JSON object per row.
+* ``csv`` and ``tsv`` write a header line, then one line per row.
+"""
+import sys
+from collections import namedtuple
+
+from tamilkavi import profiling
+
+FORMATS = ('table', 'jsonl', 'csv', 'tsv')
+
+# Rows per PrettyTable page.
+PAGE_SIZE = 50
+
+# header: table/CSV heading; field: JSONL key; width: table wrap width;
+# value: optional function computing the table cell from the row.
+Column = namedtuple('Column', ['header', 'field', 'width', 'value'])
+Column.__new__.__defaults__ = (None, None)
+
+BOOK_COLUMNS = (
+    Column("SNO", 'sno'),
+    Column("Book Title (Tanglish)", 'booktitle_tanglish', 40),
+    Column("Book Title (Tamil)", 'booktitle', 40),
+    Column("Category", 'category', 20),
+)
+
+KAVITHAI_COLUMNS = (
+    Column("SNO", 'sno'),
+    Column("Kavithai Title", 'title', 30),
+    Column("Kavithai", 'line', 60),
+    Column("Kavithai Meaning", 'meaning', 60),
+)
+
+AUTHOR_LIST_COLUMNS = (
+    Column("Author", 'author'),
+)
+
+TITLE_LIST_COLUMNS = (
+    Column("SNO", 'sno'),
+    Column("Kavithai Title", 'title'),
+)
+
+# Extra columns for poems that carry their author and book (e.g. search results).
+SOURCE_COLUMNS = (
+    Column("Author", 'author'),
+    Column("Book Title (Tanglish)", 'booktitle_tanglish'),
+)
+
+
+def _source_cell(row):
+    from tamilkavi.tamilkavipy import wrap_text
+
+    return f"{wrap_text(row['author'], 30)}\n{wrap_text(row['booktitle_tanglish'], 30)}"
+
+
+# Near-duplicate poems reported by tamilkavi --dedupe-report.
+DEDUPE_COLUMNS = (
+    Column("Cluster", 'cluster'),
+    Column("Similarity", 'similarity'),
+    Column("File", 'file', 30),
+    Column("Author", 'author', 30),
+    Column("Book Title (Tanglish)", 'booktitle_tanglish', 30),
+    Column("Kavithai Title", 'title', 30),
+    Column("Poem #", 'poem'),
+)
+
+# The table shows author and book together in one column.
+SOURCE_TABLE_COLUMN = Column("Author / Book", 'author', None, _source_cell)
+
+
+def book_rows(books, start=1):
+    """Yields one output row per book dict, numbered from start."""
+    for index, book in enumerate(books, start=start):
+        yield {
+            'sno': index,
+            'booktitle_tanglish': book.get('booktitle_tanglish', 'N/A'),
+            'booktitle': book.get('booktitle', 'N/A'),
+            'category': book.get('category', 'N/A'),
+        }
+
+
+def kavithai_rows(kavithais, show_source=False, start=1):
+    """Yields one output row per poem context dict, numbered from start."""
+    for index, kavithai in enumerate(kavithais, start=start):
+        row = {
+            'sno': index,
+            'title': kavithai.get('title', 'N/A'),
+            'line': kavithai.get('line', 'N/A'),
+            'meaning': kavithai.get('meaning', 'N/A'),
+        }
+        if show_source:
+            row['author'] = kavithai.get('author', 'Unknown')
+            row['booktitle_tanglish'] = kavithai.get('booktitle_tanglish', 'N/A')
+        yield row
+
+
+def render(rows, columns, output_format='table', out=None, page_size=PAGE_SIZE):
+    """Writes rows in the given format and returns how many were written."""
+    out = out if out is not None else sys.stdout
+    with profiling.phase('render'):
+        if output_format == 'table':
+            return _render_table(rows, columns, out, page_size)
+        if output_format == 'jsonl':
+            return _render_jsonl(rows, columns, out)
+        if output_format in ('csv', 'tsv'):
+            return _render_delimited(rows, columns, out, ',' if output_format == 'csv' else '\t')
+    raise ValueError(f"Unknown output format: {output_format!r} (expected one of {', '.join(FORMATS)})")
+
+
+def _render_table(rows, columns, out, page_size):
+    from prettytable import PrettyTable
+    from tamilkavi.tamilkavipy import wrap_text
+
+    def flush(page):
+        table = PrettyTable()
+        table.field_names = [column.header for column in columns]
+        for row in page:
+            cells = []
+            for column in columns:
+                if column.value is not None:
+                    cells.append(column.value(row))
+                elif column.width is not None:
+                    cells.append(wrap_text(row[column.field], column.width))
+                else:
+                    cells.append(row[column.field])
+            table.add_row(cells)
+        print(table, file=out, flush=True)
+
+    count = 0
+    page = []
+    for row in rows:
+        page.append(row)
+        count += 1
+        if len(page) == page_size:
+            flush(page)
+            page = []
+    if page:
+        flush(page)
+    return count
+
+
+def _render_jsonl(rows, columns, out):
+    import json
+
+    count = 0
+    for row in rows:
+        out.write(json.dumps({column.field: row[column.field] for column in columns}, ensure_ascii=False) + '\n')
+        count += 1
+    return count
+
+
+def _render_delimited(rows, columns, out, delimiter):
+    import csv
+
+    writer = csv.writer(out, delimiter=delimiter, lineterminator='\n')
+    writer.writerow([column.field for column in columns])
+    count = 0
+    for row in rows:
+        writer.writerow([row[column.field] for column in columns])
+        count += 1
+    return count
@@ -0,0 +1,254 @@
+"""Memory-mapped, columnar corpus file.
+
+A packed corpus is a single read-only file that ``KaviExtraction`` can
+``mmap`` instead of parsing JSON. Several worker processes mapping the same
+file share one copy in the page cache, and poem text is only decoded when
+it is actually read (e.g. when a poem is displayed).
+
+Layout (all integers little-endian)::
+
+    header   MAGIC, then uint32 author/book/poem counts and
+             uint64 offsets of the three tables and the text blob
+    authors  AUTHOR_COLUMNS uint32 per author
+    books    BOOK_COLUMNS uint32 per book
+    poems    POEM_COLUMNS uint32 per poem
+    blob     UTF-8 text; every string column is an (offset, length) pair
+             into it, with length ABSENT for keys missing in the source
+
+Repeated strings (titles, categories, names) are stored once in the blob.
+"""
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Mapping
+from pathlib import Path
+
+MAGIC = b'TKVPACK1'
+_HEADER = struct.Struct('<8s3I4Q')
+
+# Marks a string column whose key was absent from the source JSON.
+ABSENT = 0xFFFFFFFF
+
+# name, contact, first_book, book_count
+AUTHOR_COLUMNS = 6
+# booktitle, booktitle_tanglish, description, category, first_poem, poem_count, author
+BOOK_COLUMNS = 11
+# title, line, meaning, book
+POEM_COLUMNS = 7
+
+
+def write_packed(saved_books, path):
+    """Writes a list of author dicts (or records) as a packed corpus file.
+
+    The file is built under a temporary name and moved into place, so a
+    process still mapping the previous file keeps reading it intact.
+    """
+    blob = bytearray()
+    strings = {}
+
+    def text(mapping, key):
+        value = mapping.get(key)
+        if key not in mapping or not isinstance(value, str):
+            return (0, ABSENT)
+        found = strings.get(value)
+        if found is None:
+            encoded = value.encode('utf-8')
+            found = strings[value] = (len(blob), len(encoded))
+            blob.extend(encoded)
+        return found
+
+    authors, books, poems = array('I'), array('I'), array('I')
+    for author_index, author in enumerate(saved_books):
+        author_books = author.get('books', [])
+        authors.extend(text(author, 'author') + text(author, 'contact') + (len(books) // BOOK_COLUMNS, len(author_books)))
+        for book in author_books:
+            context = book.get('context', [])
+            books.extend(text(book, 'booktitle') + text(book, 'booktitle_tanglish') + text(book, 'description')
+                         + text(book, 'category') + (len(poems) // POEM_COLUMNS, len(context), author_index))
+            for poem in context:
+                poems.extend(text(poem, 'title') + text(poem, 'line') + text(poem, 'meaning')
+                             + (len(books) // BOOK_COLUMNS - 1,))
+
+    if len(blob) >= ABSENT:
+        raise ValueError("Corpus text is too large for a packed file (4 GiB limit).")
+    if sys.byteorder != 'little':
+        for table in (authors, books, poems):
+            table.byteswap()
+
+    authors_offset = _HEADER.size
+    books_offset = authors_offset + len(authors) * 4
+    poems_offset = books_offset + len(books) * 4
+    blob_offset = poems_offset + len(poems) * 4
+    header = _HEADER.pack(MAGIC, len(authors) // AUTHOR_COLUMNS, len(books) // BOOK_COLUMNS,
+                          len(poems) // POEM_COLUMNS, authors_offset, books_offset, poems_offset, blob_offset)
+    path = Path(path)
+    temp_path = path.with_name(path.name + '.tmp')
+    with open(temp_path, 'wb') as fh:
+        fh.write(header)
+        authors.tofile(fh)
+        books.tofile(fh)
+        poems.tofile(fh)
+        fh.write(blob)
+    os.replace(str(temp_path), str(path))
+
+
+class PackedCorpus:
+    """A read-only view over a packed corpus file."""
+
+    def __init__(self, path):
+        with open(path, 'rb') as fh:
+            self._mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            (magic, self.author_count, self.book_count, self.poem_count,
+             authors_offset, books_offset, poems_offset, self._blob) = _HEADER.unpack_from(self._mm, 0)
+        except struct.error:
+            magic = None
+        if magic != MAGIC:
+            self._mm.close()
+            raise ValueError(f"{path} is not a packed tamilkavi corpus.")
+
+        self._authors = self._table(authors_offset, self.author_count * AUTHOR_COLUMNS)
+        self._books = self._table(books_offset, self.book_count * BOOK_COLUMNS)
+        self._poems = self._table(poems_offset, self.poem_count * POEM_COLUMNS)
+
+    def _table(self, offset, count):
+        if sys.byteorder == 'little':
+            # Zero-copy: the integers are read straight out of the mapping.
+            return memoryview(self._mm)[offset:offset + count * 4].cast('I')
+        table = array('I', self._mm[offset:offset + count * 4])
+        table.byteswap()
+        return table
+
+    def text(self, offset, length):
+        """Decodes one string from the blob."""
+        start = self._blob + offset
+        return str(self._mm[start:start + length], 'utf-8')
+
+    def authors(self):
+        """Returns the authors as dict-compatible lazy views."""
+        return [PackedAuthor(self, index) for index in range(self.author_count)]
+
+    def close(self):
+        for table in (self._authors, self._books, self._poems):
+            if isinstance(table, memoryview):
+                table.release()
+        self._mm.close()
+
+
+class _PackedRecord(Mapping):
+    __slots__ = ('_corpus', '_index', '_children')
+
+    # (key, column) pairs for the string fields, in source order.
+    _text_fields = ()
+    _child_key = None
+
+    def __init__(self, corpus, index):
+        self._corpus = corpus
+        self._index = index
+        self._children = None
+
+    def _column(self, column):
+        return self._row_table()[self._index * self._width + column]
+
+    def _present(self):
+        for key, column in self._text_fields:
+            if self._column(column + 1) != ABSENT:
+                yield key
+        yield self._child_key
+
+    def __getitem__(self, key):
+        if key == self._child_key:
+            if self._children is None:
+                self._children = self._make_children()
+            return self._children
+        for name, column in self._text_fields:
+            if name == key:
+                length = self._column(column + 1)
+                if length != ABSENT:
+                    return self._corpus.text(self._column(column), length)
+                break
+        raise KeyError(key)
+
+    def __iter__(self):
+        return self._present()
+
+    def __len__(self):
+        return sum(1 for _ in self._present())
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self._index})"
+
+
+class PackedAuthor(_PackedRecord):
+    __slots__ = ()
+    _text_fields = (('author', 0), ('contact', 2))
+    _child_key = 'books'
+    _width = AUTHOR_COLUMNS
+
+    def _row_table(self):
+        return self._corpus._authors
+
+    def _make_children(self):
+        first, count = self._column(4), self._column(5)
+        return [PackedBook(self._corpus, index, self) for index in range(first, first + count)]
+
+
+class PackedBook(_PackedRecord):
+    __slots__ = ('author',)
+    _text_fields = (('booktitle', 0), ('booktitle_tanglish', 2), ('description', 4), ('category', 6))
+    _child_key = 'context'
+    _width = BOOK_COLUMNS
+
+    def __init__(self, corpus, index, author):
+        super().__init__(corpus, index)
+        self.author = author
+
+    def _row_table(self):
+        return self._corpus._books
+
+    def _make_children(self):
+        first, count = self._column(8), self._column(9)
+        return [PackedPoem(self._corpus, index, self) for index in range(first, first + count)]
+
+
+class PackedPoem(_PackedRecord):
+    __slots__ = ('book',)
+    _text_fields = (('title', 0), ('line', 2), ('meaning', 4))
+    _width = POEM_COLUMNS
+
+    def __init__(self, corpus, index, book):
+        super().__init__(corpus, index)
+        self.book = book
+
+    def _row_table(self):
+        return self._corpus._poems
+
+    def _present(self):
+        for key, column in self._text_fields:
+            if self._column(column + 1) != ABSENT:
+                yield key
+
+    @property
+    def author(self):
+        return self.book.author
+
+
+def main(argv=None):
+    """Packs the kavisrc JSON files: ``python -m tamilkavi.packed OUTPUT [DATA_DIR]``."""
+    from argparse import ArgumentParser
+    from tamilkavi.tamilkavipy import KaviExtraction
+
+    parser = ArgumentParser(prog='python -m tamilkavi.packed', description="Write a memory-mapped corpus file from kavisrc JSON.")
+    parser.add_argument('output', help="Path of the packed corpus file to write")
+    parser.add_argument('data_dir', nargs='?', help="Directory of author JSON files (defaults to the packaged kavisrc)")
+    args = parser.parse_args(argv)
+
+    library = KaviExtraction(data_dir=args.data_dir)
+    write_packed(library.saved_books, args.output)
+    print(f"✅ Packed {len(library.saved_books)} authors into {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Limit/offset pagination with opaque resume cursors.
+
+Listings are paged by slicing the lists the library already keeps (index
+buckets, the manifest, the memoized title list), so fetching page N costs
+the size of page N, not of every page before it.
+
+A cursor is an opaque, URL-safe token recording where the next page starts
+and which query it belongs to; passing it back resumes the listing. A
+cursor from a different query is rejected with ValueError.
+"""
+import base64
+import hashlib
+import json
+from collections.abc import Sequence
+from itertools import islice
+
+
+class Page(list):
+    """One page of results: a list that also carries paging details.
+
+    ``offset`` is the position of the first item in the full result,
+    ``total`` its size (None when unknown) and ``next_cursor`` the token for
+    the following page (None on the last page).
+    """
+
+    def __init__(self, items=(), offset=0, total=None, next_cursor=None):
+        super().__init__(items)
+        self.offset = offset
+        self.total = total
+        self.next_cursor = next_cursor
+
+
+def _scope_key(scope):
+    return hashlib.sha1(scope.encode('utf-8')).hexdigest()[:12]
+
+
+def encode_cursor(scope, offset):
+    """Returns the cursor token resuming ``scope`` at ``offset``."""
+    token = json.dumps([_scope_key(scope), offset]).encode('ascii')
+    return base64.urlsafe_b64encode(token).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, scope):
+    """Returns the offset stored in a cursor issued for ``scope``."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        key, offset = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid cursor: {cursor!r}") from None
+    if type(offset) is not int or offset < 0:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    if key != _scope_key(scope):
+        raise ValueError("Cursor belongs to a different query.")
+    return offset
+
+
+def paginate(items, scope, limit=None, offset=0, cursor=None, transform=None):
+    """Returns one Page of items.
+
+    ``items`` is a sequence (sliced directly) or any iterable (read only up
+    to the end of the page). ``cursor``, when given, overrides ``offset``.
+    ``transform`` is applied to the items of the page only. Raises
+    ValueError for a negative offset, a limit below 1 or a foreign cursor.
+    """
+    if cursor is not None:
+        offset = decode_cursor(cursor, scope)
+    if offset < 0:
+        raise ValueError("Offset must not be negative.")
+    if limit is not None and limit <= 0:
+        # An empty page would hand back a cursor to the same offset, forever.
+        raise ValueError("Limit must be positive.")
+    stop = None if limit is None else offset + limit
+
+    if isinstance(items, Sequence):
+        total = len(items)
+        window = items[offset:stop]
+        has_more = stop is not None and stop < total
+    else:
+        total = None
+        window = list(islice(items, offset, None if stop is None else stop + 1))
+        has_more = limit is not None and len(window) > limit
+        window = window[:limit]
+
+    if transform is not None:
+        window = [transform(item) for item in window]
+    next_cursor = encode_cursor(scope, stop) if has_more else None
+    return Page(window, offset, total, next_cursor)
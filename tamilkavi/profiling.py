@@ -0,0 +1,175 @@
+"""Per-phase timing and memory instrumentation.
+
+A ``Profiler`` splits a run into the phases ``load`` (finding and decoding
+the corpus), ``index`` (building lookup, search and trigram indexes),
+``filter`` (queries) and ``render`` (writing results). For each phase it
+counts calls, wall time and the tracemalloc peak reached while the phase
+ran. Phases nest, e.g. a search that first builds its index, and each
+phase's time excludes the phases nested in it, so the times add up to the
+whole run.
+
+Host applications pass a profiler to ``KaviExtraction(profiler=...)`` and
+read ``profiler.counters()``, or give ``on_phase`` to receive every
+finished phase as it happens. The CLI enables one with ``--profile`` or
+``TAMILKAVI_PROFILE=1`` and prints the report to stderr;
+``--profile-dump FILE`` (``TAMILKAVI_PROFILE_DUMP``) also saves cProfile
+stats for ``python -m pstats``. A profiler tracks one thread of work.
+"""
+import sys
+import time
+from contextlib import contextmanager
+
+PHASES = ('load', 'index', 'filter', 'render')
+
+# $TAMILKAVI_PROFILE values that leave profiling off.
+_OFF_VALUES = ('', '0', 'false', 'no', 'off')
+
+# The profiler the CLI activated, used by code without a library at hand (rendering).
+_active = None
+
+
+class Profiler:
+    def __init__(self, trace_memory=True, dump_path=None, on_phase=None):
+        self.trace_memory = trace_memory
+        self.dump_path = dump_path
+        self.on_phase = on_phase
+        self._counters = {}
+        self._stack = []
+        self._cprofile = None
+        self._started_tracing = False
+        self._started = None
+
+    def start(self):
+        """Starts memory tracing (and cProfile when dump_path is set)."""
+        if self.trace_memory:
+            import tracemalloc
+
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+        if self.dump_path:
+            import cProfile
+
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        self._started = time.perf_counter()
+        return self
+
+    def stop(self):
+        """Stops tracing and writes the cProfile dump, if any."""
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            self._cprofile.dump_stats(self.dump_path)
+            self._cprofile = None
+        if self._started_tracing:
+            import tracemalloc
+
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    @contextmanager
+    def phase(self, name):
+        """Counts the enclosed block as one call of phase name."""
+        tracemalloc = _tracemalloc() if self.trace_memory else None
+        if tracemalloc is not None:
+            current, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                self._stack[-1]['peak'] = max(self._stack[-1]['peak'], peak)
+            _reset_peak(tracemalloc)
+            current = tracemalloc.get_traced_memory()[0]
+        else:
+            current = 0
+        frame = {'base': current, 'peak': current, 'children': 0.0}
+        self._stack.append(frame)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self._stack.pop()
+            if tracemalloc is not None:
+                frame['peak'] = max(frame['peak'], tracemalloc.get_traced_memory()[1])
+            if self._stack:
+                parent = self._stack[-1]
+                parent['children'] += elapsed
+                parent['peak'] = max(parent['peak'], frame['peak'])
+            self._record(name, elapsed - frame['children'], frame['peak'] - frame['base'])
+
+    def _record(self, name, seconds, peak_bytes):
+        counter = self._counters.get(name)
+        if counter is None:
+            counter = self._counters[name] = {'calls': 0, 'seconds': 0.0, 'peak_bytes': 0}
+        counter['calls'] += 1
+        counter['seconds'] += seconds
+        counter['peak_bytes'] = max(counter['peak_bytes'], peak_bytes)
+        if self.on_phase is not None:
+            self.on_phase(name, seconds, peak_bytes)
+
+    def counters(self):
+        """Returns ``{phase: {'calls', 'seconds', 'peak_bytes'}}`` for the phases seen so far."""
+        return {name: dict(counter) for name, counter in self._counters.items()}
+
+    def report(self, out=None):
+        """Prints a per-phase table (to stderr by default)."""
+        out = out if out is not None else sys.stderr
+        print("⏱️  Profile (wall time, peak traced memory):", file=out)
+        names = [name for name in PHASES if name in self._counters]
+        names += sorted(name for name in self._counters if name not in PHASES)
+        for name in names:
+            counter = self._counters[name]
+            memory = f"{counter['peak_bytes'] / 1024 / 1024:9.2f} MiB" if self.trace_memory else ''
+            calls = f"{counter['calls']} call" + ('' if counter['calls'] == 1 else 's')
+            print(f"   {name:<8}{counter['seconds'] * 1000:10.2f} ms{memory}  ({calls})", file=out)
+        if self._started is not None:
+            print(f"   {'total':<8}{(time.perf_counter() - self._started) * 1000:10.2f} ms", file=out)
+        if self.dump_path:
+            print(f"   cProfile stats written to {self.dump_path}", file=out)
+
+
+def _tracemalloc():
+    import tracemalloc
+
+    return tracemalloc if tracemalloc.is_tracing() else None
+
+
+def _reset_peak(tracemalloc):
+    # reset_peak needs Python 3.9+; before that peaks are measured from the start of tracing.
+    reset_peak = getattr(tracemalloc, 'reset_peak', None)
+    if reset_peak is not None:
+        reset_peak()
+
+
+@contextmanager
+def _no_phase():
+    yield
+
+
+def env_enabled(value):
+    """True when a $TAMILKAVI_PROFILE value turns profiling on (unset, 0, false, no and off do not)."""
+    return value is not None and value.strip().lower() not in _OFF_VALUES
+
+
+def activate(profiler):
+    """Makes profiler the one used by ``phase()``; pass None to deactivate."""
+    global _active
+    _active = profiler
+
+
+def phase(name):
+    """Times a block under the active profiler; does nothing when none is active."""
+    return _active.phase(name) if _active is not None else _no_phase()
+
+
+def profiled(name):
+    """Method decorator counting calls as phase name of ``self.profiler``."""
+    import functools
+
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if self.profiler is None:
+                return method(self, *args, **kwargs)
+            with self.profiler.phase(name):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorate
@@ -0,0 +1,70 @@
+"""Bounded LRU cache of query results.
+
+Long-running hosts (the query server, batch mode, async services) see the
+same author/book/title queries over and over. ``KaviExtraction.subset``
+keeps its results here, keyed by the normalized ``(author, book, title)``,
+so a repeated query is a dict lookup instead of a walk over the indexes.
+
+The cache holds at most ``maxsize`` results, dropping the least recently
+used first, and optionally forgets results older than ``ttl`` seconds.
+``clear()`` runs whenever the corpus is (re)loaded. All methods are safe to
+call from several threads; a result computed while the cache was cleared
+is returned but not stored, so a reload never leaves stale entries behind.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_SIZE = 256
+
+
+class QueryCache:
+    def __init__(self, maxsize=DEFAULT_SIZE, ttl=None, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.generation = 0
+        # key -> (expiry time or None, result), least recently used first
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        """Returns the cached result for key, or compute() stored under key."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, result = entry
+                if expires is None or expires > self.clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return result
+                del self._entries[key]
+            self.misses += 1
+            generation = self.generation
+
+        # Computed outside the lock so a slow query does not hold up cache hits.
+        result = compute()
+        with self._lock:
+            if generation == self.generation:
+                self._entries[key] = (self.clock() + self.ttl if self.ttl is not None else None, result)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return result
+
+    def clear(self):
+        """Drops every cached result (the hit and miss counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+
+    def stats(self):
+        """Returns ``{'hits', 'misses', 'size', 'maxsize', 'ttl'}``."""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries),
+                    'maxsize': self.maxsize, 'ttl': self.ttl}
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,189 @@
+"""Compact, slotted record model for the corpus.
+
+Keeping every poem as a plain dict costs a hash table per poem plus its
+own copy of every key string. ``Author``, ``Book`` and ``Poem`` store the
+same fields in ``__slots__``, intern the strings that repeat across the
+corpus (author names, categories, titles) and link each record to its
+parent. They also implement the read-only ``Mapping`` protocol, so code
+written against the list-of-dicts layout (``author.get('books', [])``,
+``'context' in book``, ``poem['title']``) keeps working unchanged.
+"""
+import sys
+from collections.abc import Mapping
+
+from tamilkavi import stream as corpus_stream
+
+# Fields whose values repeat across the corpus and are interned.
+_INTERNED = frozenset(('author', 'booktitle', 'booktitle_tanglish', 'category', 'title'))
+
+# Marks a field that is absent from the source JSON (as opposed to null).
+_MISSING = object()
+
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+def _given(value):
+    # Stream records use None for fields the source file did not have.
+    return _MISSING if value is None else value
+
+
+class _Record(Mapping):
+    __slots__ = ()
+
+    # Dict keys exposed through the Mapping protocol, in source order.
+    _fields = ()
+
+    def _present(self):
+        for key in self._fields:
+            if getattr(self, key) is not _MISSING:
+                yield key
+        if self.extra:
+            yield from self.extra
+
+    def __getitem__(self, key):
+        if key in self._fields:
+            value = getattr(self, key)
+            if value is not _MISSING:
+                return value
+        elif self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __iter__(self):
+        return self._present()
+
+    def __len__(self):
+        return sum(1 for _ in self._present())
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def to_dict(self):
+        """Returns a plain nested dict copy, as json.load would have produced."""
+        result = {}
+        for key in self._present():
+            value = self[key]
+            if isinstance(value, list):
+                value = [item.to_dict() if isinstance(item, _Record) else item for item in value]
+            result[key] = value
+        return result
+
+    def _set_fields(self, data):
+        extra = None
+        for key, value in data.items():
+            if key in self._fields:
+                setattr(self, key, value)
+            else:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+        self.extra = extra
+
+
+class Author(_Record):
+    __slots__ = ('author', 'contact', 'books', 'extra')
+    _fields = ('author', 'contact', 'books')
+
+    def __init__(self, author=_MISSING, contact=_MISSING, books=_MISSING, extra=None):
+        self.author = _intern(author)
+        self.contact = contact
+        self.books = books
+        self.extra = extra
+
+
+class Book(_Record):
+    __slots__ = ('booktitle', 'booktitle_tanglish', 'description', 'category', 'context', 'author', 'extra')
+    _fields = ('booktitle', 'booktitle_tanglish', 'description', 'category', 'context')
+
+    def __init__(self, booktitle=_MISSING, booktitle_tanglish=_MISSING, description=_MISSING,
+                 category=_MISSING, context=_MISSING, author=None, extra=None):
+        self.booktitle = _intern(booktitle)
+        self.booktitle_tanglish = _intern(booktitle_tanglish)
+        self.description = description
+        self.category = _intern(category)
+        self.context = context
+        # Back-reference to the owning Author record.
+        self.author = author
+        self.extra = extra
+
+
+class Poem(_Record):
+    __slots__ = ('title', 'line', 'meaning', 'book', 'extra')
+    _fields = ('title', 'line', 'meaning')
+
+    def __init__(self, title=_MISSING, line=_MISSING, meaning=_MISSING, book=None, extra=None):
+        self.title = _intern(title)
+        self.line = line
+        self.meaning = meaning
+        # Back-reference to the owning Book record; the author is reached through it.
+        self.book = book
+        self.extra = extra
+
+    @property
+    def author(self):
+        """The Author record this poem belongs to."""
+        return self.book.author if self.book is not None else None
+
+
+def from_dict(data):
+    """Converts one author dict (as loaded from JSON) into an Author record."""
+    author = Author()
+    author._set_fields({key: value for key, value in data.items() if key != 'books'})
+    author.author = _intern(author.author)
+    if 'books' in data:
+        author.books = [_book_from_dict(book, author) for book in data['books']]
+    return author
+
+
+def _book_from_dict(data, author):
+    book = Book(author=author)
+    book._set_fields({key: value for key, value in data.items() if key != 'context'})
+    book.booktitle = _intern(book.booktitle)
+    book.booktitle_tanglish = _intern(book.booktitle_tanglish)
+    book.category = _intern(book.category)
+    if 'context' in data:
+        book.context = []
+        for context in data['context']:
+            poem = Poem(book=book)
+            poem._set_fields(context)
+            poem.title = _intern(poem.title)
+            book.context.append(poem)
+    return book
+
+
+def from_stream(records):
+    """Builds Author records from a tamilkavi.stream record iterator.
+
+    No intermediate dict tree is created, so peak memory while loading is
+    the size of the records themselves. Authors and books are filled in
+    once the stream is exhausted, since their keys may follow their poems.
+    """
+    authors = []
+    # (stream record, Author or Book record) pairs, copied over at the end.
+    parents = []
+    author = book = None
+    for record in records:
+        if isinstance(record, corpus_stream.Author):
+            author = Author(books=[])
+            authors.append(author)
+            parents.append((record, author))
+        elif isinstance(record, corpus_stream.Book):
+            book = Book(context=[], author=author)
+            author.books.append(book)
+            parents.append((record, book))
+        else:
+            poem = Poem(book=book)
+            _copy_stream_fields(record, poem)
+            book.context.append(poem)
+    for record, target in parents:
+        _copy_stream_fields(record, target)
+    return authors
+
+
+def _copy_stream_fields(record, target):
+    for key, attribute in record._keys.items():
+        value = _given(getattr(record, attribute))
+        setattr(target, key, _intern(value) if key in _INTERNED else value)
+    target.extra = record.extra
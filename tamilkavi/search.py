@@ -0,0 +1,170 @@
+"""Full-text search over poem titles, lines and meanings.
+
+``SearchIndex`` is an inverted index with BM25 ranking. It is built once
+from the loaded corpus and stored in the compiled corpus cache, so queries
+only touch the postings of the query terms instead of rescanning text. A
+reload patches it for the changed authors only (see ``patched``).
+"""
+import math
+from array import array
+
+from tamilkavi.text import tokenize
+
+# Fields of a context entry that are indexed.
+SEARCH_FIELDS = ('title', 'line', 'meaning')
+
+# Standard BM25 parameters.
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+
+class SearchIndex:
+    def __init__(self):
+        # token -> (array of doc ids, array of term frequencies)
+        self.postings = {}
+        # Per document: its length in tokens and its (author, book, context)
+        # path, the author being the author dict itself, so a reload can swap
+        # out one author's documents without touching the others. Documents
+        # of removed authors stay as None paths until the index is rebuilt.
+        # books is the author list the index was built for; keeping it here
+        # lets a reload swap in a new index without positions ever being
+        # resolved against another corpus.
+        self.doc_lengths = array('I')
+        self.doc_paths = []
+        self.books = []
+        self.live_docs = 0
+        self.total_length = 0
+        self.average_length = 0.0
+        self._ranks = None
+
+    def __getstate__(self):
+        return dict(self.__dict__, _ranks=None)
+
+    @classmethod
+    def build(cls, saved_books):
+        """Indexes every context entry of a list of author dicts."""
+        index = cls()
+        index.books = saved_books
+        for author in saved_books:
+            index._add_author(author)
+        index.finish()
+        return index
+
+    def patched(self, saved_books, removed, added):
+        """Returns the index of saved_books, where the authors in removed were replaced by those in added.
+
+        Only the postings of the removed and added authors' tokens are
+        copied and changed; this index is left as it was for searches still
+        running on it. Once removed documents outnumber the others the index
+        is built again instead.
+        """
+        index = SearchIndex()
+        index.books = saved_books
+        index.postings = dict(self.postings)
+        index.doc_lengths = array('I', self.doc_lengths)
+        index.doc_paths = list(self.doc_paths)
+        index.live_docs = self.live_docs
+        index.total_length = self.total_length
+
+        removed_ids = {id(author) for author in removed}
+        dead = set()
+        for doc_id, path in enumerate(index.doc_paths):
+            if path is not None and id(path[0]) in removed_ids:
+                dead.add(doc_id)
+                index.doc_paths[doc_id] = None
+                index.live_docs -= 1
+                index.total_length -= index.doc_lengths[doc_id]
+        if len(index.doc_paths) - index.live_docs > index.live_docs:
+            return SearchIndex.build(saved_books)
+
+        copied = set()
+        for token in {token for author in removed for context in _contexts(author) for token in _tokens(context)}:
+            posting = index.postings.get(token)
+            if posting is None:
+                continue
+            kept = [(doc_id, frequency) for doc_id, frequency in zip(*posting) if doc_id not in dead]
+            if kept:
+                index.postings[token] = (array('I', [doc_id for doc_id, _ in kept]), array('I', [frequency for _, frequency in kept]))
+                copied.add(token)
+            else:
+                del index.postings[token]
+        for author in added:
+            index._add_author(author, copied)
+        index.finish()
+        return index
+
+    def _add_author(self, author, copied=None):
+        for book_pos, book in enumerate(author.get('books', [])):
+            for context_pos, context in enumerate(book.get('context', [])):
+                self.add(context, (author, book_pos, context_pos), copied)
+
+    def add(self, context, path, copied=None):
+        """Adds one context entry as a document.
+
+        copied, when given, is the set of tokens whose postings this index
+        already owns; others are shared with the index it was patched from
+        and are copied before they change.
+        """
+        doc_id = len(self.doc_paths)
+        counts = {}
+        for token in _tokens(context):
+            counts[token] = counts.get(token, 0) + 1
+
+        for token, count in counts.items():
+            posting = self.postings.get(token)
+            if posting is None:
+                posting = self.postings[token] = (array('I'), array('I'))
+                if copied is not None:
+                    copied.add(token)
+            elif copied is not None and token not in copied:
+                posting = self.postings[token] = (array('I', posting[0]), array('I', posting[1]))
+                copied.add(token)
+            posting[0].append(doc_id)
+            posting[1].append(count)
+        length = sum(counts.values())
+        self.doc_lengths.append(length)
+        self.doc_paths.append(path)
+        self.live_docs += 1
+        self.total_length += length
+
+    def finish(self):
+        """Computes collection statistics once all documents are added."""
+        self.average_length = self.total_length / self.live_docs if self.live_docs else 0.0
+        self._ranks = None
+
+    def search(self, query):
+        """Returns ``(doc_id, score)`` pairs for a query, best first."""
+        total_docs = self.live_docs
+        if not total_docs:
+            return []
+
+        scores = {}
+        for token in set(tokenize(query)):
+            posting = self.postings.get(token)
+            if posting is None:
+                continue
+            doc_ids, frequencies = posting
+            idf = math.log(1 + (total_docs - len(doc_ids) + 0.5) / (len(doc_ids) + 0.5))
+            for doc_id, frequency in zip(doc_ids, frequencies):
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_lengths[doc_id] / (self.average_length or 1))
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * frequency * (BM25_K1 + 1) / (frequency + norm)
+
+        # Ties keep corpus order so results are stable between runs.
+        return sorted(scores.items(), key=lambda item: (-item[1], self._rank(item[0])))
+
+    def _rank(self, doc_id):
+        ranks = self._ranks
+        if ranks is None:
+            ranks = self._ranks = {id(author): pos for pos, author in enumerate(self.books)}
+        author, book_pos, context_pos = self.doc_paths[doc_id]
+        return ranks[id(author)], book_pos, context_pos
+
+
+def _contexts(author):
+    for book in author.get('books', []):
+        yield from book.get('context', [])
+
+
+def _tokens(context):
+    for field in SEARCH_FIELDS:
+        yield from tokenize(context.get(field))
@@ -0,0 +1,187 @@
+"""Local query server that keeps the corpus loaded between CLI calls.
+
+``tamilkavi serve`` loads the corpus (and its search index) once and answers
+JSON queries over HTTP on localhost, one thread per connection::
+
+    GET /health                             {"status": "ok", "authors": N, "query_cache": {...}}
+    GET /query?author=&book=&title=         {"authors": [...]}  (pruned corpus)
+    GET /listing                            {"authors": [...], "books": [...], "titles": [...]}
+    GET /search?q=&author=&book=            {"results": [...]}
+
+The CLI forwards -a/-b/-t and --search to a server named by ``--server`` or
+``$TAMILKAVI_SERVER`` (e.g. ``http://127.0.0.1:8765``). ``/query`` returns
+only the authors, books and poems the query can show, which the client
+wraps with ``KaviExtraction.from_data`` and displays exactly as a local
+query would. When the server cannot be reached the CLI loads locally.
+
+With ``--db`` (or ``$TAMILKAVI_DB``) the server answers from a corpus
+database written by ``tamilkavi import-db`` instead of the JSON files. With
+``--watch`` it picks up edited, added and deleted author files while it
+runs (see ``tamilkavi.watch``).
+"""
+import json
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.error import URLError
+from urllib.parse import parse_qs, urlencode, urlsplit
+from urllib.request import urlopen
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# Seconds the client waits for a server before loading the corpus itself.
+CLIENT_TIMEOUT = 5.0
+
+# Seconds between checks for changed files with --watch.
+DEFAULT_WATCH_INTERVAL = 2.0
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = 'tamilkavi'
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        backend = self.server.backend
+        try:
+            if url.path == '/health':
+                body = {'status': 'ok', 'authors': len(self.server.listing['authors'])}
+                body.update(backend.stats())
+            elif url.path == '/query':
+                body = {'authors': backend.subset(params.get('author'), params.get('book'), params.get('title'))}
+            elif url.path == '/listing':
+                body = self.server.listing
+            elif url.path == '/search':
+                if 'q' not in params:
+                    return self._send(400, {'error': "Missing 'q' parameter."})
+                body = {'results': backend.search(params['q'], author=params.get('author'), book=params.get('book'))}
+            else:
+                return self._send(404, {'error': f"Unknown path: {url.path}"})
+        except Exception as e:
+            return self._send(500, {'error': str(e)})
+        self._send(200, body)
+
+    def _send(self, status, body):
+        encoded = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(encoded)))
+        self.end_headers()
+        self.wfile.write(encoded)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def make_server(backend, host=DEFAULT_HOST, port=DEFAULT_PORT, verbose=False):
+    """Returns a ThreadingHTTPServer answering queries against a tamilkavi.storage.Backend.
+
+    The search index and list-all views are built up front so request
+    threads only ever read the backend.
+    """
+    backend.prepare()
+    listing = backend.listing()
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    server.backend = backend
+    server.listing = listing
+    server.verbose = verbose
+    return server
+
+
+def _request(server_url, path, params=None):
+    query = urlencode({key: value for key, value in (params or {}).items() if value is not None})
+    url = server_url.rstrip('/') + path + (f'?{query}' if query else '')
+    try:
+        with urlopen(url, timeout=CLIENT_TIMEOUT) as response:
+            return json.loads(response.read().decode('utf-8'))
+    except (URLError, OSError, ValueError):
+        return None
+
+
+def remote_library(server_url, author=None, book=None, title=None, listing=False):
+    """Fetches the part of the corpus a query needs from a running server.
+
+    Returns a KaviExtraction over that part, or None when no server answers.
+    With listing=True the list-all views are fetched instead.
+    """
+    from tamilkavi.tamilkavipy import KaviExtraction
+
+    if listing:
+        body = _request(server_url, '/listing')
+        return KaviExtraction.from_data([], listing=body) if body is not None else None
+    body = _request(server_url, '/query', {'author': author, 'book': book, 'title': title})
+    return KaviExtraction.from_data(body['authors']) if body is not None else None
+
+
+def remote_search(server_url, query, author=None, book=None):
+    """Runs a search on a running server; returns None when no server answers."""
+    body = _request(server_url, '/search', {'q': query, 'author': author, 'book': book})
+    return body['results'] if body is not None else None
+
+
+def main(argv=None):
+    """Runs the server: ``tamilkavi serve [--host HOST] [--port PORT] [--data-dir DIR | --db PATH]``."""
+    import os
+    from argparse import ArgumentParser
+    from tamilkavi.storage import JsonBackend
+
+    parser = ArgumentParser(prog='tamilkavi serve', description="Serve Tamil Kavi queries from a corpus kept in memory.")
+    parser.add_argument('--host', default=DEFAULT_HOST, help=f"Address to listen on (default: {DEFAULT_HOST})")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f"Port to listen on (default: {DEFAULT_PORT})")
+    parser.add_argument('--data-dir', dest="data_dir", help="Directory of author JSON files (defaults to the packaged kavisrc)")
+    parser.add_argument('--db', dest="db", metavar="PATH", default=os.environ.get('TAMILKAVI_DB'), help="Serve a SQLite file written by 'tamilkavi import-db' (default: $TAMILKAVI_DB)")
+    parser.add_argument('--verbose', action='store_true', help="Log every request")
+    parser.add_argument('--cache-size', dest="cache_size", type=int, help="Query results kept in the LRU cache (default: 256, 0 disables it)")
+    parser.add_argument('--cache-ttl', dest="cache_ttl", type=float, metavar='SECONDS', help="Forget cached query results after SECONDS")
+    parser.add_argument('--watch', nargs='?', type=float, const=DEFAULT_WATCH_INTERVAL, metavar='SECONDS',
+                        help=f"Reload changed author files while serving, checking every SECONDS (default: {DEFAULT_WATCH_INTERVAL:g})")
+    args = parser.parse_args(argv)
+
+    if args.db:
+        from tamilkavi.sqlite import SqliteBackend
+
+        if args.watch is not None:
+            sys.exit("Exiting: --watch reloads the JSON files and cannot be used with --db.")
+        try:
+            backend = SqliteBackend(args.db)
+        except ValueError as e:
+            print(f"⚠️  Could not open corpus database: {e}")
+            sys.exit("Exiting: Cannot open the corpus database.")
+    else:
+        backend = JsonBackend(data_dir=args.data_dir, query_cache_size=args.cache_size, query_cache_ttl=args.cache_ttl)
+    try:
+        server = make_server(backend, args.host, args.port, args.verbose)
+    except OSError as e:
+        print(f"⚠️  Could not listen on {args.host}:{args.port}: {e}")
+        sys.exit("Exiting: Server could not start.")
+
+    watcher = None
+    if args.watch is not None:
+        watcher = watch_library(server, args.watch)
+
+    print(f"✅ Serving {len(server.listing['authors'])} authors on http://{args.host}:{server.server_address[1]} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Server stopped.")
+    finally:
+        if watcher is not None:
+            watcher.stop()
+        server.server_close()
+        backend.close()
+
+
+def watch_library(server, interval=DEFAULT_WATCH_INTERVAL):
+    """Starts a Watcher that reloads the library of the server's JsonBackend and refreshes its listing."""
+    from tamilkavi.watch import Watcher
+
+    def refresh(changes):
+        server.listing = server.backend.listing()
+        count = sum(len(changes[kind]) for kind in ('added', 'modified', 'removed'))
+        print(f"🔄 Reloaded {count} changed file(s)" if not changes['full'] else "🔄 Reloaded the corpus")
+
+    watcher = Watcher(server.backend.load(), interval, on_reload=refresh)
+    watcher.start()
+    return watcher
@@ -0,0 +1,319 @@
+"""SQLite storage backend: the whole corpus in one indexed file.
+
+``tamilkavi import-db OUTPUT [--data-dir DIR]`` converts the kavisrc JSON
+into a database with one table per level, each row pointing to its parent::
+
+    authors  id, author, contact, author_key, extra
+    books    id, author_id, booktitle, booktitle_tanglish, description,
+             category, booktitle_key, tanglish_key, extra
+    poems    id, book_id, title, line, meaning, title_key, extra
+
+``*_key`` columns hold the normalized names the filters compare (NFC +
+casefold, which SQLite's own ``lower()`` cannot do for Tamil) and are
+indexed; ``extra`` keeps any other JSON keys as a JSON object. Rows are
+inserted in corpus order, so ordering by id reproduces it. ``poems_fts``
+is a contentless FTS5 table over the title, line and meaning, ranked with
+FTS5's bm25(). Fields are stored as the space-joined tokens of
+``tamilkavi.text.tokenize`` (FTS5's unicode61 tokenizer would cut Tamil
+words at every vowel sign), so both backends match the same words.
+
+``SqliteBackend`` answers queries from such a file (see tamilkavi.storage);
+the CLI uses it with ``--db PATH`` or ``$TAMILKAVI_DB``. Only the rows a
+query needs are read, so start-up does not grow with the corpus.
+"""
+import json
+import os
+import sqlite3
+import sys
+import threading
+from functools import partial
+from pathlib import Path
+
+from tamilkavi.storage import Backend
+from tamilkavi.text import normalize_key, tokenize
+
+AUTHOR_FIELDS = ('author', 'contact')
+BOOK_FIELDS = ('booktitle', 'booktitle_tanglish', 'description', 'category')
+POEM_FIELDS = ('title', 'line', 'meaning')
+
+SCHEMA = """
+CREATE TABLE authors (
+    id INTEGER PRIMARY KEY,
+    author TEXT,
+    contact TEXT,
+    author_key TEXT,
+    extra TEXT
+);
+CREATE TABLE books (
+    id INTEGER PRIMARY KEY,
+    author_id INTEGER NOT NULL REFERENCES authors(id),
+    booktitle TEXT,
+    booktitle_tanglish TEXT,
+    description TEXT,
+    category TEXT,
+    booktitle_key TEXT,
+    tanglish_key TEXT,
+    extra TEXT
+);
+CREATE TABLE poems (
+    id INTEGER PRIMARY KEY,
+    book_id INTEGER NOT NULL REFERENCES books(id),
+    title TEXT,
+    line TEXT,
+    meaning TEXT,
+    title_key TEXT,
+    extra TEXT
+);
+CREATE INDEX authors_author_key ON authors(author_key);
+CREATE INDEX books_author_id ON books(author_id);
+CREATE INDEX books_booktitle_key ON books(booktitle_key);
+CREATE INDEX books_tanglish_key ON books(tanglish_key);
+CREATE INDEX poems_book_id ON poems(book_id);
+CREATE INDEX poems_title_key ON poems(title_key);
+CREATE VIRTUAL TABLE poems_fts USING fts5(title, line, meaning, content='', tokenize="ascii tokenchars '_'");
+"""
+
+
+def _key(value):
+    return normalize_key(value) if isinstance(value, str) else None
+
+
+def _fts_text(value):
+    # The ascii tokenizer keeps every non-ASCII character inside a token, so only these spaces split.
+    return ' '.join(tokenize(value))
+
+
+def _columns(record, fields, child_key):
+    """Splits a record into its string column values and an ``extra`` JSON text."""
+    values = tuple(record.get(field) if isinstance(record.get(field), str) else None for field in fields)
+    extra = {key: value for key, value in record.items()
+             if key != child_key and (key not in fields or not isinstance(value, str))}
+    return values + (json.dumps(extra, ensure_ascii=False) if extra else None,)
+
+
+def _record(row, fields):
+    """Rebuilds the dict of a row written by ``_columns``."""
+    record = {field: row[field] for field in fields if row[field] is not None}
+    if row['extra']:
+        record.update(json.loads(row['extra']))
+    return record
+
+
+def write_database(saved_books, path):
+    """Writes a list of author dicts (or records) as a SQLite corpus file.
+
+    The file is built under a temporary name and moved into place, so
+    readers of an existing database never see a half-written one.
+    """
+    path = Path(path)
+    temp_path = path.with_name(path.name + '.tmp')
+    if temp_path.exists():
+        temp_path.unlink()
+
+    connection = sqlite3.connect(str(temp_path))
+    try:
+        with connection:
+            connection.executescript(SCHEMA)
+            for author in saved_books:
+                author_id = connection.execute(
+                    'INSERT INTO authors (author, contact, extra, author_key) VALUES (?, ?, ?, ?)',
+                    _columns(author, AUTHOR_FIELDS, 'books') + (_key(author.get('author')),)).lastrowid
+                for book in author.get('books', []):
+                    book_id = connection.execute(
+                        'INSERT INTO books (author_id, booktitle, booktitle_tanglish, description, category, extra, '
+                        'booktitle_key, tanglish_key) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                        (author_id,) + _columns(book, BOOK_FIELDS, 'context')
+                        + (_key(book.get('booktitle')), _key(book.get('booktitle_tanglish')))).lastrowid
+                    for context in book.get('context', []):
+                        poem_id = connection.execute(
+                            'INSERT INTO poems (book_id, title, line, meaning, extra, title_key) VALUES (?, ?, ?, ?, ?, ?)',
+                            (book_id,) + _columns(context, POEM_FIELDS, None) + (_key(context.get('title')),)).lastrowid
+                        connection.execute('INSERT INTO poems_fts (rowid, title, line, meaning) VALUES (?, ?, ?, ?)',
+                                           (poem_id,) + tuple(_fts_text(context.get(field)) for field in POEM_FIELDS))
+            connection.execute('ANALYZE')
+    finally:
+        connection.close()
+    os.replace(str(temp_path), str(path))
+
+
+class SqliteBackend(Backend):
+    def __init__(self, path):
+        """Opens a corpus database read-only; raises ValueError if path is not one."""
+        self.path = Path(path)
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        self._trigram_index = None
+        if not self.path.is_file():
+            raise ValueError(f"{path} does not exist.")
+        try:
+            tables = {row['name'] for row in self._connection().execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        except sqlite3.Error as e:
+            self.close()
+            raise ValueError(f"{path} is not a tamilkavi corpus database: {e}") from None
+        if not {'authors', 'books', 'poems', 'poems_fts'} <= tables:
+            self.close()
+            raise ValueError(f"{path} is not a tamilkavi corpus database.")
+
+    def _connection(self):
+        # sqlite3 connections belong to one thread; each thread (e.g. a server worker) opens its own.
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path.resolve().as_uri() + '?mode=ro', uri=True, check_same_thread=False)
+            connection.row_factory = sqlite3.Row
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    def opener(self):
+        return partial(SqliteBackend, self.path)
+
+    def close(self):
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.close()
+        self._local = threading.local()
+
+    def subset(self, author=None, book=None, title=None):
+        """Returns the pruned corpus for a query, like ``KaviExtraction.subset``."""
+        conditions, params = [], []
+        if author is not None:
+            conditions.append('a.author_key = ?')
+            params.append(normalize_key(author))
+        if book is not None:
+            conditions.append('(b.booktitle_key = ? OR b.tanglish_key = ?)')
+            params.extend([normalize_key(book)] * 2)
+        if title is not None:
+            conditions.append('p.title_key = ?')
+            params.append(normalize_key(title))
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ''
+
+        # The deepest filtered level decides which rows are kept; levels below it are kept whole.
+        if title is not None:
+            matches = f'FROM poems p JOIN books b ON b.id = p.book_id JOIN authors a ON a.id = b.author_id{where}'
+            author_ids, book_ids = f'SELECT b.author_id {matches}', f'SELECT p.book_id {matches}'
+            poems_query = f'SELECT p.* {matches}'
+        elif book is not None:
+            matches = f'FROM books b JOIN authors a ON a.id = b.author_id{where}'
+            author_ids, book_ids = f'SELECT b.author_id {matches}', f'SELECT b.id {matches}'
+            poems_query = f'SELECT * FROM poems p WHERE book_id IN ({book_ids})'
+        else:
+            matches = f'FROM authors a{where}'
+            author_ids = f'SELECT a.id {matches}'
+            book_ids = f'SELECT id FROM books WHERE author_id IN ({author_ids})'
+            poems_query = f'SELECT * FROM poems p WHERE book_id IN ({book_ids})'
+
+        connection = self._connection()
+        authors, books = {}, {}
+        for row in connection.execute(f'SELECT * FROM authors WHERE id IN ({author_ids}) ORDER BY id', params):
+            authors[row['id']] = dict(_record(row, AUTHOR_FIELDS), books=[])
+        for row in connection.execute(f'SELECT * FROM books WHERE id IN ({book_ids}) ORDER BY id', params):
+            books[row['id']] = dict(_record(row, BOOK_FIELDS), context=[])
+            authors[row['author_id']]['books'].append(books[row['id']])
+        for row in connection.execute(f'{poems_query} ORDER BY p.id', params):
+            books[row['book_id']]['context'].append(_record(row, POEM_FIELDS))
+        return list(authors.values())
+
+    def listing(self):
+        """Returns the list-all views, like ``KaviExtraction.listing``."""
+        connection = self._connection()
+        authors = [_record(row, AUTHOR_FIELDS) for row in connection.execute('SELECT * FROM authors ORDER BY id')]
+        books = [_record(row, BOOK_FIELDS) for row in connection.execute('SELECT * FROM books ORDER BY id')]
+        titles = {row['title'] for row in connection.execute("SELECT DISTINCT title FROM poems WHERE title != ''")}
+        return {
+            'authors': [{'author': author.get('author', 'Unknown')} for author in authors],
+            'books': [{'booktitle': book.get('booktitle', 'N/A'), 'booktitle_tanglish': book.get('booktitle_tanglish', 'N/A'),
+                       'category': book.get('category', 'N/A')} for book in books],
+            'titles': sorted(titles),
+        }
+
+    def search(self, query, author=None, book=None):
+        """Ranked full-text search, with results shaped like ``KaviExtraction.search``.
+
+        Poems match any query token; scores are FTS5's bm25(), so they
+        differ in scale from the in-memory index.
+        """
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return []
+        conditions = ['poems_fts MATCH ?']
+        params = [' OR '.join('"{}"'.format(token.replace('"', '""')) for token in tokens)]
+        if author is not None:
+            conditions.append('a.author_key = ?')
+            params.append(normalize_key(author))
+        if book is not None:
+            conditions.append('(b.booktitle_key = ? OR b.tanglish_key = ?)')
+            params.extend([normalize_key(book)] * 2)
+
+        rows = self._connection().execute(
+            'SELECT p.*, bm25(poems_fts) AS rank, a.author AS a_author, a.contact AS a_contact, a.extra AS a_extra, '
+            'b.booktitle AS b_booktitle, b.booktitle_tanglish AS b_booktitle_tanglish, b.extra AS b_extra '
+            'FROM poems_fts JOIN poems p ON p.id = poems_fts.rowid JOIN books b ON b.id = p.book_id '
+            f"JOIN authors a ON a.id = b.author_id WHERE {' AND '.join(conditions)} ORDER BY rank, p.id", params)
+        results = []
+        for row in rows:
+            author_data = _prefixed_record(row, 'a_', AUTHOR_FIELDS)
+            book_data = _prefixed_record(row, 'b_', ('booktitle', 'booktitle_tanglish'))
+            result = _record(row, POEM_FIELDS)
+            result['author'] = author_data.get('author', 'Unknown')
+            result['booktitle'] = book_data.get('booktitle', 'N/A')
+            result['booktitle_tanglish'] = book_data.get('booktitle_tanglish', 'N/A')
+            result['score'] = round(-row['rank'], 4)
+            results.append(result)
+        return results
+
+    def suggest(self, text, kind=None, limit=5):
+        """Returns "did you mean" titles, like ``KaviExtraction.suggest``."""
+        if self._trigram_index is None:
+            self._trigram_index = self._build_trigram_index()
+        return self._trigram_index.suggest(text, kind=kind, limit=limit)
+
+    def _build_trigram_index(self):
+        from tamilkavi.fuzzy import TrigramIndex
+
+        connection = self._connection()
+        poem_titles = {}
+        for row in connection.execute('SELECT book_id, title, extra FROM poems ORDER BY id'):
+            poem_titles.setdefault(row['book_id'], []).append(_prefixed_record(row, '', ('title',)).get('title'))
+        index = TrigramIndex()
+        # Same order as TrigramIndex.build, so titles spelled several ways keep the same label.
+        for row in connection.execute('SELECT id, booktitle, booktitle_tanglish, extra FROM books ORDER BY id'):
+            book = _prefixed_record(row, '', ('booktitle', 'booktitle_tanglish'))
+            for field in ('booktitle_tanglish', 'booktitle'):
+                index.add(book.get(field), 'book')
+            for title in poem_titles.get(row['id'], []):
+                index.add(title, 'title')
+        return index
+
+
+def _prefixed_record(row, prefix, fields):
+    record = {field: row[prefix + field] for field in fields if row[prefix + field] is not None}
+    if row[prefix + 'extra']:
+        extra = json.loads(row[prefix + 'extra'])
+        record.update((key, value) for key, value in extra.items() if key in fields)
+    return record
+
+
+def main(argv=None):
+    """Converts the kavisrc JSON: ``tamilkavi import-db OUTPUT [--data-dir DIR]``."""
+    from argparse import ArgumentParser
+    from tamilkavi.tamilkavipy import KaviExtraction
+
+    parser = ArgumentParser(prog='tamilkavi import-db', description="Write a SQLite corpus database from kavisrc JSON.")
+    parser.add_argument('output', help="Path of the SQLite database to write")
+    parser.add_argument('--data-dir', dest="data_dir", help="Directory of author JSON files (defaults to the packaged kavisrc)")
+    args = parser.parse_args(argv)
+
+    library = KaviExtraction(data_dir=args.data_dir)
+    try:
+        write_database(library.saved_books, args.output)
+    except (OSError, sqlite3.Error) as e:
+        print(f"⚠️  Could not write {args.output}: {e}")
+        sys.exit("Exiting: Database could not be written.")
+    print(f"✅ Imported {len(library.saved_books)} authors into {args.output}")
+
+
+if __name__ == "__main__":
+    main()
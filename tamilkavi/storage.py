@@ -0,0 +1,121 @@
+"""Storage backends behind the CLI's queries.
+
+A backend answers the questions the CLI, ``--batch`` and ``tamilkavi
+serve`` ask of a corpus, each with plain data, so the same filters and
+display code run whatever holds the poems:
+
+    subset(author, book, title)    pruned author dicts (see KaviExtraction.subset)
+    listing()                      the list-all views (see KaviExtraction.listing)
+    search(query, author, book)    ranked poems (see KaviExtraction.search)
+    suggest(text, kind, limit)     "did you mean" titles (see KaviExtraction.suggest)
+
+``JsonBackend`` answers them from the kavisrc JSON files through a
+``KaviExtraction``; ``tamilkavi.sqlite.SqliteBackend`` answers them from one
+indexed SQLite file. ``Backend.library`` wraps an answer in a
+KaviExtraction for display.
+"""
+from abc import ABC, abstractmethod
+from functools import partial
+
+
+class Backend(ABC):
+    @abstractmethod
+    def subset(self, author=None, book=None, title=None):
+        """Returns the authors, books and poems matching every given filter."""
+
+    @abstractmethod
+    def listing(self):
+        """Returns ``{'authors', 'books', 'titles'}`` list-all views."""
+
+    @abstractmethod
+    def search(self, query, author=None, book=None):
+        """Returns poems ranked by relevance to query, each with its author and book."""
+
+    @abstractmethod
+    def suggest(self, text, kind=None, limit=5):
+        """Returns ranked ``(title, score)`` "did you mean" pairs."""
+
+    def prepare(self):
+        """Builds up front what queries from several threads would otherwise build on first use."""
+
+    def opener(self):
+        """Returns a picklable callable that opens this corpus again, e.g. in a worker process.
+
+        None (the default) means the backend cannot be reopened elsewhere.
+        """
+        return None
+
+    def stats(self):
+        """Returns extra figures for the server's /health (none by default)."""
+        return {}
+
+    def close(self):
+        """Releases files or connections held by the backend."""
+
+    def library(self, author=None, book=None, title=None, listing=False):
+        """Returns a KaviExtraction over what a query needs.
+
+        That is the pruned corpus for author/book/title filters, or only the
+        list-all views with listing=True.
+        """
+        from tamilkavi.tamilkavipy import KaviExtraction
+
+        if listing:
+            return KaviExtraction.from_data([], listing=self.listing())
+        return KaviExtraction.from_data(self.subset(author, book, title))
+
+
+class JsonBackend(Backend):
+    def __init__(self, library=None, **options):
+        """Wraps a loaded KaviExtraction, or loads one with these keyword arguments on first use."""
+        self._library = library
+        # A library handed in may not have come from options, so it cannot be reopened from them.
+        self._reopenable = library is None
+        self.options = options
+
+    def load(self):
+        """Returns the fully loaded KaviExtraction, loading it if needed."""
+        if self._library is None:
+            from tamilkavi.tamilkavipy import KaviExtraction
+
+            self._library = KaviExtraction(**self.options)
+        return self._library
+
+    def subset(self, author=None, book=None, title=None):
+        return self.load().subset(author, book, title)
+
+    def listing(self):
+        return self.load().listing()
+
+    def search(self, query, author=None, book=None):
+        return self.load().search(query, author=author, book=book)
+
+    def suggest(self, text, kind=None, limit=5):
+        return self.load().suggest(text, kind=kind, limit=limit)
+
+    def prepare(self):
+        self.load().get_search_index()
+
+    def opener(self):
+        """Loads the library here first, so workers opening it read the compiled cache rather than the JSON files."""
+        if not self._reopenable:
+            return None
+        self.load()
+        # Profiling stays in this process, and the cache has just been rebuilt if asked.
+        options = {key: value for key, value in self.options.items() if key not in ('profiler', 'rebuild_cache')}
+        return partial(JsonBackend, **options)
+
+    def stats(self):
+        query_cache = self.load().query_cache
+        return {'query_cache': query_cache.stats()} if query_cache is not None else {}
+
+    def library(self, author=None, book=None, title=None, listing=False):
+        """Returns the loaded library, or one that reads only the manifest and the files the query needs."""
+        if self._library is not None:
+            return self._library
+        from tamilkavi.tamilkavipy import KaviExtraction
+
+        library = KaviExtraction(**dict(self.options, lazy=True))
+        if not listing:
+            library.load_for_query(author=author, book=book, title=title)
+        return library
@@ -0,0 +1,273 @@
+"""Streaming, bounded-memory reader for kavisrc author files.
+
+``json.load`` materialises a whole author file before anything can be
+looked at, so peak memory grows with the size of the anthology. The reader
+here walks the ``author -> books -> context`` layout incrementally, using
+only the stdlib ``json`` decoder on one small value at a time, and yields
+``Author``, ``Book`` and ``Context`` records as it goes. Scanning a file
+this way needs memory for one poem, not the whole parse tree.
+
+Records are yielded in document order: an ``Author`` when its ``books``
+array starts, a ``Book`` when its ``context`` array starts, then one
+``Context`` per poem. JSON key order carries no meaning, so keys that come
+after the nested array are filled into the same ``Author`` or ``Book``
+once its object closes, at which point ``complete`` turns true. Keys
+without an attribute of their own are kept in ``extra``.
+"""
+import json
+from collections import deque
+
+from tamilkavi.text import normalize_key
+
+# Characters read from the file per refill.
+CHUNK_SIZE = 64 * 1024
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = ' \t\n\r'
+
+
+class _Reader:
+    """Pulls JSON tokens and small values out of a text stream."""
+
+    def __init__(self, fh, chunk_size=CHUNK_SIZE):
+        self.fh = fh
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        chunk = self.fh.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Returns the next non-whitespace character without consuming it."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected '{char}' but found {found!r}")
+        self.pos += 1
+
+    def value(self):
+        """Decodes the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                obj, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number running to the end of the buffer may continue in the next chunk.
+            if end == len(self.buf) and not self.eof and self._fill():
+                continue
+            self.pos = end
+            return obj
+
+    def items(self):
+        """Iterates over the keys of an object; the caller consumes each value."""
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(':')
+            yield key
+            if self.peek() == ',':
+                self.pos += 1
+                continue
+            self.expect('}')
+            return
+
+    def elements(self):
+        """Iterates over the elements of an array; the caller consumes each one."""
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield
+            if self.peek() == ',':
+                self.pos += 1
+                continue
+            self.expect(']')
+            return
+
+
+class _Record:
+    __slots__ = ()
+
+    # Source key -> attribute, for the keys with an attribute of their own.
+    _keys = {}
+
+    def _set(self, key, value):
+        attribute = self._keys.get(key)
+        if attribute is not None:
+            setattr(self, attribute, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __repr__(self):
+        values = ', '.join(f"{key}={getattr(self, attribute)!r}" for key, attribute in self._keys.items())
+        return f"{type(self).__name__}({values}, extra={self.extra!r})"
+
+
+class Author(_Record):
+    __slots__ = ('name', 'contact', 'source', 'extra', 'complete')
+    _keys = {'author': 'name', 'contact': 'contact'}
+
+    def __init__(self, name=None, contact=None, source=None, extra=None):
+        self.name = name
+        self.contact = contact
+        self.source = source
+        self.extra = extra
+        self.complete = False
+
+
+class Book(_Record):
+    __slots__ = ('author', 'booktitle', 'booktitle_tanglish', 'category', 'description', 'extra', 'complete')
+    _keys = {'booktitle': 'booktitle', 'booktitle_tanglish': 'booktitle_tanglish',
+             'category': 'category', 'description': 'description'}
+
+    def __init__(self, author, booktitle=None, booktitle_tanglish=None, category=None, description=None, extra=None):
+        self.author = author
+        self.booktitle = booktitle
+        self.booktitle_tanglish = booktitle_tanglish
+        self.category = category
+        self.description = description
+        self.extra = extra
+        self.complete = False
+
+
+class Context(_Record):
+    __slots__ = ('book', 'title', 'line', 'meaning', 'extra')
+    _keys = {'title': 'title', 'line': 'line', 'meaning': 'meaning'}
+
+    def __init__(self, book, title=None, line=None, meaning=None, extra=None):
+        self.book = book
+        self.title = title
+        self.line = line
+        self.meaning = meaning
+        self.extra = extra
+
+
+def iter_records(fh, source=None, chunk_size=CHUNK_SIZE):
+    """Yields Author, Book and Context records from one author file object.
+
+    Raises ValueError (json.JSONDecodeError included) on malformed input or
+    a file without a top-level ``author`` key; as that key may come last,
+    records of such a file can already have been yielded.
+    """
+    reader = _Reader(fh, chunk_size)
+    author = Author(source=source)
+    has_name = started = False
+    for key in reader.items():
+        if key != 'books':
+            has_name = has_name or key == 'author'
+            author._set(key, reader.value())
+            continue
+        if not started:
+            started = True
+            yield author
+        for _ in reader.elements():
+            yield from _iter_book(reader, author)
+
+    if not has_name:
+        raise ValueError("Does not contain top-level 'author' key or is not a dictionary.")
+    author.complete = True
+    if not started:
+        yield author
+
+
+def _iter_book(reader, author):
+    book = Book(author)
+    started = False
+    for key in reader.items():
+        if key != 'context':
+            book._set(key, reader.value())
+            continue
+        if not started:
+            started = True
+            yield book
+        for _ in reader.elements():
+            data = reader.value()
+            if isinstance(data, dict):
+                context = Context(book)
+                for field, value in data.items():
+                    context._set(field, value)
+                yield context
+    book.complete = True
+    if not started:
+        yield book
+
+
+def iter_directory(json_files, on_error=None):
+    """Streams records from several author files, one file open at a time.
+
+    ``on_error(file_path, exc)`` is called for files that cannot be read;
+    without it the exception propagates.
+    """
+    for file_path in json_files:
+        try:
+            with file_path.open('r', encoding='utf-8') as fh:
+                yield from iter_records(fh, file_path.name)
+        except (OSError, ValueError) as e:
+            if on_error is None:
+                raise
+            on_error(file_path, e)
+
+
+def scan_poems(records, author=None, book=None, title=None):
+    """Filters a record stream down to the poems matching the given names.
+
+    Matching is the same NFC + casefold comparison the lookup indexes use;
+    books match on either their Tamil or Tanglish title.
+    """
+    author_key = normalize_key(author) if author is not None else None
+    book_key = normalize_key(book) if book is not None else None
+    title_key = normalize_key(title) if title is not None else None
+
+    def verdict(poem):
+        # True or False, or None while a name the filter needs may still come after the poem.
+        if book_key is not None and book_key not in (normalize_key(poem.book.booktitle or ''),
+                                                     normalize_key(poem.book.booktitle_tanglish or '')):
+            return None if not poem.book.complete else False
+        if author_key is not None and normalize_key(str(poem.book.author.name)) != author_key:
+            return None if not poem.book.author.complete else False
+        return True
+
+    # Matching titles whose verdict is pending, in document order.
+    pending = deque()
+    for record in records:
+        if isinstance(record, Author):
+            # Earlier authors are complete by now, unless their file failed part-way.
+            yield from [poem for poem in pending if verdict(poem)]
+            pending.clear()
+        elif isinstance(record, Context) and (title_key is None or normalize_key(record.title or '') == title_key):
+            pending.append(record)
+        while pending:
+            matched = verdict(pending[0])
+            if matched is None:
+                break
+            poem = pending.popleft()
+            if matched:
+                yield poem
+    for poem in pending:
+        if verdict(poem):
+            yield poem
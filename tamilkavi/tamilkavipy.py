@@ -1,57 +1,313 @@
-import json
+import os
 import sys
-import textwrap
-import importlib.resources
-from pathlib import Path
+from collections.abc import Mapping
 from argparse import ArgumentParser, RawTextHelpFormatter
-from prettytable import PrettyTable
+
+from tamilkavi.profiling import env_enabled, profiled
+from tamilkavi.text import normalize_key
+
+# Heavier modules (json, pathlib, importlib.resources, prettytable, the cache,
+# index and loader modules) are imported inside the functions that use them,
+# so the greeting and -h never pay for them. See tests/test_startup.py.
 
 
 def wrap_text(text, width=50):
-    """Wraps text to a specified width for display."""
+    """Wraps text to a specified width for display.
+
+    Widths are display columns counted by grapheme cluster (see
+    tamilkavi.text.wrap), and each (text, width) is wrapped only once.
+    """
+    from tamilkavi.text import fill
+
     if not isinstance(text, str):
         return text
-    return '\n'.join(textwrap.wrap(text, width))
+    return fill(text, width)
+
+def _load_author_file(file_path):
+    """Reads and validates one author file (runs inside loader workers).
+
+    Returns ``(data, signature, warning)``: data is None when the file was
+    skipped, and warning then says why. signature is None when the file is
+    not on a real filesystem and cannot be cached.
+    """
+    import json
+
+    from tamilkavi import cache as corpus_cache
+
+    try:
+        raw = file_path.read_bytes()
+        data = json.loads(raw.decode('utf-8'))
+        if not (isinstance(data, dict) and 'author' in data):
+            return None, None, f"Skipping {file_path.name}: Does not contain top-level 'author' key or is not a dictionary."
+    except json.JSONDecodeError as e:
+        return None, None, f"Error decoding JSON from {file_path.name}: {e}"
+    except Exception as e:
+        return None, None, f"An unexpected error occurred while reading {file_path.name}: {e}"
+
+    try:
+        signature = corpus_cache.file_signature(file_path, raw)
+    except (OSError, TypeError):
+        signature = None
+    return data, signature, None
+
+
+def _index_entries(author):
+    """Yields ``(level, key, hit)`` for every lookup-index entry of one author.
+
+    level 0 is the author index, 1 the book index and 2 the title index;
+    entries come in corpus order.
+    """
+    name = author.get('author')
+    if isinstance(name, str):
+        yield 0, normalize_key(name), (author,)
+    for book in author.get('books', []):
+        book_keys = []
+        for field in ('booktitle_tanglish', 'booktitle'):
+            value = book.get(field, '')
+            if not isinstance(value, str):
+                continue
+            key = normalize_key(value)
+            # A book whose Tamil and Tanglish titles normalize alike is listed once.
+            if key not in book_keys:
+                book_keys.append(key)
+                yield 1, key, (author, book)
+        for context in book.get('context', []):
+            poem_title = context.get('title', '')
+            if isinstance(poem_title, str):
+                yield 2, normalize_key(poem_title), (author, book, context)
+
+
+def _key_matches(value, key):
+    """True when value is a string that normalizes to key, as the index keys do."""
+    return isinstance(value, str) and normalize_key(value) == key
+
+
+def _register_ids(author, known_ids, remove=False):
+    """Adds (or removes) an author and its books and poems in the known-id maps."""
+    records = [(0, author)]
+    for book in author.get('books', []):
+        records.append((1, book))
+        records.extend((2, context) for context in book.get('context', []))
+    for level, record in records:
+        if remove:
+            known_ids[level].pop(id(record), None)
+        else:
+            known_ids[level][id(record)] = record
+
+
+class CorpusLoadError(Exception):
+    """The corpus could not be loaded (raised when exit_on_error is False)."""
+
+
+def _plain(book):
+    """Returns a plain dict copy of a book and its poems."""
+    book_copy = {key: value for key, value in book.items() if key != 'context'}
+    if 'context' in book:
+        book_copy['context'] = [dict(context) for context in book['context']]
+    return book_copy
+
+
+def _paging_requested(limit, offset, cursor):
+    return limit is not None or bool(offset) or cursor is not None
+
+
+def _paged(items, scope, limit, offset, cursor, transform=None):
+    """Returns items as a list, or one tamilkavi.paging.Page of them when paging was asked for."""
+    if not _paging_requested(limit, offset, cursor):
+        return [transform(item) for item in items] if transform is not None else list(items)
+
+    from tamilkavi import paging
+
+    return paging.paginate(items, scope, limit, offset, cursor, transform)
+
+
+def _query_scope(kind, value, author=None, book=None):
+    """Returns the cursor scope of a title or search query, narrowed by its author and book."""
+    scope = f"{kind}:{normalize_key(value)}"
+    if author is not None:
+        scope += f"|author:{normalize_key(author)}"
+    if book is not None:
+        scope += f"|book:{normalize_key(book)}"
+    return scope
+
+
+def _poems_scope(poems):
+    """Names the poems a title filter matched in data the indexes do not know, for cursor scopes."""
+    return ','.join(str(poem.get('line', '')) for poem in poems)
+
+
+def _sorted_titles(authors):
+    """Returns the sorted unique poem titles of a list of author dicts."""
+    titles = set()
+    for author in authors:
+        for book in author.get('books', []):
+            for context in book.get('context', []):
+                title = context.get('title')
+                if title:
+                    titles.add(title)
+    return sorted(titles)
+
+
+def _poem_titles(author):
+    for book in author.get('books', []):
+        for context in book.get('context', []):
+            title = context.get('title')
+            if title:
+                yield title
+
+
+def _patched_titles(titles, removed, added, title_index):
+    """Returns a copy of a sorted title listing with the removed authors' titles
+    swapped for the added ones'.
+
+    A removed title stays listed while title_index (already patched) still
+    has a poem with exactly that title.
+    """
+    import bisect
+
+    titles = list(titles)
+    for author in removed:
+        for title in _poem_titles(author):
+            hits = title_index.get(normalize_key(title), ()) if isinstance(title, str) else ()
+            if any(poem.get('title') == title for _, _, poem in hits):
+                continue
+            pos = bisect.bisect_left(titles, title)
+            if pos < len(titles) and titles[pos] == title:
+                del titles[pos]
+    for author in added:
+        for title in _poem_titles(author):
+            pos = bisect.bisect_left(titles, title)
+            if pos == len(titles) or titles[pos] != title:
+                titles.insert(pos, title)
+    return titles
+
+
+def _poem_of_hit(hit):
+    return hit[2]
+
+
+def _author_of_entry(entry):
+    return entry.get('author', 'Unknown')
+
 
 class KaviExtraction:
-    def __init__(self):
+    def __init__(self, data_dir=None, use_cache=True, rebuild_cache=False, cache_dir=None, lazy=False, preload=True, compact=False,
+                 packed_path=None, load_workers=None, load_executor='thread', exit_on_error=True, profiler=None,
+                 query_cache_size=None, query_cache_ttl=None, bundle_path=None):
+        # data_dir defaults to the 'kavisrc' folder shipped inside the package.
+        # The compiled cache and manifest live under cache_dir (see tamilkavi.cache).
+        # With lazy=True only the manifest is read up front; author files are
+        # opened by load_for_query() as queries need them. preload=False
+        # loads nothing, for callers that only stream records with iter_records().
+        # compact=True keeps slotted Author/Book/Poem records (tamilkavi.records)
+        # in saved_books instead of nested dicts. packed_path loads a memory-mapped
+        # corpus file (tamilkavi.packed) instead of the JSON sources, and
+        # bundle_path a compressed tamilkavi-build bundle (tamilkavi.bundle); a
+        # bundle shipped inside the package replaces the packaged kavisrc.
+        # load_workers > 1 reads and validates author files concurrently in a
+        # 'thread' or 'process' pool (default from $TAMILKAVI_LOAD_WORKERS).
+        # exit_on_error=False raises CorpusLoadError instead of exiting when
+        # no corpus can be loaded, for programs embedding the library.
+        # profiler (a tamilkavi.profiling.Profiler) counts time and memory
+        # spent loading, indexing and filtering.
+        # query_cache_size bounds the LRU cache of subset() results (default
+        # tamilkavi.querycache.DEFAULT_SIZE, 0 disables it); query_cache_ttl
+        # expires cached results after that many seconds.
+        self.data_dir = data_dir
+        self.exit_on_error = exit_on_error
+        self.profiler = profiler
+        self.query_cache = None
+        if query_cache_size != 0:
+            from tamilkavi import querycache
+
+            self.query_cache = querycache.QueryCache(query_cache_size or querycache.DEFAULT_SIZE, query_cache_ttl)
+        self.use_cache = use_cache
+        self.compact = compact
+        self.packed_path = packed_path
+        self.packed = None
+        self._packed_signature = None
+        self.bundle_path = bundle_path
+        self._bundle_checked = False
+        self._bundle_loaded_state = None
+        if load_workers is None:
+            load_workers = int(os.environ.get('TAMILKAVI_LOAD_WORKERS', '0') or 0)
+        self.load_workers = load_workers
+        self.load_executor = load_executor
+        self.load_warnings = []
+        self.rebuild_cache = rebuild_cache
+        self.cache_dir = cache_dir
+        self.loaded_from_cache = False
         self.saved_books = []
-        self.get_books_from_json()
+        self.author_index = {}
+        self.book_index = {}
+        self.title_index = {}
+        self._known_ids = ({}, {}, {})
+        self.book_list = []
+        self._unique_titles = None
+        self.source_files = []
+        self.sources = None
+        self.manifest = None
+        self.fully_loaded = False
+        self.search_index = None
+        self.trigram_index = None
+        self._cache_file = None
+        self._cache_payload = None
+        if not preload:
+            return
+        packaged = False
+        if bundle_path is None and data_dir is None and packed_path is None and not (compact or rebuild_cache):
+            from tamilkavi import bundle as corpus_bundle
+
+            bundle_path = corpus_bundle.packaged_bundle()
+            packaged = bundle_path is not None
+        if packed_path is not None:
+            self.get_books_from_packed(packed_path)
+        elif bundle_path is not None:
+            self.get_books_from_bundle(bundle_path, check_sources=packaged)
+        elif lazy and use_cache:
+            self.open_manifest()
+        else:
+            self.get_books_from_json()
 
+    @profiled('filter')
     def get_authors(self, name, data):
         """Filters a list of author dicts by author name."""
+        key = normalize_key(name)
+        hits = self._from_index(self.author_index.get(key, []), data, 0)
+        if hits is not None:
+            return [author for (author,) in hits]
+
         found_authors = []
         for author in data:
-            if author.get('author') is not None and author.get('author').lower() == name.lower():
+            if _key_matches(author.get('author'), key):
                 found_authors.append(author)
         return found_authors
 
+    @profiled('filter')
     def get_book(self, book_title, data):
         """Filters a list of author/book dicts by book title."""
         found_books = []
         if not data:
              return []
+        key = normalize_key(book_title)
 
         # Check if data is a list of author dicts or a list of book dicts
-        if data and isinstance(data[0], dict):
+        if data and isinstance(data[0], Mapping):
             if 'books' in data[0]:
+                 hits = self._from_index(self.book_index.get(key, []), data, 0)
+                 if hits is not None:
+                     return [book for _, book in hits]
                  for author in data:
                      for book in author.get('books', []):
-                         if (book.get('booktitle_tanglish', '').lower() == book_title.lower() or
-                                 book.get('booktitle', '').lower() == book_title.lower()):
+                         if _key_matches(book.get('booktitle_tanglish'), key) or _key_matches(book.get('booktitle'), key):
                              found_books.append(book)
             elif 'context' in data[0]: # Assuming data is already a list of book-like dictionaries
+                 hits = self._from_index(self.book_index.get(key, []), data, 1)
+                 if hits is not None:
+                     return [book for _, book in hits]
                  for book in data:
-                     if (book.get('booktitle_tanglish', '').lower() == book_title.lower() or
-                             book.get('booktitle', '').lower() == book_title.lower()):
+                     if _key_matches(book.get('booktitle_tanglish'), key) or _key_matches(book.get('booktitle'), key):
                          found_books.append(book)
-            # Added a check for 'line' and 'meaning' which might indicate list of contexts,
-            # though get_book expects books or authors. This block was in get_titles,
-            # moving it here was likely a copy/paste error, but keeping the structure
-            # as provided by the user. Let's remove this part as it doesn't belong in get_book.
-            # elif 'line' in data[0] and 'meaning' in data[0]:
-            #      # This case seems incorrect for get_book. Reverting to previous logic.
-            #      pass
         else:
              # If data is not empty but data[0] is not a dict or doesn't have expected keys
              if data: # Only print warning if data was provided but was unexpected format
@@ -60,52 +316,142 @@ class KaviExtraction:
 
         return found_books
 
-    def get_titles(self, title, data):
-        """Filters data (list of authors, books, or contexts) by poem title."""
+    @profiled('filter')
+    def get_titles(self, title, data, limit=None, offset=0, cursor=None):
+        """Filters data (list of authors, books, or contexts) by poem title.
+
+        With limit/offset/cursor only that page of the matches is returned,
+        as a tamilkavi.paging.Page.
+        """
         found_poems = []
+        paging_requested = _paging_requested(limit, offset, cursor)
+        scope = _query_scope('title', title) if paging_requested else None
         if not data:
-             return []
+             return _paged([], scope, limit, offset, cursor)
+
+        def paged_hits(hits):
+            hits_scope = scope
+            if paging_requested and hits is not bucket:
+                # A cursor only resumes the same title over the same matches, named by their
+                # positions in the title index rather than by their text.
+                positions = {id(hit): position for position, hit in enumerate(bucket)}
+                hits_scope += "|in:" + ','.join(str(positions[id(hit)]) for hit in hits)
+            return _paged(hits, hits_scope, limit, offset, cursor, _poem_of_hit)
 
         def search_books_for_title(books_list):
             poems = []
             for book in books_list:
                 for context in book.get('context', []):
-                    if context.get('title', '').lower() == title.lower():
+                    if _key_matches(context.get('title'), key):
                         poems.append(context)
             return poems
 
+        key = normalize_key(title)
+        bucket = self.title_index.get(key, [])
+
         # Check if data is a list of author dicts, book dicts, or context dicts
-        if data and isinstance(data[0], dict):
+        if data and isinstance(data[0], Mapping):
             if 'books' in data[0]: # Data is a list of author dicts
+                 hits = self._from_index(bucket, data, 0)
+                 if hits is not None:
+                     return paged_hits(hits)
                  for author in data:
                      found_poems.extend(search_books_for_title(author.get('books', [])))
             elif 'context' in data[0]: # Data is a list of book dicts (or book-like dicts with context)
+                 hits = self._from_index(bucket, data, 1)
+                 if hits is not None:
+                     return paged_hits(hits)
                  found_poems = search_books_for_title(data)
             elif 'line' in data[0] and 'meaning' in data[0]: # Data is a list of context dicts
+                 hits = self._from_index(bucket, data, 2)
+                 if hits is not None:
+                     return paged_hits(hits)
                  for context in data:
-                     if context.get('title', '').lower() == title.lower():
+                     if _key_matches(context.get('title'), key):
                           found_poems.append(context)
         else:
              # If data is not empty but data[0] is not a dict or doesn't have expected keys
              if data: # Only print warning if data was provided but was unexpected format
                  print("Warning: get_titles received unexpected data format.")
 
-
-        return found_poems
-
-    def get_all_books(self, data):
+        if paging_requested:
+            scope += f"|found:{_poems_scope(found_poems)}"
+        return _paged(found_poems, scope, limit, offset, cursor)
+
+    @profiled('index')
+    def build_indexes(self):
+        """Builds the normalized author/book/title lookup indexes.
+
+        Each index maps a normalized key to a list of record paths in corpus
+        order: ``(author,)`` for authors, ``(author, book)`` for books and
+        ``(author, book, context)`` for poems. Books are indexed under both
+        ``booktitle`` and ``booktitle_tanglish``.
+        """
+        self.author_index = {}
+        self.book_index = {}
+        self.title_index = {}
+        # ids of every indexed record per level, used to tell library-owned
+        # data apart from lists built by the caller.
+        self._known_ids = ({}, {}, {})
+        # Every book in corpus order, so book listings can be sliced per page.
+        self.book_list = []
+        self._unique_titles = None
+        if self.query_cache is not None:
+            self.query_cache.clear()
+
+        indexes = (self.author_index, self.book_index, self.title_index)
+        for author in self.saved_books:
+            _register_ids(author, self._known_ids)
+            self.book_list.extend(author.get('books', []))
+            for level, key, hit in _index_entries(author):
+                indexes[level].setdefault(key, []).append(hit)
+
+    def _from_index(self, bucket, data, level):
+        """Restricts index hits to the records present in data, in data order.
+
+        ``level`` says which element of each hit (0 author, 1 book, 2 context)
+        data is made of. Returns None when data holds records the indexes do
+        not know about, so the caller falls back to scanning it.
+        """
+        if data is self.saved_books:
+            return bucket
+
+        known = self._known_ids[level]
+        positions = {}
+        for position, item in enumerate(data):
+            if known.get(id(item)) is not item:
+                return None
+            positions.setdefault(id(item), position)
+        if len(positions) != len(data):
+            return None
+
+        hits = [hit for hit in bucket if id(hit[level]) in positions]
+        hits.sort(key=lambda hit: positions[id(hit[level])])
+        return hits
+
+    @profiled('filter')
+    def get_all_books(self, data, limit=None, offset=0, cursor=None):
         """Extracts all books from a list of author dicts."""
         all_books_list = []
-        if data and isinstance(data, list) and data and isinstance(data[0], dict) and 'books' in data[0]:
+        if data and isinstance(data, list) and data and isinstance(data[0], Mapping) and 'books' in data[0]:
+             if data is self.saved_books:
+                 return _paged(self.book_list, 'books', limit, offset, cursor)
              for author in data:
                  all_books_list.extend(author.get('books', []))
 
-        return all_books_list
+        return _paged(all_books_list, 'books', limit, offset, cursor)
 
-    def get_all_unique_titles(self, data):
+    @profiled('filter')
+    def get_all_unique_titles(self, data, limit=None, offset=0, cursor=None):
         """Collects all unique poem titles from a list of author dicts or book dicts."""
+        if data is self.saved_books:
+            if self._unique_titles is None:
+                # Sorted once per corpus and kept with the compiled cache; pages are slices of it.
+                self._unique_titles = self.cached_artifact('titles', lambda: _sorted_titles(self.saved_books))
+            return _paged(self._unique_titles, 'titles', limit, offset, cursor)
+
         unique_titles = set()
-        if data and isinstance(data, list) and data and isinstance(data[0], dict):
+        if data and isinstance(data, list) and data and isinstance(data[0], Mapping):
             def collect_titles_from_books(books_list):
                 titles = set()
                 for book in books_list:
@@ -126,11 +472,721 @@ class KaviExtraction:
                      if title:
                          unique_titles.add(title)
 
-        return sorted(list(unique_titles))
+        return _paged(sorted(unique_titles), 'titles', limit, offset, cursor)
 
+    @profiled('load')
     def get_books_from_json(self):
-        """Loads book data from JSON files included in the package data."""
+        """Loads book data from JSON files included in the package data.
+
+        A compiled snapshot of the parsed files is kept in the corpus cache and
+        reused as long as every source file is unchanged. A stale or corrupt
+        cache falls back to parsing the JSON files and is then rebuilt.
+        """
+        from tamilkavi import cache as corpus_cache
+
         self.saved_books = [] # Clear the list before loading
+        self.source_files = []
+        self.sources = None
+        self.load_warnings = []
+        self.loaded_from_cache = False
+        self.search_index = None
+        self.trigram_index = None
+        self._cache_payload = None
+
+        data_dir = self._resolve_data_dir()
+        json_files = self._find_json_files(data_dir)
+
+        if self.compact:
+            self._load_records(json_files)
+            return
+
+        cache_file = corpus_cache.cache_file_for(data_dir, self.cache_dir) if self.use_cache else None
+        self._cache_file = cache_file
+        if cache_file is not None and not self.rebuild_cache:
+            payload, refreshed = corpus_cache.load_cache(cache_file, json_files)
+            if payload is not None:
+                self.saved_books = payload['books']
+                self.source_files = payload['files']
+                self.sources = payload['sources']
+                self.loaded_from_cache = True
+                self.fully_loaded = True
+                self._cache_payload = payload
+                if refreshed:
+                    corpus_cache.write_cache(cache_file, payload)
+                self.build_indexes()
+                self._unique_titles = payload.get('titles')
+                return
+
+        sources = {}
+        clean = True
+        for file_path, (data, signature, warning) in zip(json_files, self._load_files(json_files)):
+            if data is None:
+                self.load_warnings.append(warning)
+                clean = False
+                continue
+            self.saved_books.append(data)
+            self.source_files.append(file_path.name)
+            if signature is None:
+                # Not a real file on disk (e.g. zipped package); skip caching.
+                clean = False
+            else:
+                sources[file_path.name] = signature
+        self.report_load_warnings()
+
+        if not self.saved_books:
+            self._fail("No valid author data loaded from JSON files.", "Exiting: No data loaded.")
+
+        self.fully_loaded = True
+        self.build_indexes()
+
+        # Only snapshot a clean load, so warnings for broken files keep showing.
+        if clean:
+            self.sources = sources
+            if cache_file is not None:
+                # The sorted title listing is compiled with the corpus, so list-all commands only slice it.
+                self._unique_titles = _sorted_titles(self.saved_books)
+                self._cache_payload = {
+                    'sources': sources,
+                    'files': self.source_files,
+                    'books': self.saved_books,
+                    'titles': self._unique_titles,
+                }
+                corpus_cache.write_cache(cache_file, self._cache_payload)
+
+    @profiled('load')
+    def get_books_from_packed(self, path):
+        """Loads book data from a memory-mapped packed corpus file.
+
+        saved_books then holds lazy, dict-compatible views: only titles are
+        decoded up front (for the indexes); lines and meanings are decoded
+        when they are read.
+        """
+        from tamilkavi import cache as corpus_cache
+        from tamilkavi import packed as corpus_packed
+
+        try:
+            signature = corpus_cache.file_signature(path)
+            corpus = corpus_packed.PackedCorpus(path)
+        except (OSError, ValueError) as e:
+            self._fail(f"Could not open packed corpus {path}: {e}", "Exiting: Error accessing packed corpus.")
+
+        # A previous mapping is not closed: threads may still read poems from it.
+        # It is unmapped once the last view over it is garbage-collected.
+        self.packed = corpus
+        self._packed_signature = signature
+        self.saved_books = corpus.authors()
+        self.source_files = []
+        self.search_index = None
+        self.trigram_index = None
+        if not self.saved_books:
+            self._fail("No valid author data loaded from the packed corpus.", "Exiting: No data loaded.")
+        self.fully_loaded = True
+        self.build_indexes()
+
+    @profiled('load')
+    def get_books_from_bundle(self, path, check_sources=False):
+        """Loads the corpus and its prebuilt indexes from a tamilkavi-build bundle.
+
+        Only the lookup dicts are built here; the title listing and the
+        search and trigram indexes come ready-made from the bundle.
+
+        With check_sources (used for the packaged bundle), a bundle that cannot
+        be read or whose recorded source signatures no longer match the JSON
+        files in the data directory is ignored and the JSON files are loaded.
+        """
+        from tamilkavi import bundle as corpus_bundle
+        from tamilkavi import cache as corpus_cache
+
+        state = self._bundle_state(path, check_sources)
+        payload = None
+        if check_sources:
+            json_files = self._bundle_sources()
+            # Without the JSON files (a bundle-only install) the bundle is all there is.
+            if json_files:
+                check_file = corpus_cache.bundle_check_file_for(path, self.cache_dir) if self.use_cache else None
+                try:
+                    fresh, payload = corpus_bundle.matches_sources(path, json_files, check_file)
+                except (OSError, ValueError):
+                    fresh = False
+                if not fresh:
+                    self.bundle_path = None
+                    self.get_books_from_json()
+                    return
+
+        if payload is None:
+            try:
+                payload = corpus_bundle.read_bundle(path)
+            except (OSError, ValueError) as e:
+                if check_sources:
+                    self.bundle_path = None
+                    self.get_books_from_json()
+                    return
+                self._fail(f"Could not open corpus bundle {path}: {e}", "Exiting: Error accessing corpus bundle.")
+
+        self.bundle_path = path
+        self._bundle_checked = check_sources
+        self._bundle_loaded_state = state
+        self.saved_books = payload['books']
+        self.source_files = payload['files']
+        self.sources = None
+        if not self.saved_books:
+            self._fail("No valid author data loaded from the corpus bundle.", "Exiting: No data loaded.")
+        self.fully_loaded = True
+        self.build_indexes()
+        self._unique_titles = payload['titles']
+        self.search_index = payload['search_index']
+        self.trigram_index = payload['trigram_index']
+
+    def _bundle_sources(self):
+        """Returns the JSON files a packaged bundle is checked against."""
+        return sorted(self._resolve_data_dir().glob('*.json'), key=lambda file_path: file_path.name)
+
+    def _bundle_state(self, path, check_sources):
+        """Returns the stat signatures of a bundle (and its JSON sources), or None if they cannot be read."""
+        from tamilkavi import cache as corpus_cache
+
+        try:
+            files = self._bundle_sources() if check_sources else []
+            return corpus_cache.file_signature(path), {file_path.name: corpus_cache.file_signature(file_path)
+                                                       for file_path in files}
+        except (OSError, TypeError):
+            return None
+
+    def _load_records(self, json_files):
+        """Builds slotted records straight from the streaming reader.
+
+        No nested dict tree is materialised on the way, so the compiled
+        (pickle) cache is not used in this mode.
+        """
+        import json
+
+        from tamilkavi import records as corpus_records
+        from tamilkavi import stream as corpus_stream
+
+        for file_path in json_files:
+            try:
+                with file_path.open('r', encoding='utf-8') as fh:
+                    authors = corpus_records.from_stream(corpus_stream.iter_records(fh, file_path.name))
+            except json.JSONDecodeError as e:
+                 self.load_warnings.append(f"Error decoding JSON from {file_path.name}: {e}")
+                 continue
+            except ValueError as e:
+                 self.load_warnings.append(f"Skipping {file_path.name}: {e}")
+                 continue
+            except Exception as e:
+                 self.load_warnings.append(f"An unexpected error occurred while reading {file_path.name}: {e}")
+                 continue
+            self.saved_books.extend(authors)
+            self.source_files.extend(file_path.name for _ in authors)
+        self.report_load_warnings()
+
+        if not self.saved_books:
+            self._fail("No valid author data loaded from JSON files.", "Exiting: No data loaded.")
+
+        self.fully_loaded = True
+        self.build_indexes()
+
+    def ensure_fully_loaded(self):
+        """Loads the whole corpus if only part of it was read so far."""
+        if not self.fully_loaded:
+            self.get_books_from_json()
+
+    @profiled('load')
+    def reload(self):
+        """Picks up added, modified and deleted author files.
+
+        Only the changed files are read again, and only their authors'
+        entries in the lookup, search and trigram indexes and the title
+        listing are replaced. The new corpus and indexes
+        are built next to the current ones and swapped in at the end, so
+        threads still querying the library never wait or see a half-updated
+        state. A modified file that no longer loads keeps its previous data.
+
+        Returns ``{'added', 'modified', 'removed'}`` lists of file names plus
+        ``full``, True when the library had no per-file signatures to compare
+        (lazy, packed, bundle or compact loads, unclean first loads) and everything
+        was loaded again instead. A bundle is only loaded again once it or the
+        JSON files it was checked against change, and a packed file once it
+        is replaced.
+        """
+        from tamilkavi import cache as corpus_cache
+
+        changes = {'added': [], 'modified': [], 'removed': [], 'full': False}
+        if self.packed is not None:
+            try:
+                unchanged = corpus_cache.file_signature(self.packed_path) == self._packed_signature
+            except OSError:
+                unchanged = False
+            if unchanged:
+                return changes
+            self.get_books_from_packed(self.packed_path)
+            changes['full'] = True
+            return changes
+        if self.bundle_path is not None:
+            state = self._bundle_state(self.bundle_path, self._bundle_checked)
+            if state is not None and state == self._bundle_loaded_state:
+                return changes
+            self.get_books_from_bundle(self.bundle_path, check_sources=self._bundle_checked)
+            changes['full'] = True
+            return changes
+        if not self.fully_loaded and self.manifest is not None:
+            self.open_manifest()
+            changes['full'] = True
+            return changes
+        if self.sources is None or self.compact:
+            self.get_books_from_json()
+            changes['full'] = True
+            return changes
+
+        data_dir = self._resolve_data_dir()
+        json_files = self._find_json_files(data_dir)
+        sources = {name: dict(signature) for name, signature in self.sources.items()}
+        added, modified, removed = corpus_cache.diff_sources(sources, json_files)
+        changes.update(added=added, modified=modified, removed=removed)
+        if not (added or modified or removed):
+            self.sources = sources
+            return changes
+
+        paths = {file_path.name: file_path for file_path in json_files}
+        changed = added + modified
+        loaded = {}
+        for name, (data, signature, warning) in zip(changed, self._load_files([paths[name] for name in changed])):
+            if data is None:
+                self.load_warnings.append(warning)
+            else:
+                loaded[name] = (data, signature)
+        self.report_load_warnings()
+
+        by_file = dict(zip(self.source_files, self.saved_books))
+        replaced = [by_file.pop(name) for name in removed + list(loaded) if name in by_file]
+        for name in removed:
+            sources.pop(name, None)
+        for name, (data, signature) in loaded.items():
+            by_file[name] = data
+            sources[name] = signature
+        if not by_file:
+            self._fail("No valid author data left after reloading the JSON files.", "Exiting: No data loaded.")
+        files = sorted(by_file)
+        books = [by_file[name] for name in files]
+        added_authors = [data for data, _ in loaded.values()]
+        indexes, known_ids = self._patched_indexes(books, replaced, added_authors)
+
+        # The search and trigram indexes and the title listing, where in use, are
+        # patched for the changed authors too, as copies, before the swap.
+        search_index = trigram_index = unique_titles = None
+        if self.search_index is not None:
+            search_index = self.search_index.patched(books, replaced, added_authors)
+        if self.trigram_index is not None:
+            trigram_index = self.trigram_index.patched(books, replaced, added_authors)
+        if self._unique_titles is not None:
+            unique_titles = _patched_titles(self._unique_titles, replaced, added_authors, indexes[2])
+
+        self.saved_books = books
+        self.source_files = files
+        self.author_index, self.book_index, self.title_index = indexes
+        self._known_ids = known_ids
+        self.book_list = [book for author in books for book in author.get('books', [])]
+        self._unique_titles = unique_titles
+        self.search_index = search_index
+        self.trigram_index = trigram_index
+        self.sources = sources
+        if self.query_cache is not None:
+            self.query_cache.clear()
+
+        if self._cache_file is not None:
+            payload = {'sources': sources, 'files': files, 'books': books}
+            if search_index is not None:
+                payload['search_index'] = search_index
+            if trigram_index is not None:
+                payload['trigram_index'] = trigram_index
+            if unique_titles is not None:
+                payload['titles'] = unique_titles
+            self._cache_payload = payload
+            corpus_cache.write_cache(self._cache_file, payload)
+        if self.manifest is not None:
+            from tamilkavi import manifest as corpus_manifest
+
+            self.manifest = corpus_manifest.build_manifest(sources, files, books)
+            corpus_manifest.write_manifest(corpus_manifest.manifest_file_for(data_dir, self.cache_dir), self.manifest)
+        return changes
+
+    def _patched_indexes(self, books, removed, added):
+        """Returns copies of the lookup indexes with the removed authors' entries
+        replaced by the added authors', plus the matching known-id maps.
+
+        Only the index keys those authors appear under are touched; their
+        hits are put back in the corpus order of books.
+        """
+        indexes = (dict(self.author_index), dict(self.book_index), dict(self.title_index))
+        known_ids = tuple(dict(ids) for ids in self._known_ids)
+        removed_ids = {id(author) for author in removed}
+        touched = (set(), set(), set())
+        for author in removed:
+            _register_ids(author, known_ids, remove=True)
+            for level, key, _ in _index_entries(author):
+                touched[level].add(key)
+        additions = ({}, {}, {})
+        for author in added:
+            _register_ids(author, known_ids)
+            for level, key, hit in _index_entries(author):
+                touched[level].add(key)
+                additions[level].setdefault(key, []).append(hit)
+
+        position = {id(author): pos for pos, author in enumerate(books)}
+        for level, index in enumerate(indexes):
+            for key in touched[level]:
+                bucket = [hit for hit in index.get(key, ()) if id(hit[0]) not in removed_ids]
+                bucket.extend(additions[level].get(key, ()))
+                if bucket:
+                    # Stable, so hits of one author keep their order.
+                    bucket.sort(key=lambda hit: position[id(hit[0])])
+                    index[key] = bucket
+                else:
+                    index.pop(key, None)
+        return indexes, known_ids
+
+    def cached_artifact(self, name, build):
+        """Returns a structure derived from the corpus, stored with the corpus cache.
+
+        ``build()`` is only called when the compiled cache does not hold
+        ``name`` yet; its result is then written back next to the corpus.
+        """
+        from tamilkavi import cache as corpus_cache
+
+        payload = self._cache_payload
+        if payload is not None and name in payload:
+            return payload[name]
+        value = build()
+        if payload is not None:
+            payload[name] = value
+            corpus_cache.write_cache(self._cache_file, payload)
+        return value
+
+    @profiled('index')
+    def get_search_index(self):
+        """Returns the full-text search index, building it on first use."""
+        from tamilkavi.search import SearchIndex
+
+        index = self.search_index
+        if index is None:
+            self.ensure_fully_loaded()
+            books = self.saved_books
+            index = self.cached_artifact('search_index', lambda: SearchIndex.build(books))
+            # A reload that finished meanwhile must not get this index of the old corpus.
+            if self.saved_books is books:
+                self.search_index = index
+        return index
+
+    @profiled('index')
+    def get_trigram_index(self):
+        """Returns the title trigram index, building it on first use."""
+        from tamilkavi.fuzzy import TrigramIndex
+
+        index = self.trigram_index
+        if index is None:
+            self.ensure_fully_loaded()
+            books = self.saved_books
+            index = self.cached_artifact('trigram_index', lambda: TrigramIndex.build(books))
+            if self.saved_books is books:
+                self.trigram_index = index
+        return index
+
+    @profiled('filter')
+    def suggest(self, text, kind=None, limit=5):
+        """Returns ranked "did you mean" ``(title, score)`` pairs for text.
+
+        kind is 'book' for book titles, 'title' for poem titles, or None for both.
+        """
+        return self.get_trigram_index().suggest(text, kind=kind, limit=limit)
+
+    @profiled('filter')
+    def search(self, query, author=None, book=None):
+        """Ranks poems by how well their title, line and meaning match query.
+
+        Each result is a copy of the poem's context dict with its ``author``,
+        ``booktitle`` and ``booktitle_tanglish`` added, plus a BM25 ``score``.
+        Optional author/book names restrict the results.
+        """
+        # Hits point at the author dicts the index was built from, so a
+        # concurrent reload cannot point them into the new corpus.
+        index = self.get_search_index()
+        author_key = normalize_key(author) if author is not None else None
+        book_key = normalize_key(book) if book is not None else None
+
+        results = []
+        for doc_id, score in index.search(query):
+            author_data, book_pos, context_pos = index.doc_paths[doc_id]
+            book_data = author_data['books'][book_pos]
+            if author_key is not None and normalize_key(str(author_data.get('author'))) != author_key:
+                continue
+            if book_key is not None and book_key not in (normalize_key(str(book_data.get('booktitle_tanglish', ''))),
+                                                         normalize_key(str(book_data.get('booktitle', '')))):
+                continue
+            result = dict(book_data['context'][context_pos])
+            result['author'] = author_data.get('author', 'Unknown')
+            result['booktitle'] = book_data.get('booktitle', 'N/A')
+            result['booktitle_tanglish'] = book_data.get('booktitle_tanglish', 'N/A')
+            result['score'] = round(score, 4)
+            results.append(result)
+        return results
+
+    @profiled('load')
+    def open_manifest(self):
+        """Loads the corpus manifest instead of the whole corpus.
+
+        Author files are then read on demand by ``load_for_query``. When the
+        manifest is missing or stale the whole corpus is loaded once and a
+        fresh manifest is written from it.
+        """
+        from tamilkavi import manifest as corpus_manifest
+
+        self.saved_books = []
+        self.source_files = []
+        self.fully_loaded = False
+        self._file_data = {}
+
+        data_dir = self._resolve_data_dir()
+        json_files = self._find_json_files(data_dir)
+        self._json_files = {file_path.name: file_path for file_path in json_files}
+        manifest_file = corpus_manifest.manifest_file_for(data_dir, self.cache_dir)
+
+        if not self.rebuild_cache:
+            manifest, refreshed = corpus_manifest.load_manifest(manifest_file, json_files)
+            if manifest is not None:
+                if refreshed:
+                    corpus_manifest.write_manifest(manifest_file, manifest)
+                self.manifest = manifest
+                self.build_indexes()
+                return
+
+        # First run, or sources changed: load everything once and record where each author lives.
+        self.get_books_from_json()
+        if self.sources is not None:
+            self.manifest = corpus_manifest.build_manifest(self.sources, self.source_files, self.saved_books)
+            corpus_manifest.write_manifest(manifest_file, self.manifest)
+
+    @profiled('load')
+    def load_for_query(self, author=None, book=None, title=None):
+        """Reads the author files that can hold results for a query.
+
+        Only meaningful for a library opened with ``lazy=True``; otherwise the
+        whole corpus is already in ``saved_books`` and this does nothing.
+        """
+        from tamilkavi import manifest as corpus_manifest
+
+        if self.fully_loaded or self.manifest is None:
+            return
+
+        wanted = corpus_manifest.files_for_query(self.manifest, author, book, title)
+        missing = [file_name for file_name in wanted if file_name not in self._file_data]
+        if not missing:
+            return
+
+        missing_files = [self._json_files[file_name] for file_name in missing]
+        for file_name, (data, _, warning) in zip(missing, self._load_files(missing_files)):
+            if data is None:
+                self.load_warnings.append(warning)
+            else:
+                self._file_data[file_name] = data
+        self.report_load_warnings()
+
+        # Keep saved_books in the same order a full load would produce.
+        self.source_files = [entry['file'] for entry in self.manifest['authors'] if entry['file'] in self._file_data]
+        self.saved_books = [self._file_data[file_name] for file_name in self.source_files]
+        self.build_indexes()
+
+    def iter_records(self):
+        """Streams Author, Book and Context records from every source file.
+
+        Files are read incrementally (see tamilkavi.stream), so memory stays
+        bounded by one poem regardless of how large the author files are.
+        Unreadable files are reported and skipped.
+        """
+        from tamilkavi import stream as corpus_stream
+
+        def report(file_path, error):
+            print(f"⚠️  Skipping {file_path.name}: {error}")
+
+        json_files = self._find_json_files(self._resolve_data_dir())
+        return corpus_stream.iter_directory(json_files, on_error=report)
+
+    def scan_poems(self, author=None, book=None, title=None):
+        """Yields the Context records matching the given names, in constant memory."""
+        from tamilkavi import stream as corpus_stream
+
+        return corpus_stream.scan_poems(self.iter_records(), author=author, book=book, title=title)
+
+    @profiled('filter')
+    def list_authors(self, limit=None, offset=0, cursor=None):
+        """Returns every author name, from the manifest when one is open."""
+        if self.manifest is not None:
+            return _paged(self.manifest['authors'], 'authors', limit, offset, cursor, _author_of_entry)
+        return _paged(self.saved_books, 'authors', limit, offset, cursor, _author_of_entry)
+
+    @profiled('filter')
+    def list_books(self, limit=None, offset=0, cursor=None):
+        """Returns every book (title, Tanglish title and category)."""
+        if self.manifest is not None:
+            return _paged(self.manifest['books'], 'books', limit, offset, cursor)
+        return self.get_all_books(self.saved_books, limit, offset, cursor)
+
+    @profiled('filter')
+    def list_titles(self, limit=None, offset=0, cursor=None):
+        """Returns the sorted unique poem titles."""
+        if self.manifest is not None:
+            return _paged(self.manifest['titles'], 'titles', limit, offset, cursor)
+        return self.get_all_unique_titles(self.saved_books, limit, offset, cursor)
+
+    @classmethod
+    def from_data(cls, authors, listing=None):
+        """Builds a library over author dicts that are already in memory.
+
+        ``listing`` optionally supplies the list-all views (a dict with
+        manifest-style ``authors``, ``books`` and ``titles`` lists), e.g.
+        when the authors are only the part of a corpus sent by a server.
+        """
+        library = cls(preload=False)
+        library.saved_books = list(authors)
+        library.fully_loaded = listing is None
+        library.manifest = listing
+        library.build_indexes()
+        return library
+
+    @profiled('filter')
+    def subset(self, author=None, book=None, title=None):
+        """Returns a pruned copy of the corpus holding only what a query can show.
+
+        Authors are kept when they match ``author``, their books when they
+        match ``book`` and those books' poems when they match ``title``;
+        levels without a filter are kept whole. The result is a list of plain
+        author dicts in corpus order, ready for ``from_data`` or JSON.
+
+        Results are kept in the query cache, so callers must not modify them.
+        """
+        if self.query_cache is None:
+            return self._subset(author, book, title)
+        key = tuple(normalize_key(value) if value is not None else None for value in (author, book, title))
+        return self.query_cache.get_or_compute(key, lambda: self._subset(author, book, title))
+
+    def _subset(self, author, book, title):
+        self.ensure_fully_loaded()
+        authors, books = {}, {}
+        for hit in self.query(author, book, title):
+            author_data = hit[0]
+            author_copy = authors.get(id(author_data))
+            if author_copy is None:
+                author_copy = authors[id(author_data)] = {key: value for key, value in author_data.items() if key != 'books'}
+                author_copy['books'] = [] if len(hit) > 1 else [_plain(book_data) for book_data in author_data.get('books', [])]
+            if len(hit) == 1:
+                continue
+
+            book_data = hit[1]
+            book_copy = books.get(id(book_data))
+            if book_copy is None:
+                if len(hit) > 2:
+                    book_copy = {key: value for key, value in book_data.items() if key != 'context'}
+                    book_copy['context'] = []
+                else:
+                    book_copy = _plain(book_data)
+                books[id(book_data)] = book_copy
+                author_copy['books'].append(book_copy)
+            if len(hit) > 2:
+                book_copy['context'].append(dict(hit[2]))
+        return list(authors.values())
+
+    @profiled('filter')
+    def query(self, author=None, book=None, title=None):
+        """Finds what a combined author/book/title query selects, in one pass.
+
+        The most specific filter picks one lookup-index bucket (title, else
+        book, else author) and the other filters are checked on its hits, so
+        nothing is scanned twice. Returns the hits in corpus order as
+        ``(author,)``, ``(author, book)`` or ``(author, book, poem)`` tuples,
+        which keep every poem's book and author at hand for display. Without
+        filters every loaded author is returned.
+        """
+        author_key = normalize_key(author) if author is not None else None
+        book_key = normalize_key(book) if book is not None else None
+
+        if title is not None:
+            hits = self.title_index.get(normalize_key(title), [])
+        elif book is not None:
+            hits = self.book_index.get(book_key, [])
+        elif author is not None:
+            hits = self.author_index.get(author_key, [])
+        else:
+            return [(author_data,) for author_data in self.saved_books]
+
+        matches = []
+        for hit in hits:
+            if author_key is not None and normalize_key(str(hit[0].get('author'))) != author_key:
+                continue
+            if len(hit) > 1 and book_key is not None and book_key not in (
+                    normalize_key(str(hit[1].get('booktitle_tanglish', ''))), normalize_key(str(hit[1].get('booktitle', '')))):
+                continue
+            matches.append(hit)
+        return matches
+
+    def listing(self):
+        """Returns the list-all views as a manifest-style dict (see from_data)."""
+        return {
+            'authors': [{'author': name} for name in self.list_authors()],
+            'books': [{'booktitle': book.get('booktitle', 'N/A'), 'booktitle_tanglish': book.get('booktitle_tanglish', 'N/A'),
+                       'category': book.get('category', 'N/A')} for book in self.list_books()],
+            'titles': self.list_titles(),
+        }
+
+    def _find_json_files(self, data_dir):
+        """Returns the author JSON files in data_dir, exiting if there are none."""
+        # Sorted by name so every load (and every worker pool) merges in the same order.
+        json_files = sorted(data_dir.glob('*.json'), key=lambda file_path: file_path.name)
+
+        if not json_files:
+            if data_dir.is_dir():
+                self._fail(f"No JSON files found in '{data_dir}'. Is the folder empty?", "Exiting: Cannot find any data files.")
+            else:
+                self._fail(f"Package data directory '{data_dir}' could not be accessed or found.", "Exiting: Cannot find any data files.")
+        return json_files
+
+    def _load_files(self, json_files):
+        """Reads and validates author files, in parallel when configured.
+
+        Returns one ``(data, signature, warning)`` tuple per file, in the
+        order of json_files whatever order the workers finish in.
+        """
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+        from pathlib import Path
+
+        workers = self.load_workers or 1
+        if workers <= 1 or len(json_files) < 2:
+            return [_load_author_file(file_path) for file_path in json_files]
+
+        if self.load_executor == 'process':
+            pool_class = ProcessPoolExecutor
+            # Traversable objects from importlib.resources may not pickle.
+            json_files = [Path(str(file_path)) for file_path in json_files]
+        else:
+            pool_class = ThreadPoolExecutor
+        chunksize = max(1, len(json_files) // (workers * 4))
+        with pool_class(max_workers=workers) as pool:
+            return list(pool.map(_load_author_file, json_files, chunksize=chunksize))
+
+    def report_load_warnings(self):
+        """Prints the problems collected while loading, all together."""
+        if not self.load_warnings:
+            return
+        print(f"⚠️  {len(self.load_warnings)} file(s) could not be loaded:")
+        for warning in self.load_warnings:
+            print(f"   - {warning}")
+        self.load_warnings = []
+
+    def _resolve_data_dir(self):
+        """Returns the directory holding the author JSON files."""
+        import importlib.resources
+        from pathlib import Path
+
+        if self.data_dir is not None:
+            return Path(self.data_dir)
 
         # Use importlib.resources to access files within the installed package
         # 'tamilkavi' is the name of your package as defined in setup.py
@@ -138,93 +1194,82 @@ class KaviExtraction:
         try:
             # This gets a Traversable object for the 'kavisrc' directory inside the 'tamilkavi' package
             # This requires Python 3.9+ or the importlib_resources backport installed for Python 3.7/3.8
-            data_dir = importlib.resources.files('tamilkavi') / 'kavisrc'
+            return importlib.resources.files('tamilkavi') / 'kavisrc'
         except FileNotFoundError:
-            print("⚠️  Package data directory 'kavisrc' not found.")
-            sys.exit("Exiting: Cannot find data files within the package. Ensure kavisrc folder is included in package_data.")
+            self._fail("Package data directory 'kavisrc' not found.",
+                       "Exiting: Cannot find data files within the package. Ensure kavisrc folder is included in package_data.")
         except Exception as e:
-            print(f"⚠️  An unexpected error occurred while accessing package data directory: {e}")
-            sys.exit("Exiting: Error accessing package data.")
+            self._fail(f"An unexpected error occurred while accessing package data directory: {e}", "Exiting: Error accessing package data.")
 
-        json_files = list(data_dir.glob('*.json'))
+    def _fail(self, problem, exit_message):
+        """Stops on a fatal load problem: exits the CLI, or raises CorpusLoadError when exit_on_error is False."""
+        if not self.exit_on_error:
+            raise CorpusLoadError(problem)
+        print(f"⚠️  {problem}")
+        sys.exit(exit_message)
 
-        if not json_files:
-            if data_dir.is_dir():
-                print(f"⚠️  No JSON files found in '{data_dir}'. Is the folder empty?")
-            else:
-                print(f"⚠️  Package data directory '{data_dir}' could not be accessed or found.")
-            sys.exit("Exiting: Cannot find any data files.")
 
+def _notice(message, output_format):
+    # With machine-readable formats stdout carries only rows, so notices go to stderr.
+    print(message, file=sys.stdout if output_format == 'table' else sys.stderr)
 
-        loaded_count = 0
-        for file_path in json_files:
-            try:
-                with file_path.open("r", encoding="utf-8") as file:
-                    data = json.load(file)
-                    if isinstance(data, dict) and 'author' in data:
-                         self.saved_books.append(data)
-                         loaded_count += 1
-                    else:
-                         print(f"⚠️  Skipping {file_path.name}: Does not contain top-level 'author' key or is not a dictionary.")
 
-            except json.JSONDecodeError as e:
-                 print(f"⚠️  Error decoding JSON from {file_path.name}: {e}")
-            except Exception as e:
-                 print(f"⚠️  An unexpected error occurred while reading {file_path.name}: {e}")
+def display_books_in_table(books, output_format='table', start=1):
+    """Displays book dictionaries (a list or any iterable) in the chosen output format.
 
-        if not self.saved_books:
-            print("⚠️  No valid author data loaded from JSON files.")
-            sys.exit("Exiting: No data loaded.")
-
-
-def display_books_in_table(books):
-    """Displays a list of book dictionaries in a table."""
-    table = PrettyTable()
-    table.field_names = ["SNO", "Book Title (Tanglish)", "Book Title (Tamil)", "Category"]
+    Rows are numbered from start (e.g. offset + 1 for a later page).
+    """
+    from tamilkavi import output
 
-    if not books:
-        print("No books to display.")
-        return
+    if not output.render(output.book_rows(books, start), output.BOOK_COLUMNS, output_format):
+        _notice("No books to display.", output_format)
 
-    for index, book in enumerate(books, start=1):
-        book_title_tanglish = book.get('booktitle_tanglish', 'N/A')
-        book_title_tamil = book.get('booktitle', 'N/A')
-        category = book.get('category', 'N/A')
 
-        table.add_row([index, wrap_text(book_title_tanglish, 40), wrap_text(book_title_tamil, 40), wrap_text(category, 20)]) # Add category to row
+def display_kavithais_in_table(kavithais, show_source=False, output_format='table', start=1):
+    """Displays poem context dictionaries (a list or any iterable) in the chosen output format.
 
-    print(table)
+    With show_source=True the author and book each poem came from (as
+    carried by search results) are shown as well. Rows are numbered from
+    start.
+    """
+    from tamilkavi import output
 
+    columns = output.KAVITHAI_COLUMNS
+    if show_source:
+        columns += (output.SOURCE_TABLE_COLUMN,) if output_format == 'table' else output.SOURCE_COLUMNS
+    if not output.render(output.kavithai_rows(kavithais, show_source, start), columns, output_format):
+        _notice("No poems to display.", output_format)
 
-def display_kavithais_in_table(kavithais):
-    """Displays a list of poem context dictionaries in a table."""
-    table = PrettyTable()
-    table.field_names = ["SNO", "Kavithai Title", "Kavithai", "Kavithai Meaning"]
+def print_suggestions(library, args):
+    """Prints "did you mean" titles for the -b/-t values of a failed lookup."""
+    suggestions = []
+    if args.book_title is not None and args.book_title != '__list_all_books__':
+        suggestions.extend(library.suggest(args.book_title, kind='book'))
+    if args.poem_title is not None and args.poem_title != '__list_all_titles__':
+        suggestions.extend(library.suggest(args.poem_title, kind='title'))
 
-    if not kavithais:
-        print("No poems to display.")
+    if not suggestions:
         return
+    output_format = getattr(args, 'output_format', 'table')
+    _notice("💡 Did you mean:", output_format)
+    for title, _ in sorted(suggestions, key=lambda item: -item[1]):
+        _notice(f"- {title}", output_format)
 
-    for index, kavithai in enumerate(kavithais, start=1):
-        row = [index]
+def _first_number(items):
+    # Row number of the first item of a page (1 for unpaged lists).
+    return getattr(items, 'offset', 0) + 1
 
-        # Get the poem title
-        kavithai_title = kavithai.get('title', 'N/A')
-        kavithai_text = kavithai.get('line', 'N/A')
-        kavithai_meaning = kavithai.get('meaning', 'N/A')
 
-        # Wrap the texts
-        kavithai_title_wrapped = wrap_text(kavithai_title, width=30)
-        kavithai_text_wrapped = wrap_text(kavithai_text, width=60)
-        kavithai_meaning_wrapped = wrap_text(kavithai_meaning, width=60)
+def main():
+    if sys.argv[1:2] == ['serve']:
+        from tamilkavi import server
 
-        # Add data to the row in the correct order
-        row.extend([kavithai_title_wrapped, kavithai_text_wrapped, kavithai_meaning_wrapped])
-        table.add_row(row)
+        return server.main(sys.argv[2:])
+    if sys.argv[1:2] == ['import-db']:
+        from tamilkavi import sqlite
 
-    print(table)
+        return sqlite.main(sys.argv[2:])
 
-def main():
     epilog_text = """
 Examples:
 
@@ -258,6 +1303,39 @@ tamilkavi -b "Book Title" -t "Poem Title"
 # Show poems with a specific title from a specific book by a specific author
 tamilkavi -a "Author Name" -b "Book Title" -t "Poem Title"
 
+# Search poem titles, lines and meanings for words
+tamilkavi --search "முருகா"
+
+# Search within the poems of a specific author
+tamilkavi --search "முருகா" -a "Author Name"
+
+# Suggest close matches when a book or poem title is misspelt
+tamilkavi -b "inbamila-ithayathilirunthu" --fuzzy
+
+# Write poems as JSON Lines (or csv/tsv) for other tools
+tamilkavi -b "Book Title" --format jsonl
+
+# Page through poem titles, 20 at a time (the next-page cursor is printed)
+tamilkavi -t --limit 20
+tamilkavi -t --limit 20 --cursor "<cursor>"
+
+# Re-parse the JSON sources and rebuild the compiled cache
+tamilkavi --rebuild-cache
+
+# Answer many queries (one JSON object per line) with one loaded corpus
+tamilkavi --batch queries.jsonl --batch-workers 4 > results.jsonl
+
+# Keep the corpus loaded in a local server and send queries to it
+tamilkavi serve --port 8765
+tamilkavi --server http://127.0.0.1:8765 -b "Book Title"
+
+# Convert the JSON corpus into one indexed SQLite file and query that instead
+tamilkavi import-db corpus.db
+tamilkavi --db corpus.db -t "Poem Title"
+
+# List near-duplicate poems across all authors before a release
+tamilkavi --dedupe-report
+
 # Get detailed help
 tamilkavi -h
 
@@ -272,18 +1350,90 @@ tamilkavi -h
     parser.add_argument("-a", '--authors', dest="author_name", nargs='?', const='__list_all__', type=str, help="Filter by author name (use -a to list all authors)")
     parser.add_argument("-b", '--book', dest="book_title", nargs='?', const='__list_all_books__', type=str, help="Filter by book title (use -b to list all books)")
     parser.add_argument("-t", '--title', dest="poem_title", nargs='?', const='__list_all_titles__', type=str, help="Filter by poem title (use -t to list all unique titles)")
+    parser.add_argument('-s', '--search', dest="search_query", type=str, help="Search poem titles, lines and meanings (ranked by relevance)")
+    parser.add_argument('--fuzzy', dest="fuzzy", action='store_true', help="Suggest close book/poem titles when an exact match finds nothing")
+    parser.add_argument('--rebuild-cache', dest="rebuild_cache", action='store_true', help="Re-parse the JSON sources and rebuild the compiled corpus cache")
+    parser.add_argument('--format', dest="output_format", choices=('table', 'jsonl', 'csv', 'tsv'), default='table', help="Output format for results (default: table)")
+    parser.add_argument('--limit', dest="limit", type=int, help="Show at most LIMIT results (lists, -t and --search results)")
+    parser.add_argument('--offset', dest="offset", type=int, default=0, help="Skip the first OFFSET results")
+    parser.add_argument('--cursor', dest="cursor", type=str, help="Resume from the cursor printed with the previous page")
+    parser.add_argument('--server', dest="server_url", default=os.environ.get('TAMILKAVI_SERVER'), help="Send queries to a running 'tamilkavi serve' at this URL (default: $TAMILKAVI_SERVER)")
+    parser.add_argument('--db', dest="db", metavar="PATH", default=os.environ.get('TAMILKAVI_DB'), help="Read the corpus from a SQLite file written by 'tamilkavi import-db' (default: $TAMILKAVI_DB)")
+    parser.add_argument('--batch', dest="batch", metavar="FILE", help="Answer JSONL queries from FILE ('-' for stdin), one JSONL result per query")
+    parser.add_argument('--batch-workers', dest="batch_workers", type=int, default=1, help="Worker processes answering --batch queries, each loading the corpus once (default: 1)")
+    parser.add_argument('--dedupe-report', dest="dedupe_report", action='store_true', help="List groups of near-duplicate poems across all authors, with their files, books and titles")
+    parser.add_argument('--dedupe-threshold', dest="dedupe_threshold", type=float, default=0.8, help="Similarity (0-1) from which --dedupe-report groups poems (default: 0.8)")
+    parser.add_argument('--profile', dest="profile", action='store_true', default=env_enabled(os.environ.get('TAMILKAVI_PROFILE')),
+                        help="Report time and peak memory of the load/index/filter/render phases on stderr (or set $TAMILKAVI_PROFILE)")
+    parser.add_argument('--profile-dump', dest="profile_dump", metavar="FILE", default=os.environ.get('TAMILKAVI_PROFILE_DUMP'),
+                        help="Also write cProfile stats to FILE (or set $TAMILKAVI_PROFILE_DUMP)")
     args = parser.parse_args()
 
-    # Check if *any* of the filter arguments (-a, -b, -t) were provided with *any* value (including the const values)
+    profiler = None
+    if args.profile or args.profile_dump:
+        from tamilkavi import profiling
+
+        profiler = profiling.Profiler(dump_path=args.profile_dump).start()
+        profiling.activate(profiler)
+    try:
+        _run_command(args, profiler)
+    finally:
+        if profiler is not None:
+            profiler.stop()
+            profiler.report()
+            profiling.activate(None)
+
+
+def _open_backend(args, profiler=None, info=print):
+    """Returns the backend queries go to: the --db corpus database, or else the JSON files."""
+    if args.db:
+        from tamilkavi.sqlite import SqliteBackend
+
+        try:
+            return SqliteBackend(args.db)
+        except ValueError as e:
+            info(f"⚠️  Could not open corpus database: {e}")
+            sys.exit("Exiting: Cannot open the corpus database.")
+    from tamilkavi.storage import JsonBackend
+
+    return JsonBackend(rebuild_cache=args.rebuild_cache, profiler=profiler)
+
+
+def _run_command(args, profiler=None):
+    """Runs the command selected by the parsed CLI arguments."""
+    if args.batch is not None:
+        from contextlib import redirect_stdout
+        from tamilkavi import batch
+
+        # stdout carries only JSONL results, so warnings go to stderr; the corpus loads on the first query.
+        with redirect_stdout(sys.stderr):
+            backend = _open_backend(args, profiler)
+        batch.main(backend, args.batch, args.batch_workers)
+        return
+
+    if args.dedupe_report:
+        from tamilkavi import dedupe
+
+        library = KaviExtraction(rebuild_cache=args.rebuild_cache, profiler=profiler)
+        dedupe.main(library, args.dedupe_threshold, args.output_format)
+        return
+
+    # Check if *any* of the filter arguments (-a, -b, -t, -s) were provided with *any* value (including the const values)
     is_any_filter_requested = (
         args.author_name is not None or
         args.book_title is not None or
-        args.poem_title is not None
+        args.poem_title is not None or
+        args.search_query is not None
     )
 
     # If none of the filter arguments were requested, this is the default command
     is_default_command = not is_any_filter_requested
 
+    if is_default_command and args.rebuild_cache:
+        library = KaviExtraction(rebuild_cache=True, lazy=True, profiler=profiler)
+        print(f"✅ Corpus cache rebuilt ({len(library.saved_books)} authors).")
+        sys.exit(0)
+
     if is_default_command:
         print("🙏 Vannakam Makkalayae !")
         print("Welcome to Tamil Kavi 👋")
@@ -294,108 +1444,186 @@ tamilkavi -h
         print("👉 https://tamilkavi.com")
         sys.exit(0) 
 
-    library = KaviExtraction()
-    current_data = library.saved_books
+    output_format = args.output_format
+    if output_format == 'table':
+        info = print
+    else:
+        # stdout carries only the rows; headings and notices go to stderr.
+        def info(*values):
+            print(*values, file=sys.stderr)
 
+    paging_args = {'limit': args.limit, 'offset': args.offset, 'cursor': args.cursor}
 
-    # If author filter is specified (and not just listing all)
-    if args.author_name is not None and args.author_name != '__list_all__':
-        current_data = library.get_authors(args.author_name, current_data)
-
-    # If book filter is specified (and not just listing all)
-    if args.book_title is not None and args.book_title != '__list_all_books__':
-        current_data = library.get_book(args.book_title, current_data)
+    def paged(fetch, *fetch_args):
+        try:
+            return fetch(*fetch_args, **paging_args)
+        except ValueError as e:
+            info(f"⚠️  {e}")
+            sys.exit("Exiting: Invalid --limit, --offset or --cursor.")
+
+    def show_next_cursor(items):
+        next_cursor = getattr(items, 'next_cursor', None)
+        if next_cursor:
+            info(f"➡️  More results: --cursor {next_cursor}")
+
+    # A running server answers from memory; without one (or when it is
+    # unreachable) the corpus is loaded here as usual.
+    use_server = args.server_url and not args.rebuild_cache
+
+    backend = _open_backend(args, profiler, info)
+
+    if args.search_query is not None:
+        search_author = args.author_name if args.author_name != '__list_all__' else None
+        search_book = args.book_title if args.book_title != '__list_all_books__' else None
+        results = None
+        if use_server:
+            from tamilkavi import server
+
+            results = server.remote_search(args.server_url, args.search_query, author=search_author, book=search_book)
+        if results is None:
+            # From JSON, search needs the whole corpus; its index is stored with the compiled cache.
+            results = backend.search(args.search_query, author=search_author, book=search_book)
+        results = paged(_paged, results, _query_scope('search', args.search_query, search_author, search_book))
+        if results:
+            info(f"🔎 Search Results / Thedal Mudivugal: {args.search_query}")
+            display_kavithais_in_table(results, show_source=True, output_format=output_format, start=_first_number(results))
+            show_next_cursor(results)
+        else:
+            info("⚠️  No results found.")
+        return
 
-    # If poem title filter is specified (and not just listing all)
-    if args.poem_title is not None and args.poem_title != '__list_all_titles__':
-         current_data = library.get_titles(args.poem_title, current_data)
+    is_list_all_command = (args.author_name == '__list_all__' or args.book_title == '__list_all_books__' or args.poem_title == '__list_all_titles__')
+
+    library = None
+    # "Did you mean" needs every title, so --fuzzy queries stay local.
+    if use_server and not args.fuzzy:
+        from tamilkavi import server
+
+        library = server.remote_library(args.server_url, author=args.author_name, book=args.book_title,
+                                        title=args.poem_title, listing=is_list_all_command)
+        if library is not None:
+            library.profiler = profiler
+    if library is None:
+        # From JSON only the manifest is read here; author files are opened as the query needs them.
+        library = backend.library(author=args.author_name, book=args.book_title, title=args.poem_title, listing=is_list_all_command)
+        library.profiler = profiler
+
+    # All of -a/-b/-t are applied in one pass. Each hit is an (author,), (author, book)
+    # or (author, book, poem) tuple, so the headings below need no further lookups.
+    filter_author = args.author_name if args.author_name != '__list_all__' else None
+    filter_book = args.book_title if args.book_title != '__list_all_books__' else None
+    filter_title = args.poem_title if args.poem_title != '__list_all_titles__' else None
+    hits = []
+    if not is_list_all_command:
+        hits = library.query(filter_author, filter_book, filter_title)
+    if filter_title is not None:
+        # Scoped like get_titles, so a -t cursor also resumes get_titles over the whole corpus.
+        hits = paged(lambda **paging: _paged(hits, _query_scope('title', filter_title, filter_author, filter_book), **paging))
 
 
     displayed = False
 
     if args.author_name == '__list_all__':
-        print("✍️ Available Authors / Irrukum Ezhuthalargal:") 
-        all_authors = library.saved_books
-        if all_authors:
-             for author_data in all_authors:
-                  print(f"- {author_data.get('author', 'Unknown')}")
+        info("✍️ Available Authors / Irrukum Ezhuthalargal:") 
+        all_authors = paged(library.list_authors)
+        if all_authors and output_format != 'table':
+             from tamilkavi import output
+             output.render(({'author': author_name} for author_name in all_authors), output.AUTHOR_LIST_COLUMNS, output_format)
+             show_next_cursor(all_authors)
+        elif all_authors:
+             for author_name in all_authors:
+                  print(f"- {author_name}")
+             show_next_cursor(all_authors)
              print("\nUse -a \"Author Name\" to see books by a specific author.")
         else:
-             print("No authors available.")
+             info("No authors available.")
         displayed = True
 
     elif args.book_title == '__list_all_books__':
-        print("📚 Available Books / Irrukum Puthagangal:")
-        all_books = library.get_all_books(library.saved_books)
-        display_books_in_table(all_books)
+        info("📚 Available Books / Irrukum Puthagangal:")
+        all_books = paged(library.list_books)
+        display_books_in_table(all_books, output_format, _first_number(all_books))
+        show_next_cursor(all_books)
         displayed = True
 
     elif args.poem_title == '__list_all_titles__':
-        print("📑 Available Poem Titles / Irrukum Kavithaiyin Thalaipugal:")
-        all_titles = library.get_all_unique_titles(library.saved_books)
-        if all_titles:
-            for i, title in enumerate(all_titles, start=1):
+        info("📑 Available Poem Titles / Irrukum Kavithaiyin Thalaipugal:")
+        all_titles = paged(library.list_titles)
+        if all_titles and output_format != 'table':
+            from tamilkavi import output
+            output.render(({'sno': i, 'title': title} for i, title in enumerate(all_titles, start=_first_number(all_titles))),
+                          output.TITLE_LIST_COLUMNS, output_format)
+            show_next_cursor(all_titles)
+        elif all_titles:
+            for i, title in enumerate(all_titles, start=_first_number(all_titles)):
                 print(f"{i}. {title}")
+            show_next_cursor(all_titles)
         else:
-            print("No poem titles available.")
+            info("No poem titles available.")
         displayed = True
 
     is_specific_filter_applied_with_results = (
         is_any_filter_requested and
         not (args.author_name == '__list_all__' or args.book_title == '__list_all_books__' or args.poem_title == '__list_all_titles__') and # It wasn't just a list-all command
-        current_data
+        hits
     )
 
     if is_specific_filter_applied_with_results:
-        if args.poem_title is not None and args.poem_title != '__list_all_titles__':
-             print(f"✅ Filtered by Title: {args.poem_title}")
-             if args.author_name is not None and args.author_name != '__list_all__':
-                 author_lookup = library.get_authors(args.author_name, library.saved_books)
-                 if author_lookup:
-                      print(f"✅ Author / Ezhuthalar: {author_lookup[0].get('author', 'Unknown Author')}")
-             if args.book_title is not None and args.book_title != '__list_all_books__':
-                  book_lookup = library.get_book(args.book_title, library.saved_books)
-                  if book_lookup:
-                       print(f"✅ Book Title (Tanglish): {book_lookup[0].get('booktitle_tanglish', 'N/A')}")
-
-             display_kavithais_in_table(current_data)
+        if filter_title is not None:
+             info(f"✅ Filtered by Title: {args.poem_title}")
+             if filter_author is not None:
+                 info(f"✅ Author / Ezhuthalar: {hits[0][0].get('author', 'Unknown Author')}")
+             if filter_book is not None:
+                 info(f"✅ Book Title (Tanglish): {hits[0][1].get('booktitle_tanglish', 'N/A')}")
+
+             display_kavithais_in_table([poem for _, _, poem in hits], output_format=output_format, start=_first_number(hits))
+             show_next_cursor(hits)
+             displayed = True
+
+        elif filter_book is not None and output_format != 'table':
+             # One row stream for all matching books, each poem tagged with its author and book.
+             display_kavithais_in_table(
+                 (dict(context, author=author_data.get('author', 'Unknown'),
+                       booktitle_tanglish=book_data.get('booktitle_tanglish', 'N/A'))
+                  for author_data, book_data in hits for context in book_data.get('context', [])),
+                 show_source=True, output_format=output_format)
              displayed = True
 
-        elif args.book_title is not None and args.book_title != '__list_all_books__':
-             for book_data in current_data:
-                  if args.author_name is not None and args.author_name != '__list_all__':
-                      author_lookup = library.get_authors(args.author_name, library.saved_books)
-                      if author_lookup:
-                           print(f"✅ Author / Ezhuthalar: {author_lookup[0].get('author', 'Unknown Author')}")
-
-                  print(f"✅ Book Title (Tanglish): {book_data.get('booktitle_tanglish', 'N/A')}")
-                  print(f"✅ Book Title (Tamil): {book_data.get('booktitle', 'N/A')}")
-                  print(f"📚 Category: {book_data.get('category', 'N/A')}")
-                  print("📜 Poems / Kavithaigal:")
-                  display_kavithais_in_table(book_data.get('context', []))
-                  if len(current_data) > 1: print("-" * 30)
+        elif filter_book is not None:
+             for author_data, book_data in hits:
+                  if filter_author is not None:
+                      info(f"✅ Author / Ezhuthalar: {author_data.get('author', 'Unknown Author')}")
+
+                  info(f"✅ Book Title (Tanglish): {book_data.get('booktitle_tanglish', 'N/A')}")
+                  info(f"✅ Book Title (Tamil): {book_data.get('booktitle', 'N/A')}")
+                  info(f"📚 Category: {book_data.get('category', 'N/A')}")
+                  info("📜 Poems / Kavithaigal:")
+                  display_kavithais_in_table(book_data.get('context', []), output_format=output_format)
+                  if len(hits) > 1: info("-" * 30)
              displayed = True
 
-        elif args.author_name is not None and args.author_name != '__list_all__':
-             author_data = current_data[0]
-             print(f"✅ Author / Ezhuthalar: {author_data.get('author', 'Unknown')}")
-             print(f"📧 Contact: {author_data.get('contact', 'N/A')}")
+        elif filter_author is not None:
+             author_data = hits[0][0]
+             info(f"✅ Author / Ezhuthalar: {author_data.get('author', 'Unknown')}")
+             info(f"📧 Contact: {author_data.get('contact', 'N/A')}")
              all_books = author_data.get("books", [])
              if all_books:
-                 print("📚 Books / Puthagangal:")
-                 display_books_in_table(all_books)
+                 info("📚 Books / Puthagangal:")
+                 display_books_in_table(all_books, output_format)
              else:
-                  print("⚠️  No books found for this author.")
+                  info("⚠️  No books found for this author.")
              displayed = True
 
-    if is_any_filter_requested and not (args.author_name == '__list_all__' or args.book_title == '__list_all_books__' or args.poem_title == '__list_all_titles__') and not current_data:
-         print("⚠️  No results found.") 
+    if is_any_filter_requested and not (args.author_name == '__list_all__' or args.book_title == '__list_all_books__' or args.poem_title == '__list_all_titles__') and not hits:
+         info("⚠️  No results found.") 
+         if args.fuzzy:
+             print_suggestions(backend, args)
          displayed = True
 
 
     if not displayed:
-         print("⚠️  Unhandled command or display scenario.")
-         print("Use -h for help.")
+         info("⚠️  Unhandled command or display scenario.")
+         info("Use -h for help.")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,156 @@
+"""Text helpers shared by the lookup and search indexes and the table renderer."""
+import re
+import unicodedata
+from functools import lru_cache
+
+# Word characters plus the combining marks Python's \w leaves out. Tamil
+# vowel signs and the virama (pulli) are combining marks, so with \w alone
+# a word like "முருகா" would be cut apart at every vowel sign. The Indic
+# blocks (U+0900-U+0DFF) and ZWJ/ZWNJ keep each grapheme cluster whole.
+_TOKEN_RE = re.compile(r"[\w\u0300-\u036f\u0900-\u0dff\u200c\u200d]+")
+
+# Zero-width non-joiner and joiner.
+_JOINERS = ('\u200c', '\u200d')
+
+# textwrap's chunking of text into whitespace runs, words and the parts of
+# hyphenated words, with letters widened to the Indic blocks (whose vowel
+# signs \w leaves out) so Tamil hyphenated words break like Latin ones.
+_WHITESPACE = '\t\n\x0b\x0c\r '
+_WHITESPACE_TRANS = {ord(char): ' ' for char in _WHITESPACE}
+_WORDSEP_RE = re.compile(r"""
+    ( # any whitespace
+      %(ws)s+
+    | # em-dash between words
+      (?<=%(wp)s) -{2,} (?=\w)
+    | # word, possibly hyphenated
+      %(nws)s+? (?:
+        # hyphenated word
+          -(?: (?<=%(lt)s{2}-) | (?<=%(lt)s-%(lt)s-))
+          (?= %(lt)s -? %(lt)s)
+        | # end of word
+          (?=%(ws)s|\Z)
+        | # em-dash
+          (?<=%(wp)s) (?=-{2,}\w)
+        )
+    )""" % {'wp': r'[\w!"\'&.,?]', 'lt': r'(?:[^\d\W]|[\u0900-\u0dff])',
+            'ws': '[%s]' % re.escape(_WHITESPACE), 'nws': '[^%s]' % re.escape(_WHITESPACE)},
+    re.VERBOSE)
+
+# Distinct (text, width) pairs whose wrapped form is remembered.
+FILL_CACHE_SIZE = 65536
+
+
+def normalize_key(text):
+    """Normalizes a name or title for lookups (NFC + casefold)."""
+    return unicodedata.normalize('NFC', text).casefold()
+
+
+def tokenize(text):
+    """Splits text into normalized search tokens.
+
+    Tokens break on whitespace and punctuation only, never inside a
+    grapheme cluster.
+    """
+    if not isinstance(text, str):
+        return []
+    return [token for token in _TOKEN_RE.findall(normalize_key(text)) if token.strip('_')]
+
+
+def graphemes(text):
+    """Splits text into (approximate) extended grapheme clusters.
+
+    A cluster is a base character followed by any combining marks, joined
+    through ZWJ/ZWNJ where present. That is enough for Tamil, where vowel
+    signs and the pulli attach to the preceding consonant.
+    """
+    clusters = []
+    for char in text:
+        if clusters and (unicodedata.category(char).startswith('M') or char in _JOINERS
+                         or clusters[-1][-1] in _JOINERS):
+            clusters[-1] += char
+        else:
+            clusters.append(char)
+    return clusters
+
+
+@lru_cache(maxsize=None)
+def _char_width(char):
+    category = unicodedata.category(char)
+    if category in ('Mn', 'Me', 'Cf'):
+        return 0
+    return 2 if unicodedata.east_asian_width(char) in ('W', 'F') else 1
+
+
+def display_width(text):
+    """Returns the terminal columns text occupies.
+
+    Non-spacing marks (such as the pulli and the ீ vowel sign) and format
+    characters take no column, wide East Asian characters two, and
+    everything else one, as PrettyTable (via wcwidth) measures cells.
+    """
+    if text.isascii():
+        return len(text)
+    return sum(_char_width(char) for char in text)
+
+
+def wrap(text, width):
+    """Splits text into lines of at most width display columns.
+
+    Lines break as ``textwrap.wrap`` breaks them (plain ASCII text wraps
+    exactly the same), but widths are measured in display columns, and a
+    word longer than a line is cut between grapheme clusters, never inside
+    one, so vowel signs stay on their consonant.
+    """
+    if width <= 0:
+        raise ValueError(f"invalid width {width!r} (must be > 0)")
+    text = text.expandtabs().translate(_WHITESPACE_TRANS)
+    chunks = [chunk for chunk in _WORDSEP_RE.split(text) if chunk]
+    chunks.reverse()
+    lines = []
+    while chunks:
+        line, line_width = [], 0
+        # Whitespace starting any line but the first is dropped.
+        if chunks[-1].strip() == '' and lines:
+            del chunks[-1]
+        while chunks:
+            chunk_width = display_width(chunks[-1])
+            if line_width + chunk_width > width:
+                break
+            line.append(chunks.pop())
+            line_width += chunk_width
+        # A chunk too long for any line fills the rest of this one.
+        if chunks and display_width(chunks[-1]) > width:
+            line.append(_cut_long_word(chunks, width - line_width, not line))
+        if line and line[-1].strip() == '':
+            del line[-1]
+        if line:
+            lines.append(''.join(line))
+    return lines
+
+
+def _cut_long_word(reversed_chunks, space_left, line_is_empty):
+    """Takes off the last chunk the clusters that fit in space_left columns (after
+    its last hyphen there, as textwrap prefers) and returns them."""
+    clusters = graphemes(reversed_chunks[-1])
+    end, used = 0, 0
+    for cluster in clusters:
+        used += display_width(cluster)
+        if used > space_left:
+            break
+        end += 1
+    # Every line takes at least one cluster, even one wider than the line.
+    if end == 0 and line_is_empty:
+        end = 1
+    hyphen = max((pos for pos in range(1, end) if clusters[pos] == '-'), default=0)
+    if hyphen and any(cluster != '-' for cluster in clusters[:hyphen]):
+        end = hyphen + 1
+    reversed_chunks[-1] = ''.join(clusters[end:])
+    if not reversed_chunks[-1]:
+        reversed_chunks.pop()
+    return ''.join(clusters[:end])
+
+
+@lru_cache(maxsize=FILL_CACHE_SIZE)
+def fill(text, width):
+    """Returns text wrapped to width columns as one newline-joined string (memoized)."""
+    return '\n'.join(wrap(text, width))
@@ -0,0 +1,50 @@
+"""Background watcher keeping a loaded library in step with its JSON files.
+
+A ``Watcher`` thread calls ``KaviExtraction.reload()`` every ``interval``
+seconds. Unchanged files cost one ``stat`` each; changed ones are read and
+patched into the library (see ``reload``) while other threads keep
+querying it::
+
+    watcher = Watcher(library, interval=2.0, on_reload=lambda changes: ...)
+    watcher.start()
+    ...
+    watcher.stop()
+
+``tamilkavi serve --watch [SECONDS]`` runs one next to the query server.
+"""
+import sys
+import threading
+
+DEFAULT_INTERVAL = 2.0
+
+
+class Watcher(threading.Thread):
+    def __init__(self, library, interval=DEFAULT_INTERVAL, on_reload=None):
+        super().__init__(name='tamilkavi-watcher', daemon=True)
+        self.library = library
+        self.interval = interval
+        self.on_reload = on_reload
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            self.check()
+
+    def check(self):
+        """Reloads changed files once; returns the changes, or None if reloading failed."""
+        try:
+            changes = self.library.reload()
+        except (Exception, SystemExit) as e:
+            # Keep serving the data already loaded; the next check tries again.
+            print(f"⚠️  Reloading the corpus failed: {e}", file=sys.stderr)
+            return None
+        if changes['full'] or changes['added'] or changes['modified'] or changes['removed']:
+            if self.on_reload is not None:
+                self.on_reload(changes)
+        return changes
+
+    def stop(self, timeout=None):
+        """Stops watching and waits for a running check to finish."""
+        self._stopped.set()
+        if self.is_alive():
+            self.join(timeout)
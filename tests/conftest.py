@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+
+# Keep the compiled corpus cache out of the developer's home directory.
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path_factory, monkeypatch):
+    cache_dir = tmp_path_factory.mktemp("tamilkavi-cache")
+    monkeypatch.setenv("TAMILKAVI_CACHE_DIR", str(cache_dir))
+    return cache_dir
+
+
+SAMPLE_AUTHORS = [
+    {
+        "author": "kavi",
+        "contact": "kavi@example.com",
+        "books": [
+            {
+                "booktitle": "மழை-நாள்",
+                "booktitle_tanglish": "mazhai-naal",
+                "description": "மழைக்கால கவிதைகள்",
+                "category": "Nature",
+                "context": [
+                    {"title": "Mazhai", "line": "மழை பெய்தது மண் மணத்தது", "meaning": "மழை பெய்ததால் மண் வாசனை வந்தது"},
+                    {"title": "Vaanam", "line": "வானம் கருத்தது", "meaning": "மேகங்கள் சூழ்ந்தன"},
+                ],
+            }
+        ],
+    },
+    {
+        "author": "nila",
+        "contact": "nila@example.com",
+        "books": [
+            {
+                "booktitle": "நிலா-பாட்டு",
+                "booktitle_tanglish": "nila-paattu",
+                "description": "இரவுப் பாடல்கள்",
+                "category": "Love",
+                "context": [
+                    {"title": "Mazhai", "line": "நிலவில் மழை தூறல்", "meaning": "நிலா இரவில் மழை"},
+                ],
+            }
+        ],
+    },
+]
+
+
+def write_corpus(directory, authors=None):
+    """Writes one JSON file per author into directory and returns it."""
+    directory.mkdir(parents=True, exist_ok=True)
+    for author in SAMPLE_AUTHORS if authors is None else authors:
+        path = directory / f"{author['author']}.json"
+        path.write_text(json.dumps(author, ensure_ascii=False, indent=4), encoding="utf-8")
+    return directory
+
+
+@pytest.fixture
+def sample_corpus(tmp_path):
+    """A small two-author kavisrc directory."""
+    return write_corpus(tmp_path / "kavisrc")
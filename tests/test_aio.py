@@ -0,0 +1,27 @@
+import asyncio
+
+import pytest
+
+from tamilkavi.aio import AsyncKavi, CorpusLoadError
+
+
+def test_concurrent_queries(sample_corpus):
+    async def run():
+        kavi = await AsyncKavi.load(data_dir=sample_corpus)
+        return await asyncio.gather(
+            kavi.get_titles("Mazhai", author="nila"),
+            kavi.get_book("mazhai-naal"),
+            kavi.search("வானம்"),
+            kavi.list_titles(limit=1),
+        )
+
+    poems, books, results, titles = asyncio.run(run())
+    assert [poem["line"] for poem in poems] == ["நிலவில் மழை தூறல்"]
+    assert books[0]["booktitle_tanglish"] == "mazhai-naal"
+    assert results[0]["title"] == "Vaanam"
+    assert titles == ["Mazhai"] and titles.next_cursor
+
+
+def test_load_failure_raises_instead_of_exiting(tmp_path):
+    with pytest.raises(CorpusLoadError, match="No JSON files found"):
+        asyncio.run(AsyncKavi.load(data_dir=tmp_path))
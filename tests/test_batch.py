@@ -0,0 +1,66 @@
+import io
+import json
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from tamilkavi import batch
+from tamilkavi.storage import JsonBackend
+from tamilkavi.tamilkavipy import KaviExtraction, main
+
+QUERIES = [
+    '{"id": 1, "author": "kavi", "book": "mazhai-naal"}',
+    '{"id": 2, "title": "Mazhai", "author": "nila"}',
+    '',
+    '{"id": 3, "search": "வானம்"}',
+    '{"id": 4, "book": "no-such-book"}',
+    '{"id": 5}',
+    'not json',
+]
+
+
+def run(backend, workers):
+    out = io.StringIO()
+    counts = batch.run_batch(backend, QUERIES, out, workers)
+    return counts, [json.loads(line) for line in out.getvalue().splitlines()]
+
+
+def test_batch_results_carry_status_in_input_order(sample_corpus):
+    counts, results = run(JsonBackend(data_dir=sample_corpus), workers=1)
+    assert [result.get("id") for result in results] == [1, 2, 3, 4, 5, None]
+    assert [result["status"] for result in results] == ["ok", "ok", "ok", "not_found", "error", "error"]
+    assert [len(book["context"]) for book in results[0]["authors"][0]["books"]] == [2]
+    assert results[1]["authors"][0]["books"][0]["context"][0]["line"] == "நிலவில் மழை தூறல்"
+    assert results[2]["results"][0]["title"] == "Vaanam"
+    assert counts["total"] == 6 and counts["ok"] == 3
+
+
+def test_worker_processes_give_the_same_results(sample_corpus):
+    backend = JsonBackend(data_dir=sample_corpus)
+    with patch.object(batch, "CHUNK_SIZE", 2):
+        assert run(backend, workers=3)[1] == run(backend, workers=1)[1]
+
+
+def test_worker_processes_need_a_backend_they_can_reopen(sample_corpus):
+    backend = JsonBackend(KaviExtraction(data_dir=sample_corpus))
+    assert backend.opener() is None
+    with pytest.raises(ValueError):
+        run(backend, workers=2)
+
+
+def test_batch_without_searches_does_not_build_the_search_index(sample_corpus):
+    backend = JsonBackend(data_dir=sample_corpus, use_cache=False)
+    with patch.object(KaviExtraction, "get_search_index", side_effect=AssertionError("search index built")):
+        counts, results = run(backend, workers=1)
+    assert [result["status"] for result in results][:2] == ["ok", "ok"]
+    assert results[2]["status"] == "error" and counts["total"] == 6
+
+
+def test_cli_batch_from_stdin(capsys):
+    stdin = io.StringIO('{"title": "God-Murugan-Song"}\n')
+    with patch.object(sys, "argv", ["tamilkavi", "--batch", "-"]), patch.object(sys, "stdin", stdin):
+        main()
+    captured = capsys.readouterr()
+    assert json.loads(captured.out)["status"] == "ok"
+    assert "queries/s" in captured.err
@@ -0,0 +1,31 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+
+from generate_corpus import generate  # noqa: E402
+from run_benchmarks import bench_memory  # noqa: E402
+from tamilkavi.tamilkavipy import KaviExtraction  # noqa: E402
+
+
+def test_generated_corpus_matches_the_kavisrc_schema(tmp_path):
+    library = KaviExtraction(data_dir=generate(tmp_path / "kavisrc", 1234))
+    poems = [context for author in library.saved_books for book in author["books"] for context in book["context"]]
+    assert len(poems) == 1234
+    assert len(library.saved_books) == 3
+    assert set(poems[0]) == {"title", "line", "meaning"}
+    assert {"booktitle", "booktitle_tanglish", "description", "category"} <= set(library.saved_books[0]["books"][0])
+    # Titles repeat across books, like the real corpus.
+    assert len(library.list_titles()) < len(poems)
+
+
+def test_generation_is_reproducible(tmp_path):
+    first = generate(tmp_path / "a", 60, seed=7)
+    second = generate(tmp_path / "b", 60, seed=7)
+    assert (first / "author00000.json").read_bytes() == (second / "author00000.json").read_bytes()
+
+
+def test_memory_benchmark_measures_the_compact_load(tmp_path):
+    results = bench_memory(generate(tmp_path / "kavisrc", 600))
+    assert results["memory_load_compact"]["retained_bytes"] < results["memory_load_dicts"]["retained_bytes"]
+    assert 0 < results["memory_load_compact"]["retained_ratio"] < 1
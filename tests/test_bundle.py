@@ -0,0 +1,107 @@
+import copy
+import gzip
+import json
+from unittest.mock import patch
+
+import pytest
+
+from conftest import SAMPLE_AUTHORS, write_corpus
+
+from tamilkavi import bundle, cache
+from tamilkavi.tamilkavipy import CorpusLoadError, KaviExtraction
+
+
+def test_validate_author_reports_every_problem():
+    assert bundle.validate_author(SAMPLE_AUTHORS[0]) == []
+
+    broken = copy.deepcopy(SAMPLE_AUTHORS[0])
+    del broken["contact"]
+    broken["books"][0]["category"] = 3
+    broken["books"][0]["context"][1] = {"title": "Vaanam", "line": "வானம்"}
+    assert bundle.validate_author(broken) == [
+        "'contact' is missing or not a string",
+        "books[0].category is missing or not a string",
+        "books[0].context[1].meaning is missing or not a string",
+    ]
+
+
+@pytest.mark.parametrize("name", ["corpus.bundle", "corpus.bundle.gz"])
+def test_bundle_loads_with_its_indexes(sample_corpus, tmp_path, capsys, name):
+    output = tmp_path / name
+    bundle.main(["--data-dir", str(sample_corpus), "--output", str(output)])
+    assert "Bundled 2 authors" in capsys.readouterr().out
+    assert (output.read_bytes()[:2] == b"\x1f\x8b") == name.endswith(".gz")
+
+    library = KaviExtraction(bundle_path=output)
+    original = KaviExtraction(data_dir=sample_corpus)
+    assert library.saved_books == original.saved_books
+    assert library.search_index is not None and library.trigram_index is not None
+    assert library.list_titles() == ["Mazhai", "Vaanam"]
+    assert [hit[0]["author"] for hit in library.query(title="mazhai")] == ["kavi", "nila"]
+    assert library.search("நிலவில்")[0]["author"] == "nila"
+
+
+def test_build_refuses_invalid_files(tmp_path, capsys):
+    broken = dict(SAMPLE_AUTHORS[1])
+    del broken["books"]
+    data_dir = write_corpus(tmp_path / "kavisrc", [SAMPLE_AUTHORS[0], broken])
+
+    with pytest.raises(SystemExit) as excinfo:
+        bundle.main(["--data-dir", str(data_dir), "--output", str(tmp_path / "corpus.bundle")])
+    assert "1 author file(s)" in str(excinfo.value)
+    assert "nila.json" in capsys.readouterr().out
+    assert not (tmp_path / "corpus.bundle").exists()
+
+
+def test_packaged_bundle_replaces_the_json_files(sample_corpus, tmp_path):
+    output = tmp_path / "kavisrc.bundle"
+    bundle.main(["--data-dir", str(sample_corpus), "--output", str(output)])
+
+    with patch.object(bundle, "packaged_bundle", return_value=output), \
+            patch.object(KaviExtraction, "_resolve_data_dir", return_value=sample_corpus):
+        library = KaviExtraction()
+    assert library.bundle_path == output
+    assert [author["author"] for author in library.saved_books] == ["kavi", "nila"]
+
+
+def test_stale_packaged_bundle_falls_back_to_the_json_files(sample_corpus, tmp_path):
+    output = tmp_path / "kavisrc.bundle"
+    bundle.main(["--data-dir", str(sample_corpus), "--output", str(output)])
+    renamed = dict(SAMPLE_AUTHORS[0], author="kavi renamed")
+    (sample_corpus / "kavi.json").write_text(json.dumps(renamed, ensure_ascii=False), encoding="utf-8")
+
+    with patch.object(bundle, "packaged_bundle", return_value=output), \
+            patch.object(KaviExtraction, "_resolve_data_dir", return_value=sample_corpus):
+        library = KaviExtraction()
+    assert library.bundle_path is None
+    assert [author["author"] for author in library.saved_books] == ["kavi renamed", "nila"]
+
+
+def test_packaged_bundle_check_is_remembered_across_runs(sample_corpus, tmp_path):
+    output = tmp_path / "kavisrc.bundle"
+    bundle.main(["--data-dir", str(sample_corpus), "--output", str(output)])
+    # Installing does not keep mtimes: the files look touched but their bytes are the same.
+    for path in sample_corpus.glob("*.json"):
+        path.write_bytes(path.read_bytes())
+
+    with patch.object(bundle, "packaged_bundle", return_value=output), \
+            patch.object(KaviExtraction, "_resolve_data_dir", return_value=sample_corpus):
+        assert KaviExtraction().bundle_path == output
+        with patch.object(cache, "content_hash", side_effect=AssertionError("hashed again")):
+            library = KaviExtraction()
+            assert library.bundle_path == output
+            assert library.reload() == {"added": [], "modified": [], "removed": [], "full": False}
+
+        renamed = dict(SAMPLE_AUTHORS[0], author="kavi renamed")
+        (sample_corpus / "kavi.json").write_text(json.dumps(renamed, ensure_ascii=False), encoding="utf-8")
+        assert library.reload()["full"]
+    assert library.bundle_path is None
+    assert [author["author"] for author in library.saved_books] == ["kavi renamed", "nila"]
+
+
+def test_corrupt_bundle_raises(tmp_path):
+    path = tmp_path / "corpus.bundle.gz"
+    path.write_bytes(gzip.compress(json.dumps({"not": "a pickle"}).encode()))
+
+    with pytest.raises(CorpusLoadError):
+        KaviExtraction(bundle_path=path, exit_on_error=False)
@@ -0,0 +1,67 @@
+import pickle
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from tamilkavi import cache as corpus_cache
+from tamilkavi.tamilkavipy import KaviExtraction, main
+
+
+def test_second_load_comes_from_cache(sample_corpus):
+    first = KaviExtraction(data_dir=sample_corpus)
+    assert not first.loaded_from_cache
+
+    second = KaviExtraction(data_dir=sample_corpus)
+    assert second.loaded_from_cache
+    assert second.saved_books == first.saved_books
+
+
+def test_modified_source_invalidates_cache(sample_corpus):
+    KaviExtraction(data_dir=sample_corpus)
+    source = sample_corpus / "kavi.json"
+    source.write_text(source.read_text(encoding="utf-8").replace("Mazhai", "Puyal"), encoding="utf-8")
+
+    library = KaviExtraction(data_dir=sample_corpus)
+    assert not library.loaded_from_cache
+    assert library.get_titles("Puyal", library.saved_books)
+
+
+def test_touched_source_with_same_content_keeps_cache(sample_corpus):
+    KaviExtraction(data_dir=sample_corpus)
+    source = sample_corpus / "nila.json"
+    source.write_bytes(source.read_bytes())
+
+    assert KaviExtraction(data_dir=sample_corpus).loaded_from_cache
+
+
+def test_title_listing_is_compiled_with_the_cache(sample_corpus):
+    KaviExtraction(data_dir=sample_corpus)
+
+    library = KaviExtraction(data_dir=sample_corpus)
+    assert library.loaded_from_cache
+    with patch("tamilkavi.tamilkavipy._sorted_titles") as sorted_titles:
+        assert library.list_titles() == ["Mazhai", "Vaanam"]
+        assert library.list_titles(limit=1) == ["Mazhai"]
+    sorted_titles.assert_not_called()
+
+
+def test_corrupt_cache_falls_back_to_json(sample_corpus):
+    library = KaviExtraction(data_dir=sample_corpus)
+    cache_file = corpus_cache.cache_file_for(sample_corpus)
+    cache_file.write_bytes(b"not a pickle")
+
+    reloaded = KaviExtraction(data_dir=sample_corpus)
+    assert not reloaded.loaded_from_cache
+    assert reloaded.saved_books == library.saved_books
+    # The fallback rewrites a valid snapshot.
+    with open(cache_file, "rb") as fh:
+        assert pickle.load(fh)["books"] == library.saved_books
+
+
+def test_rebuild_cache_flag(capsys):
+    with patch.object(sys, "argv", ["tamilkavi", "--rebuild-cache"]):
+        with pytest.raises(SystemExit) as e:
+            main()
+    assert e.value.code == 0
+    assert "Corpus cache rebuilt" in capsys.readouterr().out
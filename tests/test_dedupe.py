@@ -0,0 +1,78 @@
+import copy
+import json
+import random
+
+import pytest
+
+from conftest import SAMPLE_AUTHORS, write_corpus
+
+from tamilkavi import dedupe
+from tamilkavi.tamilkavipy import KaviExtraction
+
+ORIGINAL = "மழை பெய்தது மண் மணத்தது மரங்கள் நனைந்தன பறவைகள் பாடின வானம் தெளிந்தது"
+NEAR_COPY = "மழை பெய்தது மண் மணத்தது மரங்கள் நனைந்தன பறவைகள் பாடின வானம் தெளிந்தது இன்று"
+
+
+def near_duplicate_corpus(directory):
+    authors = copy.deepcopy(SAMPLE_AUTHORS)
+    authors[0]["books"][0]["context"][0]["line"] = ORIGINAL
+    authors[1]["books"][0]["context"].append({"title": "Mazhai Naal", "line": NEAR_COPY, "meaning": "மழை"})
+    return write_corpus(directory, authors)
+
+
+def test_shingles_are_word_trigrams():
+    assert dedupe.shingles("a b c d") == {"a b c", "b c d"}
+    assert dedupe.shingles("a b") == {"a b"}
+    assert dedupe.shingles("  ") == set()
+
+
+def test_find_clusters_groups_only_near_duplicates():
+    texts = [ORIGINAL, "வானம் கருத்தது", NEAR_COPY, "", ORIGINAL]
+    assert dedupe.find_clusters(texts) == [[0, 2, 4]]
+    assert dedupe.find_clusters(texts, threshold=1.0) == [[0, 4]]
+
+
+def test_banding_follows_the_threshold():
+    assert dedupe.lsh_params(0.8) == (12, 5)
+    assert dedupe.lsh_params(0.2) == (64, 1)
+    with pytest.raises(ValueError):
+        dedupe.lsh_params(0.01)
+
+
+def test_pairs_just_above_a_low_threshold_are_found():
+    rng = random.Random(7)
+    texts = []
+    for _ in range(100):
+        words = [f"w{rng.randrange(10 ** 9)}" for _ in range(30)]
+        # 20-word lines sharing their first 10 words: Jaccard 8/28 ~ 0.29 over 3-shingles.
+        texts += [" ".join(words[:20]), " ".join(words[:10] + words[20:])]
+    assert round(dedupe.jaccard(dedupe.shingles(texts[0]), dedupe.shingles(texts[1])), 2) == 0.29
+
+    clusters = dedupe.find_clusters(texts, threshold=0.2)
+    assert clusters == [[pos, pos + 1] for pos in range(0, len(texts), 2)]
+
+
+def test_report_names_files_books_and_titles(tmp_path):
+    library = KaviExtraction(data_dir=near_duplicate_corpus(tmp_path / "kavisrc"))
+    rows = list(dedupe.report_rows(library))
+
+    assert [(row["file"], row["author"], row["booktitle_tanglish"], row["title"], row["poem"]) for row in rows] == [
+        ("kavi.json", "kavi", "mazhai-naal", "Mazhai", 1),
+        ("nila.json", "nila", "nila-paattu", "Mazhai Naal", 2),
+    ]
+    assert rows[0]["similarity"] == 1.0 and 0.8 <= rows[1]["similarity"] < 1.0
+    assert {row["cluster"] for row in rows} == {1}
+
+
+def test_report_renders_as_jsonl(tmp_path, capsys):
+    library = KaviExtraction(data_dir=near_duplicate_corpus(tmp_path / "kavisrc"))
+    dedupe.main(library, output_format="jsonl")
+
+    captured = capsys.readouterr()
+    assert [json.loads(line)["title"] for line in captured.out.splitlines()] == ["Mazhai", "Mazhai Naal"]
+    assert "1 group(s)" in captured.err
+
+
+def test_distinct_corpus_has_no_report(sample_corpus, capsys):
+    dedupe.main(KaviExtraction(data_dir=sample_corpus))
+    assert "No near-duplicate poems" in capsys.readouterr().out
@@ -0,0 +1,37 @@
+import sys
+from unittest.mock import patch
+
+from tamilkavi.fuzzy import TrigramIndex, trigrams
+from tamilkavi.tamilkavipy import KaviExtraction, main
+
+
+def test_trigrams_do_not_split_grapheme_clusters():
+    # "கா" is one cluster (consonant + vowel sign), so it stays in one gram slot.
+    assert "முருகா" in trigrams("முருகா")
+    assert trigrams("ab") == {"^^a", "^ab", "ab$"}
+
+
+def test_suggest_ranks_close_titles_first():
+    index = TrigramIndex()
+    for title in ("inbamilla-ithayathilirundhu", "nila-paattu", "mazhai-naal"):
+        index.add(title, "book")
+    index.add("Mazhai", "title")
+
+    assert index.suggest("inbamila-ithayathilirunthu")[0][0] == "inbamilla-ithayathilirundhu"
+    assert [title for title, _ in index.suggest("mazhai", kind="title")] == ["Mazhai"]
+    assert index.suggest("zzzz") == []
+
+
+def test_library_suggest_covers_tamil_titles(sample_corpus):
+    library = KaviExtraction(data_dir=sample_corpus)
+    assert library.suggest("மழை நாள்", kind="book")[0][0] == "மழை-நாள்"
+    assert library.suggest("vanam", kind="title")[0][0] == "Vaanam"
+
+
+def test_cli_fuzzy_prints_suggestions(capsys):
+    with patch.object(sys, "argv", ["tamilkavi", "-b", "inbamila-ithayathilirunthu", "--fuzzy"]):
+        main()
+    output = capsys.readouterr().out
+    assert "⚠️  No results found." in output
+    assert "💡 Did you mean:" in output
+    assert "- inbamilla-ithayathilirundhu" in output
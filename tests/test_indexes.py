@@ -0,0 +1,68 @@
+import copy
+import unicodedata
+
+from tamilkavi.tamilkavipy import KaviExtraction
+
+
+def test_lookups_are_case_and_normalization_insensitive(sample_corpus):
+    library = KaviExtraction(data_dir=sample_corpus)
+
+    assert [a["author"] for a in library.get_authors("KAVI", library.saved_books)] == ["kavi"]
+    assert [b["booktitle"] for b in library.get_book("Mazhai-Naal", library.saved_books)] == ["மழை-நாள்"]
+    assert [b["booktitle_tanglish"] for b in library.get_book("நிலா-பாட்டு", library.saved_books)] == ["nila-paattu"]
+    assert sorted(p["line"] for p in library.get_titles("mazhai", library.saved_books)) == [
+        "நிலவில் மழை தூறல்",
+        "மழை பெய்தது மண் மணத்தது",
+    ]
+
+
+def test_index_lookups_respect_filtered_data(sample_corpus):
+    library = KaviExtraction(data_dir=sample_corpus)
+    nila = library.get_authors("nila", library.saved_books)
+
+    assert library.get_titles("Mazhai", nila) == [nila[0]["books"][0]["context"][0]]
+    assert library.get_book("mazhai-naal", nila) == []
+
+    books = library.get_all_books(library.saved_books)
+    forward = library.get_titles("Mazhai", books)
+    # Results follow the order of the data passed in, like the plain scan did.
+    assert library.get_titles("Mazhai", books[::-1]) == forward[::-1]
+
+
+def test_foreign_data_falls_back_to_scan(sample_corpus):
+    library = KaviExtraction(data_dir=sample_corpus)
+    foreign = copy.deepcopy(library.saved_books)
+
+    kavi = next(author for author in foreign if author["author"] == "kavi")
+    nila = next(author for author in foreign if author["author"] == "nila")
+
+    assert library.get_authors("kavi", foreign)[0] is kavi
+    assert library.get_book("nila-paattu", foreign)[0] is nila["books"][0]
+    assert library.get_titles("vaanam", foreign)[0] is kavi["books"][0]["context"][1]
+
+
+def test_scan_normalizes_like_the_indexes(sample_corpus):
+    library = KaviExtraction(data_dir=sample_corpus)
+    foreign = copy.deepcopy(library.saved_books)
+    # Decomposed Tamil and ß/ss only match through NFC + casefold, as index keys do.
+    foreign[0]["author"] = "Straße"
+    foreign[0]["books"][0]["booktitle"] = unicodedata.normalize("NFD", "கோயில்")
+    assert foreign[0]["books"][0]["booktitle"] != "கோயில்"
+
+    assert library.get_authors("STRASSE", foreign) == [foreign[0]]
+    assert library.get_book("கோயில்", foreign) == [foreign[0]["books"][0]]
+    assert [p["title"] for p in library.get_titles("MAZHAI", foreign[0]["books"])] == ["Mazhai"]
+
+
+def test_query_combines_filters_and_keeps_provenance(sample_corpus):
+    library = KaviExtraction(data_dir=sample_corpus)
+
+    hits = library.query(title="MAZHAI")
+    assert [(author["author"], book["booktitle_tanglish"], poem["line"]) for author, book, poem in hits] == [
+        ("kavi", "mazhai-naal", "மழை பெய்தது மண் மணத்தது"),
+        ("nila", "nila-paattu", "நிலவில் மழை தூறல்"),
+    ]
+    assert [hit[0]["author"] for hit in library.query(author="nila", title="Mazhai")] == ["nila"]
+    assert library.query(author="nila", book="mazhai-naal") == []
+    assert [book["booktitle"] for _, book in library.query(book="நிலா-பாட்டு")] == ["நிலா-பாட்டு"]
+    assert library.query() == [(author,) for author in library.saved_books]
@@ -0,0 +1,53 @@
+import sys
+from unittest.mock import patch
+
+from tamilkavi.tamilkavipy import KaviExtraction, main
+
+
+def test_first_lazy_open_builds_manifest(sample_corpus):
+    library = KaviExtraction(data_dir=sample_corpus, lazy=True)
+
+    assert library.fully_loaded
+    assert sorted(library.list_authors()) == ["kavi", "nila"]
+    assert library.list_titles() == ["Mazhai", "Vaanam"]
+
+
+def test_lazy_open_reads_only_needed_files(sample_corpus):
+    KaviExtraction(data_dir=sample_corpus, lazy=True)
+
+    library = KaviExtraction(data_dir=sample_corpus, lazy=True)
+    assert library.saved_books == []
+    assert sorted(library.list_authors()) == ["kavi", "nila"]
+    assert sorted(book["booktitle_tanglish"] for book in library.list_books()) == ["mazhai-naal", "nila-paattu"]
+
+    library.load_for_query(author="NILA")
+    assert library.source_files == ["nila.json"]
+    assert library.get_authors("nila", library.saved_books)[0]["contact"] == "nila@example.com"
+
+    library.load_for_query(title="Vaanam", book="mazhai-naal")
+    assert sorted(library.source_files) == ["kavi.json", "nila.json"]
+
+
+def test_query_without_matches_opens_no_files(sample_corpus):
+    KaviExtraction(data_dir=sample_corpus, lazy=True)
+
+    library = KaviExtraction(data_dir=sample_corpus, lazy=True)
+    library.load_for_query(author="kavi", book="nila-paattu")
+    assert library.saved_books == []
+
+
+def test_changed_source_rebuilds_manifest(sample_corpus):
+    KaviExtraction(data_dir=sample_corpus, lazy=True)
+    source = sample_corpus / "nila.json"
+    source.write_text(source.read_text(encoding="utf-8").replace("Mazhai", "Iravu"), encoding="utf-8")
+
+    library = KaviExtraction(data_dir=sample_corpus, lazy=True)
+    assert library.fully_loaded
+    assert library.list_titles() == ["Iravu", "Mazhai", "Vaanam"]
+
+
+def test_cli_uses_manifest_on_second_run(capsys):
+    for _ in range(2):
+        with patch.object(sys, "argv", ["tamilkavi", "-a", "jothi"]):
+            main()
+        assert "✅ Author / Ezhuthalar: jothi" in capsys.readouterr().out
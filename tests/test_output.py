@@ -0,0 +1,87 @@
+import io
+import json
+import random
+import string
+import sys
+import textwrap
+from unittest.mock import patch
+
+from tamilkavi import output
+from tamilkavi.tamilkavipy import main, wrap_text
+from tamilkavi.text import display_width, fill, wrap
+
+from conftest import SAMPLE_AUTHORS
+
+POEMS = SAMPLE_AUTHORS[0]["books"][0]["context"]
+
+
+def test_jsonl_streams_one_object_per_row():
+    out = io.StringIO()
+    count = output.render(output.kavithai_rows(iter(POEMS)), output.KAVITHAI_COLUMNS, "jsonl", out)
+    lines = out.getvalue().splitlines()
+    assert count == len(lines) == 2
+    assert json.loads(lines[0]) == {"sno": 1, **POEMS[0]}
+
+
+def test_csv_and_tsv_write_a_header_then_rows():
+    for output_format, delimiter in (("csv", ","), ("tsv", "\t")):
+        out = io.StringIO()
+        output.render(output.book_rows(SAMPLE_AUTHORS[0]["books"]), output.BOOK_COLUMNS, output_format, out)
+        header, row = out.getvalue().splitlines()
+        assert header.split(delimiter) == ["sno", "booktitle_tanglish", "booktitle", "category"]
+        assert row.split(delimiter) == ["1", "mazhai-naal", "மழை-நாள்", "Nature"]
+
+
+def test_table_is_written_in_pages():
+    def rows():
+        for index in range(1, 6):
+            yield {"sno": index, "title": f"t{index}", "line": "l", "meaning": "m"}
+
+    out = io.StringIO()
+    assert output.render(rows(), output.KAVITHAI_COLUMNS, "table", out, page_size=2) == 5
+    # Three pages, each a complete table with its own header.
+    assert out.getvalue().count("Kavithai Title") == 3
+
+
+def test_cli_jsonl_keeps_notices_off_stdout(capsys):
+    with patch.object(sys, "argv", ["tamilkavi", "-b", "--format", "jsonl"]):
+        main()
+    captured = capsys.readouterr()
+    books = [json.loads(line) for line in captured.out.splitlines()]
+    assert books and all("booktitle_tanglish" in book for book in books)
+    assert "📚 Available Books / Irrukum Puthagangal:" in captured.err
+
+
+def test_display_width_skips_non_spacing_marks():
+    assert display_width("கா") == 2  # the ா sign takes a column
+    assert display_width("கீ") == 1
+    assert display_width("க்") == 1
+    assert display_width("中文") == 4
+
+
+def test_wrap_measures_columns_and_keeps_clusters_whole():
+    assert wrap("மழை பெய்தது மண் மணத்தது", 10) == ["மழை பெய்தது", "மண் மணத்தது"]
+    lines = wrap("முருகாமுருகாமுருகாமுருகா கந்தா", 10)
+    assert all(display_width(line) <= 10 for line in lines)
+    assert "".join(lines).replace(" ", "") == "முருகாமுருகாமுருகாமுருகாகந்தா"
+    assert not any(line[0] in "ாுொ்" for line in lines)
+    # Plain text wraps as textwrap would.
+    assert wrap("inbamilla-ithayathilirundhu is a book", 10) == ["inbamilla-", "ithayathil", "irundhu is", "a book"]
+
+
+def test_ascii_wraps_exactly_like_textwrap():
+    rng = random.Random(3)
+    alphabet = string.ascii_letters + string.digits + "     --,.!?'\t"
+    for _ in range(2000):
+        text = " ".join("".join(rng.choice(alphabet) for _ in range(rng.choice([1, 2, 4, 9, 25])))
+                        for _ in range(rng.randrange(12)))
+        width = rng.randrange(1, 20)
+        assert wrap(text, width) == textwrap.wrap(text, width), (text, width)
+
+
+def test_wrap_text_is_memoized():
+    fill.cache_clear()
+    wrap_text("மழை பெய்தது மண் மணத்தது", 10)
+    wrap_text("மழை பெய்தது மண் மணத்தது", 10)
+    assert fill.cache_info().hits == 1
+    assert wrap_text(None) is None
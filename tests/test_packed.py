@@ -0,0 +1,66 @@
+import pytest
+
+from tamilkavi import packed
+from tamilkavi.tamilkavipy import KaviExtraction
+
+
+def test_packed_corpus_round_trips_the_json_sources(sample_corpus, tmp_path):
+    library = KaviExtraction(data_dir=sample_corpus)
+    path = tmp_path / "corpus.pack"
+    packed.write_packed(library.saved_books, path)
+
+    mapped = KaviExtraction(packed_path=path)
+    assert mapped.saved_books == library.saved_books
+
+    poem = mapped.get_titles("vaanam", mapped.saved_books)[0]
+    assert isinstance(poem, packed.PackedPoem)
+    assert poem["meaning"] == "மேகங்கள் சூழ்ந்தன"
+    assert poem.author["author"] == "kavi"
+    mapped.packed.close()
+
+
+def test_reload_remaps_only_a_replaced_file_and_keeps_old_views_readable(sample_corpus, tmp_path):
+    path = tmp_path / "corpus.pack"
+    library = KaviExtraction(data_dir=sample_corpus)
+    packed.write_packed(library.saved_books, path)
+    mapped = KaviExtraction(packed_path=path)
+    previous = mapped.packed
+    poem = mapped.get_titles("vaanam", mapped.saved_books)[0]
+
+    assert mapped.reload() == {"added": [], "modified": [], "removed": [], "full": False}
+    assert mapped.packed is previous
+
+    packed.write_packed(library.saved_books[1:], path)
+    assert mapped.reload()["full"]
+    assert mapped.packed is not previous
+    # A poem handed out before the reload still reads from the previous mapping.
+    assert poem["line"] == "வானம் கருத்தது"
+    assert mapped.get_titles("vaanam", mapped.saved_books) == []
+
+
+def test_absent_keys_stay_absent(tmp_path):
+    path = tmp_path / "corpus.pack"
+    packed.write_packed([{"author": "a", "books": [{"booktitle": "b", "context": [{"title": "t"}]}]}], path)
+
+    corpus = packed.PackedCorpus(path)
+    author = corpus.authors()[0]
+    book = author["books"][0]
+    assert "contact" not in author
+    assert book.get("category", "N/A") == "N/A"
+    assert dict(book["context"][0]) == {"title": "t"}
+    corpus.close()
+
+
+def test_rejects_files_that_are_not_packed(tmp_path):
+    path = tmp_path / "corpus.pack"
+    path.write_bytes(b"{}" * 40)
+    with pytest.raises(ValueError):
+        packed.PackedCorpus(path)
+
+
+def test_pack_command(sample_corpus, tmp_path, capsys):
+    path = tmp_path / "corpus.pack"
+    packed.main([str(path), str(sample_corpus)])
+
+    assert "Packed 2 authors" in capsys.readouterr().out
+    assert packed.PackedCorpus(path).poem_count == 3
@@ -0,0 +1,95 @@
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from tamilkavi import paging
+from tamilkavi.tamilkavipy import KaviExtraction, _query_scope, main
+
+
+def test_cursor_resumes_where_the_page_ended():
+    items = list(range(10))
+    first = paging.paginate(items, "numbers", limit=4)
+    assert first == [0, 1, 2, 3] and first.total == 10
+    second = paging.paginate(items, "numbers", limit=4, cursor=first.next_cursor)
+    assert second == [4, 5, 6, 7] and second.offset == 4
+    last = paging.paginate(items, "numbers", limit=4, cursor=second.next_cursor)
+    assert last == [8, 9] and last.next_cursor is None
+
+
+def test_iterables_are_only_read_to_the_end_of_the_page():
+    consumed = []
+
+    def numbers():
+        for number in range(100):
+            consumed.append(number)
+            yield number
+
+    page = paging.paginate(numbers(), "numbers", limit=3, offset=5)
+    assert page == [5, 6, 7] and page.next_cursor is not None
+    assert len(consumed) == 9
+
+
+def test_cursor_from_another_query_is_rejected():
+    cursor = paging.encode_cursor("titles", 5)
+    with pytest.raises(ValueError):
+        paging.decode_cursor(cursor, "books")
+    with pytest.raises(ValueError):
+        paging.decode_cursor("not-a-cursor", "titles")
+
+
+@pytest.mark.parametrize("limit", [0, -1])
+def test_limits_below_one_are_rejected(limit):
+    with pytest.raises(ValueError):
+        paging.paginate(list(range(10)), "numbers", limit=limit)
+
+
+def test_library_listings_and_title_filter_page(sample_corpus):
+    library = KaviExtraction(data_dir=sample_corpus)
+    assert library.list_titles() == ["Mazhai", "Vaanam"]
+    assert library.list_titles(limit=1, offset=1) == ["Vaanam"]
+
+    books = library.get_all_books(library.saved_books, limit=1)
+    assert [book["booktitle_tanglish"] for book in books] == ["mazhai-naal"]
+    books = library.get_all_books(library.saved_books, limit=1, cursor=books.next_cursor)
+    assert [book["booktitle_tanglish"] for book in books] == ["nila-paattu"]
+
+    poems = library.get_titles("mazhai", library.saved_books, limit=1)
+    assert poems[0]["line"] == "மழை பெய்தது மண் மணத்தது"
+    poems = library.get_titles("mazhai", library.saved_books, cursor=poems.next_cursor)
+    assert poems[0]["line"] == "நிலவில் மழை தூறல்" and poems.next_cursor is None
+
+
+def test_cursors_are_bound_to_the_authors_and_books_queried(sample_corpus):
+    library = KaviExtraction(data_dir=sample_corpus)
+    kavi = library.get_authors("kavi", library.saved_books)
+    nila = library.get_authors("nila", library.saved_books)
+
+    page = library.get_titles("mazhai", kavi + nila, limit=1)
+    assert library.get_titles("mazhai", list(kavi + nila), cursor=page.next_cursor)[0]["line"] == "நிலவில் மழை தூறல்"
+    for other in (nila + kavi, kavi, library.saved_books):
+        with pytest.raises(ValueError):
+            library.get_titles("mazhai", other, cursor=page.next_cursor)
+
+    poems = [context for author in kavi + nila for book in author["books"] for context in book["context"]]
+    assert library.get_titles("mazhai", poems, cursor=page.next_cursor)[0]["line"] == "நிலவில் மழை தூறல்"
+    copies = [dict(poem) for poem in poems]
+    page = library.get_titles("mazhai", copies, limit=1)
+    assert library.get_titles("mazhai", copies, cursor=page.next_cursor)[0]["line"] == "நிலவில் மழை தூறல்"
+    with pytest.raises(ValueError):
+        library.get_titles("mazhai", copies[:1], cursor=page.next_cursor)
+
+    assert _query_scope("title", "Mazhai") == _query_scope("title", "MAZHAI")
+    assert _query_scope("title", "Mazhai", author="kavi") != _query_scope("title", "Mazhai", author="nila")
+    assert _query_scope("search", "மழை", book="mazhai-naal") != _query_scope("search", "மழை")
+
+
+def test_cli_prints_the_next_cursor(capsys):
+    with patch.object(sys, "argv", ["tamilkavi", "-t", "--limit", "2"]):
+        main()
+    first = capsys.readouterr().out
+    cursor = first.split("--cursor ")[1].split()[0]
+
+    with patch.object(sys, "argv", ["tamilkavi", "-t", "--limit", "2", "--cursor", cursor]):
+        main()
+    assert "\n3. " in capsys.readouterr().out
@@ -0,0 +1,36 @@
+import pytest
+
+from conftest import SAMPLE_AUTHORS, write_corpus
+from tamilkavi.tamilkavipy import KaviExtraction
+
+
+@pytest.fixture
+def many_files(tmp_path):
+    authors = []
+    for number in range(12):
+        author = dict(SAMPLE_AUTHORS[number % 2])
+        author["author"] = f"kavi{number:02d}"
+        authors.append(author)
+    directory = write_corpus(tmp_path / "kavisrc", authors)
+    (directory / "broken.json").write_text("{not json", encoding="utf-8")
+    (directory / "list.json").write_text("[]", encoding="utf-8")
+    return directory
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_pooled_load_merges_in_file_order(many_files, executor, capsys):
+    sequential = KaviExtraction(data_dir=many_files, use_cache=False)
+    pooled = KaviExtraction(data_dir=many_files, use_cache=False, load_workers=4, load_executor=executor)
+
+    assert [a["author"] for a in pooled.saved_books] == [f"kavi{n:02d}" for n in range(12)]
+    assert pooled.saved_books == sequential.saved_books
+    assert pooled.source_files == sequential.source_files
+
+
+def test_load_warnings_are_reported_together(many_files, capsys):
+    KaviExtraction(data_dir=many_files, use_cache=False, load_workers=3)
+    lines = capsys.readouterr().out.splitlines()
+
+    assert lines[0] == "⚠️  2 file(s) could not be loaded:"
+    assert lines[1].startswith("   - Error decoding JSON from broken.json")
+    assert lines[2] == "   - Skipping list.json: Does not contain top-level 'author' key or is not a dictionary."
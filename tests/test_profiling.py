@@ -0,0 +1,50 @@
+import sys
+import time
+from unittest.mock import patch
+
+from tamilkavi import profiling
+from tamilkavi.profiling import Profiler
+from tamilkavi.tamilkavipy import KaviExtraction, main
+
+
+def test_nested_phase_time_is_not_counted_twice():
+    profiler = Profiler(trace_memory=False)
+    with profiler.phase("filter"):
+        with profiler.phase("index"):
+            time.sleep(0.05)
+    counters = profiler.counters()
+    assert counters["index"]["seconds"] >= 0.05
+    assert counters["filter"]["seconds"] < 0.05
+
+
+def test_library_reports_phases_to_the_host(sample_corpus):
+    seen = []
+    profiler = Profiler(on_phase=lambda name, seconds, peak_bytes: seen.append(name)).start()
+    try:
+        library = KaviExtraction(data_dir=sample_corpus, profiler=profiler)
+        library.get_titles("Mazhai", library.saved_books)
+    finally:
+        profiler.stop()
+    counters = profiler.counters()
+    assert {"load", "index", "filter"} <= set(counters)
+    assert counters["load"]["peak_bytes"] > 0
+    assert seen[-1] == "filter"
+
+
+def test_cli_profile_report_goes_to_stderr(capsys, monkeypatch):
+    monkeypatch.setenv("TAMILKAVI_PROFILE", "1")
+    with patch.object(sys, "argv", ["tamilkavi", "-b"]):
+        main()
+    captured = capsys.readouterr()
+    assert "⏱️  Profile" in captured.err and "render" in captured.err
+    assert "Profile" not in captured.out
+
+
+def test_profile_env_values_that_mean_off(capsys, monkeypatch):
+    assert [profiling.env_enabled(value) for value in (None, "", "0", "false", "No", " off ")] == [False] * 6
+    assert profiling.env_enabled("1") and profiling.env_enabled("yes")
+
+    monkeypatch.setenv("TAMILKAVI_PROFILE", "0")
+    with patch.object(sys, "argv", ["tamilkavi", "-b"]):
+        main()
+    assert "Profile" not in capsys.readouterr().err
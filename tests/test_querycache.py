@@ -0,0 +1,92 @@
+import copy
+import json
+import os
+import threading
+
+from conftest import SAMPLE_AUTHORS
+
+from tamilkavi.querycache import QueryCache
+from tamilkavi.tamilkavipy import KaviExtraction
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_evicts_least_recently_used_and_counts_hits():
+    cache = QueryCache(maxsize=2)
+    cache.get_or_compute('a', lambda: 1)
+    cache.get_or_compute('b', lambda: 2)
+    assert cache.get_or_compute('a', lambda: 'recomputed') == 1
+    cache.get_or_compute('c', lambda: 3)
+
+    assert cache.get_or_compute('b', lambda: 'recomputed') == 'recomputed'
+    assert cache.stats() == {'hits': 1, 'misses': 4, 'size': 2, 'maxsize': 2, 'ttl': None}
+
+
+def test_results_expire_after_ttl():
+    clock = FakeClock()
+    cache = QueryCache(ttl=10, clock=clock)
+    cache.get_or_compute('a', lambda: 1)
+    clock.now = 9
+    assert cache.get_or_compute('a', lambda: 2) == 1
+    clock.now = 11
+    assert cache.get_or_compute('a', lambda: 2) == 2
+
+
+def test_results_computed_across_a_clear_are_not_stored():
+    cache = QueryCache()
+
+    def compute():
+        cache.clear()
+        return 'stale'
+
+    assert cache.get_or_compute('a', compute) == 'stale'
+    assert len(cache) == 0
+
+
+def test_subset_is_cached_by_normalized_query(sample_corpus):
+    library = KaviExtraction(data_dir=sample_corpus)
+
+    first = library.subset(author="kavi", title="Mazhai")
+    assert library.subset(author="KAVI", title="mazhai") is first
+    assert library.query_cache.hits == 1 and library.query_cache.misses == 1
+    assert KaviExtraction(data_dir=sample_corpus, query_cache_size=0).query_cache is None
+
+
+def test_reload_invalidates_cached_results(sample_corpus):
+    library = KaviExtraction(data_dir=sample_corpus)
+    assert library.subset(title="Puyal") == []
+
+    changed = copy.deepcopy(SAMPLE_AUTHORS[0])
+    changed["books"][0]["context"][0]["title"] = "Puyal"
+    path = sample_corpus / "kavi.json"
+    mtime = path.stat().st_mtime_ns
+    path.write_text(json.dumps(changed, ensure_ascii=False), encoding="utf-8")
+    os.utime(path, ns=(mtime, mtime + 1_000_000_000))
+    library.reload()
+
+    assert [author["author"] for author in library.subset(title="Puyal")] == ["kavi"]
+
+
+def test_concurrent_readers_share_the_cache(sample_corpus):
+    library = KaviExtraction(data_dir=sample_corpus)
+    expected = library.subset(book="nila-paattu")
+    results = []
+
+    def query():
+        for _ in range(200):
+            results.append(library.subset(book="nila-paattu"))
+
+    threads = [threading.Thread(target=query) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert all(result is expected for result in results)
+    assert library.query_cache.hits == 800
@@ -0,0 +1,67 @@
+import json
+import sys
+import tracemalloc
+
+from tamilkavi import records
+from tamilkavi.tamilkavipy import KaviExtraction
+
+
+def test_records_behave_like_the_source_dicts(sample_corpus):
+    plain = KaviExtraction(data_dir=sample_corpus, use_cache=False)
+    compact = KaviExtraction(data_dir=sample_corpus, compact=True)
+
+    assert compact.saved_books == plain.saved_books
+    assert [author.to_dict() for author in compact.saved_books] == plain.saved_books
+
+    poem = compact.get_titles("vaanam", compact.saved_books)[0]
+    assert isinstance(poem, records.Poem)
+    assert poem["line"] == "வானம் கருத்தது"
+    assert poem.get("missing", "N/A") == "N/A"
+    assert poem.author.get("author") == "kavi"
+    assert poem.book.author is poem.author
+    assert compact.get_book("nila-paattu", compact.saved_books)[0].get("category") == "Love"
+
+
+def test_compact_load_keeps_keys_in_any_order(tmp_path):
+    (tmp_path / "x.json").write_text(json.dumps({"author": "x", "books": [{
+        "context": [{"title": "T", "line": "l", "meaning": "m", "note": 1}],
+        "booktitle": "B", "booktitle_tanglish": "b", "category": "c"}], "contact": "x@y"}), encoding="utf-8")
+    plain = KaviExtraction(data_dir=tmp_path, use_cache=False)
+    compact = KaviExtraction(data_dir=tmp_path, compact=True)
+
+    assert [author.to_dict() for author in compact.saved_books] == plain.saved_books
+    assert compact.get_book("b", compact.saved_books)[0].get("category") == "c"
+
+
+def test_records_have_no_instance_dict_and_intern_strings():
+    author = records.from_dict({"author": "".join(["ka", "vi"]), "books": [
+        {"booktitle": "b", "category": "".join(["Lo", "ve"]), "context": [{"title": "t", "line": "l", "meaning": "m", "note": 1}]},
+    ]})
+    book = author["books"][0]
+    poem = book["context"][0]
+
+    assert not hasattr(poem, "__dict__")
+    assert author["author"] is sys.intern("kavi")
+    assert book.category is sys.intern("Love")
+    # Unknown keys survive the round trip.
+    assert poem["note"] == 1 and "note" in poem
+    assert "description" not in book
+
+
+def test_records_use_less_memory_than_dicts():
+    corpus = json.dumps([{"author": f"a{a}", "contact": "c", "books": [{
+        "booktitle": f"b{b}", "booktitle_tanglish": f"b{b}", "description": "d", "category": "Love",
+        "context": [{"title": f"t{i % 10}", "line": f"l{i}", "meaning": f"m{i}"} for i in range(100)],
+    } for b in range(10)]} for a in range(5)])
+
+    def retained(build):
+        tracemalloc.start()
+        try:
+            kept = build()
+            return tracemalloc.get_traced_memory()[0], kept
+        finally:
+            tracemalloc.stop()
+
+    dict_bytes, _ = retained(lambda: json.loads(corpus))
+    record_bytes, _ = retained(lambda: [records.from_dict(a) for a in json.loads(corpus)])
+    assert record_bytes < dict_bytes * 0.8
@@ -0,0 +1,154 @@
+import copy
+import json
+import os
+
+from conftest import SAMPLE_AUTHORS, write_corpus
+
+from tamilkavi.tamilkavipy import KaviExtraction
+from tamilkavi.watch import Watcher
+
+
+def rewrite(path, author):
+    # Bump the mtime explicitly so the change is seen on coarse-grained filesystems.
+    stat = path.stat()
+    path.write_text(json.dumps(author, ensure_ascii=False), encoding="utf-8")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def fresh_indexes(sample_dir):
+    library = KaviExtraction(data_dir=sample_dir, use_cache=False)
+    return library.author_index, library.book_index, library.title_index
+
+
+def assert_matches_full_load(library, sample_dir):
+    for patched, rebuilt in zip((library.author_index, library.book_index, library.title_index), fresh_indexes(sample_dir)):
+        assert sorted(patched) == sorted(rebuilt)
+        for key in rebuilt:
+            assert [[part.get('author', part.get('title', part.get('booktitle'))) for part in hit] for hit in patched[key]] == \
+                   [[part.get('author', part.get('title', part.get('booktitle'))) for part in hit] for hit in rebuilt[key]]
+
+
+def test_reload_without_changes_reads_nothing(sample_corpus):
+    library = KaviExtraction(data_dir=sample_corpus)
+    books = library.saved_books
+
+    changes = library.reload()
+
+    assert changes == {'added': [], 'modified': [], 'removed': [], 'full': False}
+    assert library.saved_books is books
+
+
+def test_reload_patches_modified_added_and_removed_files(sample_corpus):
+    library = KaviExtraction(data_dir=sample_corpus)
+    kavi_before = library.get_authors("kavi", library.saved_books)[0]
+    nila = library.get_authors("nila", library.saved_books)[0]
+
+    changed = copy.deepcopy(SAMPLE_AUTHORS[0])
+    changed["books"][0]["context"][0]["title"] = "Puyal"
+    rewrite(sample_corpus / "kavi.json", changed)
+    (sample_corpus / "nila.json").unlink()
+    write_corpus(sample_corpus, [dict(SAMPLE_AUTHORS[1], author="aruvi")])
+
+    changes = library.reload()
+
+    assert changes == {'added': ['aruvi.json'], 'modified': ['kavi.json'], 'removed': ['nila.json'], 'full': False}
+    assert [author['author'] for author in library.saved_books] == ["aruvi", "kavi"]
+    assert library.get_authors("nila", library.saved_books) == []
+    assert library.get_authors("kavi", library.saved_books)[0] is not kavi_before
+    assert [poem['title'] for poem in library.get_titles("Puyal", library.saved_books)] == ["Puyal"]
+    assert len(library.get_titles("Mazhai", library.saved_books)) == 1
+    assert id(nila) not in library._known_ids[0]
+    assert_matches_full_load(library, sample_corpus)
+
+
+def test_reload_keeps_old_data_for_a_broken_file_and_updates_the_cache(sample_corpus, capsys):
+    library = KaviExtraction(data_dir=sample_corpus)
+    library.get_search_index()
+    path = sample_corpus / "nila.json"
+    stat = path.stat()
+    path.write_text("{not json", encoding="utf-8")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    rewrite(sample_corpus / "kavi.json", dict(SAMPLE_AUTHORS[0], contact="new@example.com"))
+
+    changes = library.reload()
+
+    assert changes['modified'] == ["kavi.json", "nila.json"]
+    assert "could not be loaded" in capsys.readouterr().out
+    assert [author['author'] for author in library.saved_books] == ["kavi", "nila"]
+    assert library.saved_books[0]['contact'] == "new@example.com"
+    assert library.search("நிலவில்")
+    # The rewritten cache holds the reloaded author, and the broken file still counts as changed.
+    cached = KaviExtraction(data_dir=sample_corpus)
+    assert cached.loaded_from_cache is False
+    rewrite(path, SAMPLE_AUTHORS[1])
+    assert library.reload()['modified'] == ["nila.json"]
+    assert KaviExtraction(data_dir=sample_corpus).loaded_from_cache is True
+
+
+def test_reload_of_a_lazy_library_reopens_the_manifest(sample_corpus):
+    KaviExtraction(data_dir=sample_corpus, lazy=True)
+    library = KaviExtraction(data_dir=sample_corpus, lazy=True)
+    write_corpus(sample_corpus, [dict(SAMPLE_AUTHORS[1], author="aruvi")])
+
+    changes = library.reload()
+
+    assert changes['full'] is True
+    assert "aruvi" in library.list_authors()
+
+
+def test_watcher_reports_changes(sample_corpus):
+    library = KaviExtraction(data_dir=sample_corpus)
+    seen = []
+    watcher = Watcher(library, interval=60, on_reload=seen.append)
+
+    assert watcher.check()['modified'] == []
+    write_corpus(sample_corpus, [dict(SAMPLE_AUTHORS[1], author="aruvi")])
+    watcher.check()
+
+    assert [changes['added'] for changes in seen] == [["aruvi.json"]]
+    watcher.start()
+    watcher.stop(timeout=5)
+    assert not watcher.is_alive()
+
+
+def test_reload_during_search_keeps_results_consistent(sample_corpus):
+    library = KaviExtraction(data_dir=sample_corpus)
+    index = library.get_search_index()
+    search = index.search
+
+    def search_then_reload(query):
+        hits = search(query)
+        (sample_corpus / "kavi.json").unlink()
+        library.reload()
+        return hits
+
+    index.search = search_then_reload
+    results = library.search("மழை")
+
+    assert {(result["author"], result["title"]) for result in results} == {("kavi", "Mazhai"), ("nila", "Mazhai")}
+    assert [result["author"] for result in library.search("மழை")] == ["nila"]
+
+
+def test_reload_patches_the_search_and_title_indexes(sample_corpus):
+    library = KaviExtraction(data_dir=sample_corpus)
+    kavi_posting = library.get_search_index().postings["வானம்"]
+    library.get_trigram_index()
+    library.list_titles()
+
+    changed = copy.deepcopy(SAMPLE_AUTHORS[1])
+    changed["books"][0]["context"][0].update(title="Puyal", line="நிலவில் புயல்")
+    rewrite(sample_corpus / "nila.json", changed)
+    aruvi = copy.deepcopy(SAMPLE_AUTHORS[1])
+    aruvi["author"] = "aruvi"
+    aruvi["books"][0]["context"] = [{"title": "Aruvi", "line": "அருவி கொட்டியது", "meaning": "மழை நீர்"}]
+    write_corpus(sample_corpus, [aruvi])
+    library.reload()
+
+    # The unchanged author's postings are shared with the previous index, not rebuilt.
+    assert library.search_index.postings["வானம்"] is kavi_posting
+    rebuilt = KaviExtraction(data_dir=sample_corpus, use_cache=False)
+    for query in ["மழை", "புயல்", "நிலவில்", "வானம் தூறல்", "அருவி"]:
+        assert library.search(query) == rebuilt.search(query)
+    for text in ["Puyl", "Mazhi", "nila-patu", "Aruv"]:
+        assert library.suggest(text) == rebuilt.suggest(text)
+    assert library.list_titles() == rebuilt.list_titles() == ["Aruvi", "Mazhai", "Puyal", "Vaanam"]
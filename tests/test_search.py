@@ -0,0 +1,56 @@
+import pickle
+import sys
+from unittest.mock import patch
+
+from tamilkavi import cache as corpus_cache
+from tamilkavi.search import SearchIndex
+from tamilkavi.tamilkavipy import KaviExtraction, main
+from tamilkavi.text import tokenize
+
+
+def test_tokenize_keeps_tamil_grapheme_clusters_whole():
+    # Vowel signs and the pulli are combining marks; they must stay in the word.
+    assert tokenize("முருகா, என் குறைகளை!") == ["முருகா", "என்", "குறைகளை"]
+    assert tokenize("Mazhai-Naal") == ["mazhai", "naal"]
+
+
+def test_bm25_ranks_more_relevant_poem_first():
+    index = SearchIndex.build([
+        {"author": "a", "books": [{"context": [
+            {"title": "x", "line": "மழை வந்தது", "meaning": ""},
+            {"title": "y", "line": "மழை மழை மழை", "meaning": "மழை"},
+            {"title": "z", "line": "வெயில்", "meaning": ""},
+        ]}]},
+    ])
+    assert [doc_id for doc_id, _ in index.search("மழை")] == [1, 0]
+    assert index.search("பனி") == []
+
+
+def test_search_results_carry_provenance(sample_corpus):
+    library = KaviExtraction(data_dir=sample_corpus)
+    results = library.search("மழை")
+
+    assert {(r["author"], r["booktitle_tanglish"]) for r in results} == {
+        ("kavi", "mazhai-naal"),
+        ("nila", "nila-paattu"),
+    }
+    assert [r["author"] for r in library.search("மழை", author="NILA")] == ["nila"]
+    assert library.search("மழை", book="mazhai-naal")[0]["title"] == "Mazhai"
+
+
+def test_search_index_is_persisted_with_the_cache(sample_corpus):
+    KaviExtraction(data_dir=sample_corpus).search("மழை")
+    with open(corpus_cache.cache_file_for(sample_corpus), "rb") as fh:
+        assert isinstance(pickle.load(fh)["search_index"], SearchIndex)
+
+    library = KaviExtraction(data_dir=sample_corpus)
+    assert library.loaded_from_cache
+    assert library.search("வானம்")[0]["title"] == "Vaanam"
+
+
+def test_cli_search(capsys):
+    with patch.object(sys, "argv", ["tamilkavi", "--search", "முருகா"]):
+        main()
+    output = capsys.readouterr().out
+    assert "🔎 Search Results / Thedal Mudivugal: முருகா" in output
+    assert "Author / Book" in output
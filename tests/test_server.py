@@ -0,0 +1,46 @@
+import sys
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from tamilkavi import server
+from tamilkavi.storage import JsonBackend
+from tamilkavi.tamilkavipy import KaviExtraction, main
+
+
+@pytest.fixture
+def running_server(sample_corpus):
+    httpd = server.make_server(JsonBackend(KaviExtraction(data_dir=sample_corpus)), port=0)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_query_returns_only_what_the_query_can_show(running_server):
+    library = server.remote_library(running_server, title="mazhai", author="nila")
+    assert [author["author"] for author in library.saved_books] == ["nila"]
+    assert library.get_titles("Mazhai", library.saved_books)[0]["line"] == "நிலவில் மழை தூறல்"
+
+    library = server.remote_library(running_server, book="mazhai-naal")
+    assert [poem["title"] for poem in library.saved_books[0]["books"][0]["context"]] == ["Mazhai", "Vaanam"]
+
+
+def test_listing_and_search(running_server):
+    library = server.remote_library(running_server, listing=True)
+    assert library.list_authors() == ["kavi", "nila"]
+    assert library.list_titles() == ["Mazhai", "Vaanam"]
+    assert server.remote_search(running_server, "வானம்")[0]["title"] == "Vaanam"
+
+
+def test_cli_forwards_to_the_server(running_server, capsys):
+    # Vaanam only exists in the served sample corpus, not the packaged one.
+    with patch.object(sys, "argv", ["tamilkavi", "--server", running_server, "-t", "Vaanam"]):
+        main()
+    assert "வானம் கருத்தது" in capsys.readouterr().out
+
+
+def test_unreachable_server_is_reported_as_none():
+    assert server.remote_library("http://127.0.0.1:9", author="kavi") is None
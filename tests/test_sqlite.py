@@ -0,0 +1,113 @@
+import io
+import json
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from tamilkavi import batch, server, sqlite
+from tamilkavi.sqlite import SqliteBackend, write_database
+from tamilkavi.storage import Backend, JsonBackend
+from tamilkavi.tamilkavipy import KaviExtraction, main
+
+
+@pytest.fixture
+def library(sample_corpus):
+    return KaviExtraction(data_dir=sample_corpus)
+
+
+@pytest.fixture
+def backend(library, tmp_path):
+    write_database(library.saved_books, tmp_path / "corpus.db")
+    backend = SqliteBackend(tmp_path / "corpus.db")
+    yield backend
+    backend.close()
+
+
+@pytest.mark.parametrize("query", [
+    {},
+    {'author': "KAVI"},
+    {'book': "nila-paattu"},
+    {'book': "மழை-நாள்", 'author': "kavi"},
+    {'title': "mazhai"},
+    {'title': "Mazhai", 'author': "nila"},
+    {'title': "Vaanam", 'book': "nila-paattu"},
+])
+def test_subset_and_listing_match_the_json_backend(library, backend, query):
+    assert backend.subset(**query) == library.subset(**query)
+    assert backend.listing() == library.listing()
+
+
+def test_search_uses_fts(backend):
+    results = backend.search("மழை")
+
+    assert sorted((result['author'], result['booktitle_tanglish']) for result in results) == [
+        ("kavi", "mazhai-naal"), ("nila", "nila-paattu")]
+    assert results[0]['score'] >= results[1]['score']
+    assert [result['author'] for result in backend.search("மழை", author="nila")] == ["nila"]
+    assert backend.search("...") == []
+
+
+@pytest.mark.parametrize("query", ["ம", "ழ", "மழ", "வா", "நில", "மழை", "வானம்", "மழை நிலவில்"])
+def test_search_matches_the_same_tamil_words_as_the_json_backend(library, backend, query):
+    def matches(results):
+        return sorted((result['author'], result['title']) for result in results)
+
+    assert matches(backend.search(query)) == matches(library.search(query))
+
+
+def test_suggest(library, backend):
+    assert backend.suggest("mazhai-nal", kind='book') == library.suggest("mazhai-nal", kind='book')
+
+
+def test_backend_is_abstract():
+    with pytest.raises(TypeError):
+        Backend()
+
+
+def test_batch_and_server_answer_from_either_backend(library, backend):
+    queries = ['{"author": "kavi", "book": "mazhai-naal"}', '{"title": "Mazhai"}', '{"search": "வானம்"}']
+    outputs = []
+    for each in (JsonBackend(library), backend):
+        out = io.StringIO()
+        batch.run_batch(each, queries, out)
+        outputs.append([json.loads(line) for line in out.getvalue().splitlines()])
+    assert [result.get('authors') for result in outputs[0]] == [result.get('authors') for result in outputs[1]]
+    assert outputs[1][2]['results'][0]['title'] == "Vaanam"
+    out = io.StringIO()
+    batch.run_batch(backend, queries, out, workers=2)
+    assert [json.loads(line) for line in out.getvalue().splitlines()] == outputs[1]
+
+    httpd = server.make_server(backend, port=0)
+    try:
+        assert httpd.listing == library.listing()
+    finally:
+        httpd.server_close()
+
+
+def test_rejects_files_that_are_not_corpus_databases(tmp_path):
+    path = tmp_path / "other.db"
+    path.write_bytes(b"not a database at all")
+
+    with pytest.raises(ValueError):
+        SqliteBackend(path)
+    with pytest.raises(ValueError):
+        SqliteBackend(tmp_path / "missing.db")
+
+
+def test_cli_imports_and_queries_the_database(sample_corpus, tmp_path, capsys):
+    db = tmp_path / "corpus.db"
+    sqlite.main([str(db), "--data-dir", str(sample_corpus)])
+    assert "Imported 2 authors" in capsys.readouterr().out
+
+    with patch.object(sys, "argv", ["tamilkavi", "--db", str(db), "-a", "nila", "-t", "Mazhai", "--format", "jsonl"]):
+        main()
+    assert "நிலவில் மழை தூறல்" in capsys.readouterr().out
+
+    with patch.object(sys, "argv", ["tamilkavi", "--db", str(db), "-a"]):
+        main()
+    assert "- kavi" in capsys.readouterr().out
+
+    with patch.object(sys, "argv", ["tamilkavi", "--db", str(db), "-t", "Mazhaii", "--fuzzy"]):
+        main()
+    assert "- Mazhai" in capsys.readouterr().out
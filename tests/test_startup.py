@@ -0,0 +1,42 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Generous ceiling for importing the CLI module (microseconds). It is meant to
+# catch a heavy dependency sneaking back into module scope, not to benchmark.
+IMPORT_BUDGET_US = int(os.environ.get("TAMILKAVI_IMPORT_BUDGET_US", "150000"))
+
+# Modules the greeting and -h paths must not import.
+DEFERRED_MODULES = {
+    "json", "textwrap", "pathlib", "pickle", "prettytable", "importlib.resources",
+    "concurrent.futures", "difflib", "mmap", "tamilkavi.cache", "tamilkavi.search",
+}
+
+
+def _import_times(*argv):
+    """Runs the CLI under -X importtime and returns {module: cumulative_us}."""
+    code = f"import sys; sys.argv = {['tamilkavi', *argv]!r}\nfrom tamilkavi.tamilkavipy import main\ntry:\n    main()\nexcept SystemExit:\n    pass"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize("argv", [(), ("-h",)])
+def test_greeting_and_help_skip_heavy_imports(argv):
+    times = _import_times(*argv)
+    assert "tamilkavi.tamilkavipy" in times
+    assert not DEFERRED_MODULES & set(times)
+
+
+def test_cli_import_stays_within_budget():
+    times = _import_times("-h")
+    assert times["tamilkavi.tamilkavipy"] < IMPORT_BUDGET_US
@@ -0,0 +1,93 @@
+import io
+import json
+import tracemalloc
+
+import pytest
+
+from tamilkavi import stream
+from tamilkavi.tamilkavipy import KaviExtraction
+
+
+def _records(document, chunk_size=7):
+    return list(stream.iter_records(io.StringIO(json.dumps(document, ensure_ascii=False)), "x.json", chunk_size))
+
+
+def test_records_follow_document_order_with_back_references(sample_corpus):
+    document = json.loads((sample_corpus / "kavi.json").read_text(encoding="utf-8"))
+    author, book, first, second = _records(document)
+
+    assert (author.name, author.contact, author.source, author.complete) == ("kavi", "kavi@example.com", "x.json", True)
+    assert book.author is author and book.booktitle_tanglish == "mazhai-naal"
+    assert first.book is book and first.title == "Mazhai"
+    assert second.line == "வானம் கருத்தது"
+
+
+def test_numbers_split_across_chunks_are_read_whole():
+    document = {"author": "a", "year": 123456789, "books": [{"booktitle": "b", "pages": 98765, "context": []}]}
+    author, book = _records(document, chunk_size=3)
+    assert author.name == "a" and book.booktitle == "b"
+
+
+def test_keys_after_the_nested_arrays_complete_their_records():
+    document = {"books": [{"context": [{"title": "T", "note": 1}], "booktitle_tanglish": "b", "pages": 9}],
+                "author": "x", "contact": "x@y"}
+    author, book, poem = _records(document)
+
+    assert (author.name, author.contact, author.complete) == ("x", "x@y", True)
+    assert (book.booktitle_tanglish, book.extra, book.complete) == ("b", {"pages": 9}, True)
+    assert poem.extra == {"note": 1}
+
+
+def test_scan_poems_waits_for_names_that_follow_the_poems(tmp_path):
+    (tmp_path / "x.json").write_text(json.dumps(
+        {"books": [{"context": [{"title": "T", "line": "l"}], "booktitle_tanglish": "b"}], "author": "x"}), encoding="utf-8")
+    library = KaviExtraction(data_dir=tmp_path, preload=False)
+
+    assert [poem.line for poem in library.scan_poems(author="X", book="B")] == ["l"]
+    assert list(library.scan_poems(book="other")) == []
+
+
+def test_missing_author_key_is_an_error():
+    with pytest.raises(ValueError):
+        _records({"books": []})
+    with pytest.raises(ValueError):
+        list(stream.iter_records(io.StringIO('{"author": "a", "books": [{'), "x.json"))
+
+
+def test_scan_poems_matches_the_index_lookups(sample_corpus):
+    library = KaviExtraction(data_dir=sample_corpus)
+
+    scanned = list(library.scan_poems(title="MAZHAI"))
+    assert sorted(poem.line for poem in scanned) == sorted(
+        poem["line"] for poem in library.get_titles("Mazhai", library.saved_books))
+    assert [poem.book.author.name for poem in library.scan_poems(title="mazhai", book="நிலா-பாட்டு")] == ["nila"]
+
+
+def test_streaming_peak_memory_is_bounded(tmp_path):
+    poems = [{"title": f"t{i}", "line": "மழை " * 40, "meaning": "வானம் " * 40} for i in range(3000)]
+    path = tmp_path / "big.json"
+    path.write_text(json.dumps({"author": "big", "books": [{"booktitle": "b", "context": poems}]}, ensure_ascii=False), encoding="utf-8")
+
+    def peak(fn):
+        tracemalloc.start()
+        try:
+            fn()
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    def scan():
+        with path.open("r", encoding="utf-8") as fh:
+            assert sum(1 for _ in stream.iter_records(fh, chunk_size=4096)) == 3002
+
+    def full():
+        with path.open("r", encoding="utf-8") as fh:
+            assert len(json.load(fh)["books"][0]["context"]) == 3000
+
+    assert peak(scan) * 10 < peak(full)
+
+
+def test_library_without_preload_only_streams(sample_corpus):
+    library = KaviExtraction(data_dir=sample_corpus, preload=False)
+    assert library.saved_books == []
+    assert sum(isinstance(r, stream.Context) for r in library.iter_records()) == 3